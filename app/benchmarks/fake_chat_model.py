@@ -0,0 +1,181 @@
+"""
+A deterministic chat model standing in for the OpenAI models in benchmarks.
+
+The intent model answers with the intent JSON a model would give for the input of the
+intent prompt, and the response model echoes the end of its prompt. Both can simulate the
+latency of the provider, before the first token and per streamed token, and report token
+usage like ChatOpenAI with stream_usage, so StageTracer measures them as it would in
+production. Prompt tokens are reported as cached the way OpenAI caches prompt prefixes: when
+at least 1,024 leading tokens are shared with the previous prompt, in steps of 128 tokens.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+# Average number of characters per token of English text
+CHARS_PER_TOKEN = 4
+
+# Shortest prompt prefix cached by the provider, and the steps in which longer prefixes are cached
+MIN_CACHED_TOKENS = 1024
+CACHED_TOKENS_STEP = 128
+
+# The input of the user, as opposed to the inputs of the examples of the intent prompt
+_INPUT_PATTERN = re.compile(r"^Input: (.*)\nOutput: <Generate", re.MULTILINE)
+_TEAMS_PATTERN = re.compile(r"^(?:.*\bof\s+)?(.+?)\s+(?:vs\.?|versus|against)\s+(.+?)\??$", re.IGNORECASE)
+
+def identify_intent(user_input: str) -> dict:
+    """
+    Returns the intent a model would identify for an input, from its wording.
+
+    Parameters:
+    ----------
+    user_input : str
+        The input text from the user.
+
+    Returns:
+    -------
+    dict
+        'live_score' with both teams for inputs like 'score of X vs Y', 'live_matches' for
+        inputs about matches, and 'fallback' otherwise.
+    """
+    teams = _TEAMS_PATTERN.match(user_input.strip())
+    if teams:
+        return {"intent": "live_score", "entities": {"team1": teams.group(1), "team2": teams.group(2)}}
+    if "match" in user_input.lower():
+        return {"intent": "live_matches", "entities": {}}
+    return {"intent": "fallback", "entities": {"reason": "The input is not about a cricket match."}}
+
+class FakeChatModel(BaseChatModel):
+    """
+    A deterministic chat model with simulated latency.
+
+    Attributes:
+    ----------
+    role : str
+        'intent' to answer intent prompts with JSON, 'response' to echo the end of the prompt.
+    latency : float
+        Seconds before the first token.
+    token_latency : float
+        Seconds between streamed tokens.
+    """
+    role: str = "response"
+    latency: float = 0.0
+    token_latency: float = 0.0
+
+    _last_prompt: str = PrivateAttr(default="")
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        prompt, tokens = self.__answer(messages)
+        time.sleep(self.latency + self.token_latency * len(tokens))
+        return self.__result(prompt, tokens)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        prompt, tokens = self.__answer(messages)
+        await asyncio.sleep(self.latency + self.token_latency * len(tokens))
+        return self.__result(prompt, tokens)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        prompt, tokens = self.__answer(messages)
+        time.sleep(self.latency)
+        for token in tokens:
+            time.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self.__usage(prompt, tokens)))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        prompt, tokens = self.__answer(messages)
+        await asyncio.sleep(self.latency)
+        for token in tokens:
+            await asyncio.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self.__usage(prompt, tokens)))
+
+    def __answer(self, messages: List[BaseMessage]) -> tuple:
+        """
+        Returns the prompt and the tokens of the answer.
+
+        Parameters:
+        ----------
+        messages : List[BaseMessage]
+            The messages of the prompt.
+
+        Returns:
+        -------
+        tuple
+            The text of the prompt and the answer split into tokens of CHARS_PER_TOKEN characters.
+        """
+        prompt = "\n".join(str(message.content) for message in messages)
+        if self.role == "intent":
+            user_input = _INPUT_PATTERN.search(prompt)
+            answer = json.dumps(identify_intent(user_input.group(1) if user_input else ""))
+        else:
+            answer = "Here is the latest: " + " ".join(prompt[-200:].split())
+        return prompt, [answer[start:start + CHARS_PER_TOKEN] for start in range(0, len(answer), CHARS_PER_TOKEN)]
+
+    def __usage(self, prompt: str, tokens: List[str]) -> UsageMetadata:
+        """
+        Returns the estimated token usage of an answer.
+
+        Parameters:
+        ----------
+        prompt : str
+            The text of the prompt.
+        tokens : List[str]
+            The tokens of the answer.
+
+        Returns:
+        -------
+        UsageMetadata
+            The input, output and total tokens, with the input tokens of the prefix shared with
+            the previous prompt as cached.
+        """
+        input_tokens = -(-len(prompt) // CHARS_PER_TOKEN)
+        prefix_tokens = len(os.path.commonprefix([prompt, self._last_prompt])) // CHARS_PER_TOKEN
+        self._last_prompt = prompt
+        cached_tokens = 0
+        if prefix_tokens >= MIN_CACHED_TOKENS:
+            cached_tokens = prefix_tokens - (prefix_tokens - MIN_CACHED_TOKENS) % CACHED_TOKENS_STEP
+        return UsageMetadata(
+            input_tokens=input_tokens,
+            output_tokens=len(tokens),
+            total_tokens=input_tokens + len(tokens),
+            input_token_details={"cache_read": cached_tokens}
+        )
+
+    def __result(self, prompt: str, tokens: List[str]) -> ChatResult:
+        """
+        Returns the answer as the result of a non-streamed call.
+
+        Parameters:
+        ----------
+        prompt : str
+            The text of the prompt.
+        tokens : List[str]
+            The tokens of the answer.
+
+        Returns:
+        -------
+        ChatResult
+            The answer along with its token usage.
+        """
+        message = AIMessage(content="".join(tokens), usage_metadata=self.__usage(prompt, tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,127 @@
+"""
+Measures the memory taken by 1,000 matches as MatchDetails / TeamScoreDetails, compared
+with the same classes as plain dataclasses with a per-instance __dict__.
+
+Usage:
+    python app/benchmarks/match_memory_benchmark.py [--matches 1000] [--snapshots 1]
+
+Matches are built the way LiveMatchService builds them, so team and series names are
+shared between matches and snapshots. With --snapshots, the same day is kept in memory
+several times, as a multi-day scoreboard or a history of snapshots would.
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import MatchDetails, TeamScoreDetails
+
+@dataclass
+class DictTeamScoreDetails:
+    name: str = ''
+    abr: str = ''
+    run: Optional[int] = None
+    wicket: Optional[int] = None
+    over: Optional[float] = None
+    declared: bool = False
+    run2: Optional[int] = None
+    wicket2: Optional[int] = None
+    over2: Optional[float] = None
+    declared2: bool = False
+
+@dataclass
+class DictMatchDetails:
+    id: Optional[str] = None
+    format: str = ''
+    series_id: Optional[str] = None
+    series_name: str = ''
+    status: str = ''
+    period: str = ''
+    team1: DictTeamScoreDetails = field(default_factory=DictTeamScoreDetails)
+    team2: DictTeamScoreDetails = field(default_factory=DictTeamScoreDetails)
+
+def build_matches(match_class: type, team_class: type, matches: int, snapshot: int) -> list:
+    """
+    Builds the matches of a day.
+
+    Parameters:
+    ----------
+    match_class : type
+        The class of the matches.
+    team_class : type
+        The class of the team scores.
+    matches : int
+        The number of matches.
+    snapshot : int
+        The number of the snapshot, which changes the scores.
+
+    Returns:
+    -------
+    list
+        The matches.
+    """
+    def team(number: int) -> object:
+        return team_class(
+            name=sys.intern(f"Team {number}"), abr=sys.intern(f"T{number}"),
+            run=200 + snapshot + number % 50, wicket=number % 10, over=float(snapshot % 50),
+            run2=None, wicket2=None, over2=None
+        )
+
+    return [
+        match_class(
+            id=str(1000000 + number), format=sys.intern("ODI"), series_id=sys.intern(f"series-{number // 8}"),
+            series_name=sys.intern(f"Series {number // 8}"), status=f"Team {2 * number} need {snapshot + number} runs",
+            period=sys.intern("Inns 2"), team1=team(2 * number), team2=team(2 * number + 1)
+        )
+        for number in range(matches)
+    ]
+
+def measure(match_class: type, team_class: type, matches: int, snapshots: int) -> int:
+    """
+    Returns the number of bytes allocated by the snapshots of a day.
+
+    Parameters:
+    ----------
+    match_class : type
+        The class of the matches.
+    team_class : type
+        The class of the team scores.
+    matches : int
+        The number of matches per snapshot.
+    snapshots : int
+        The number of snapshots kept in memory.
+
+    Returns:
+    -------
+    int
+        The allocated bytes.
+    """
+    # Names are interned outside of the measurement, as they are shared by every snapshot.
+    # Interned strings are freed along with their last reference, so the warm-up is kept.
+    warm_up = build_matches(match_class, team_class, matches, 0)
+    tracemalloc.start()
+    kept = [build_matches(match_class, team_class, matches, snapshot) for snapshot in range(1, snapshots + 1)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept, warm_up
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=1000, help="Matches per snapshot.")
+    parser.add_argument("--snapshots", type=int, default=1, help="Snapshots kept in memory.")
+    args = parser.parse_args()
+
+    baseline = measure(DictMatchDetails, DictTeamScoreDetails, args.matches, args.snapshots)
+    slotted = measure(MatchDetails, TeamScoreDetails, args.matches, args.snapshots)
+    per_thousand = 1000 / (args.matches * args.snapshots) / 1024
+    print(f"{args.matches} matches x {args.snapshots} snapshots")
+    print(f"  dataclass with __dict__   {baseline * per_thousand:8.1f} KiB per 1,000 matches")
+    print(f"  frozen slotted dataclass  {slotted * per_thousand:8.1f} KiB per 1,000 matches  ({1 - slotted / baseline:.0%} less)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Compares decoding livescore date payloads with the standard library against the
+orjson decode and field projection used by LivescoreClient, on their own and followed
+by the processing of the payload into MatchDetails.
+
+Usage:
+    python app/benchmarks/payload_decode_benchmark.py [payload.json ...]
+    python app/benchmarks/payload_decode_benchmark.py --record 20241012
+
+Recorded payloads are the raw bodies of the livescore date API. Use --record to save
+the payload of a date into app/benchmarks/payloads/. Without arguments, the recorded
+payloads in that directory are used, or a synthetic payload if there are none.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.clients import decode_matches_payload
+from src.services import LiveMatchService
+
+PAYLOADS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payloads")
+MATCHES_URL = "https://prod-public-api.livescore.com/v1/api/app/date/cricket/{}/5.30?locale=en&MD=1"
+
+def record_payload(cur_date: str) -> str:
+    """
+    Saves the raw livescore payload of a date into the payloads directory.
+
+    Parameters:
+    ----------
+    cur_date : str
+        The date in YYYYMMDD format.
+
+    Returns:
+    -------
+    str
+        The path of the recorded payload.
+    """
+    import requests
+    response = requests.get(MATCHES_URL.format(cur_date), timeout=10)
+    response.raise_for_status()
+    os.makedirs(PAYLOADS_DIR, exist_ok=True)
+    path = os.path.join(PAYLOADS_DIR, f"{cur_date}.json")
+    with open(path, "wb") as file:
+        file.write(response.content)
+    return path
+
+def build_synthetic_payload(stages: int = 20, events_per_stage: int = 8) -> bytes:
+    """
+    Builds a payload shaped like a busy day of the livescore date API.
+
+    Parameters:
+    ----------
+    stages : int
+        The number of series.
+    events_per_stage : int
+        The number of matches per series.
+
+    Returns:
+    -------
+    bytes
+        The JSON encoded payload.
+    """
+    def team(index: int) -> dict:
+        return {
+            "Nm": f"Team {index}", "ID": str(index), "Img": f"enet/{index}.png", "Abr": f"T{index}",
+            "tbd": 0, "Gd": 1, "Pids": {"8": [str(index)], "12": [str(index)]}, "CoNm": "Country",
+            "CoId": "COUNTRY", "HasVideo": False,
+        }
+
+    def event(stage: int, index: int) -> dict:
+        number = stage * events_per_stage + index
+        data = {
+            "Eid": str(1000000 + number), "Pids": {"8": str(number), "12": str(number)},
+            "Tr1C1": "245", "Tr1CW1": "6", "Tr1CO1": "43.2", "Tr2C1": "198", "Tr2CW1": "10",
+            "Tr2CO1": "50", "Tr1CD1": 0, "Tr2CD1": 0, "T1": [team(2 * number)], "T2": [team(2 * number + 1)],
+            "Eps": "Inns 1", "Esid": 2, "Epr": 1, "Ecov": 0, "ErnInf": "1st Innings", "Et": 5,
+            "EtTx": "ODI", "ECo": "Team 1 lead by 47 runs", "Ebat": 1, "TPa": 0, "TCo": 0, "Ebtl": 1,
+            "Esd": 20241012093000, "EO": 9120, "EOX": 9120, "LuUT": 20241012143000, "Ehid": 0,
+            "Spid": 73, "Pid": 8, "Media": {"12": [{"eventId": str(number), "provider": "ENET", "type": "VIDEO"}]},
+            "Stg": {"Sid": str(stage), "Snm": f"Series {stage}", "Scd": f"series-{stage}", "Cid": "1"},
+        }
+        return data
+
+    payload = {
+        "Stages": [
+            {
+                "Sid": str(stage), "Snm": f"Series {stage}", "Scd": f"series-{stage}", "Cnm": "International",
+                "Csnm": "International", "Ccd": "international", "Scu": 0, "Sds": f"Series {stage}",
+                "Events": [event(stage, index) for index in range(events_per_stage)],
+            }
+            for stage in range(stages)
+        ]
+    }
+    return json.dumps(payload).encode()
+
+def load_payloads(paths: list) -> list:
+    """
+    Loads the raw bodies of the payloads to benchmark.
+
+    Parameters:
+    ----------
+    paths : list
+        The paths of recorded payloads; the payloads directory is used if empty.
+
+    Returns:
+    -------
+    list
+        Tuples of the name and raw body of every payload.
+    """
+    paths = paths or sorted(glob.glob(os.path.join(PAYLOADS_DIR, "*.json")))
+    if not paths:
+        return [("synthetic", build_synthetic_payload())]
+    payloads = []
+    for path in paths:
+        with open(path, "rb") as file:
+            payloads.append((os.path.basename(path), file.read()))
+    return payloads
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("payloads", nargs="*", help="Recorded payloads to decode.")
+    parser.add_argument("--record", metavar="YYYYMMDD", help="Record the payload of a date and exit.")
+    parser.add_argument("--number", type=int, default=200, help="Decodes per measurement.")
+    args = parser.parse_args()
+
+    if args.record:
+        print(f"Recorded {record_payload(args.record)}")
+        return
+
+    # Fresh snapshots, i.e. without previous states to reuse matches from
+    process = LiveMatchService().create_matches
+
+    def measure(func) -> float:
+        return min(timeit.repeat(func, number=args.number, repeat=7)) / args.number
+
+    for name, content in load_payloads(args.payloads):
+        events = sum(len(stage.get("Events", [])) for stage in decode_matches_payload(content)["Stages"])
+        print(f"{name}: {len(content) / 1024:.1f} KiB, {events} events")
+        cases = [
+            ("decode", lambda: json.loads(content), lambda: decode_matches_payload(content)),
+            ("decode + process", lambda: process(json.loads(content)), lambda: process(decode_matches_payload(content))),
+        ]
+        for case, baseline_func, optimized_func in cases:
+            baseline = measure(baseline_func)
+            optimized = measure(optimized_func)
+            print(f"  {case:<18} json {baseline * 1e3:8.3f} ms   orjson + projection {optimized * 1e3:8.3f} ms   ({baseline / optimized:.1f}x)")
+
+if __name__ == "__main__":
+    main()
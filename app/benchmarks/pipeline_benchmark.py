@@ -0,0 +1,284 @@
+"""
+Drives the whole Cricbot chain offline, with recorded livescore payloads and fake chat
+models, and reports throughput, per-stage latency and memory across scenarios.
+
+Usage:
+    python app/benchmarks/pipeline_benchmark.py [--sessions 1,10,100] [--matches 5,80]
+        [--turns 5] [--llm-latency 0.05] [--token-latency 0] [--fetch-latency 0.1]
+        [--stream] [--payload recorded.json] [--no-memory]
+
+Each scenario runs the given number of concurrent chat sessions against the fixture
+payload with that many live matches (app/benchmarks/fixtures/), each session asking
+--turns questions in a row through chain.ainvoke (or chain.astream with --stream).
+Sessions mix live score, match list and unrelated questions about the matches of the
+payload, so the rule-based and model intents, the templates and both caches are all
+exercised. Caches are cleared between scenarios.
+
+Per-stage latencies are measured by StageTracer. Memory is measured in a second run of
+the scenario under tracemalloc, which is slow, so it does not skew the timings.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.chains import generate_chain
+from src.clients import LivescoreClient, decode_matches_payload
+from src.models import MatchDetails
+from src.services import IntentIdentifierService, LiveMatchService, ResponseGeneratorService
+from src.tracing import StageTracer
+from src.utils import generate_metadata
+from fake_chat_model import FakeChatModel
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+class FixtureLivescoreClient(LivescoreClient):
+    """
+    A livescore client serving a recorded payload of the date API for every date.
+
+    Methods:
+    -------
+    fetch_matches_payload(cur_date: str) -> Optional[dict]
+        Returns the decoded payload after the simulated latency.
+
+    afetch_matches_payload(cur_date: str) -> Optional[dict]
+        Asynchronously returns the decoded payload after the simulated latency.
+
+    get_stats() -> dict
+        Returns the circuit state and last status of a healthy API, and the number of fetches.
+    """
+
+    def __init__(self, content: bytes, latency: float = 0.0):
+        """
+        Initializes the FixtureLivescoreClient.
+
+        Parameters:
+        ----------
+        content : bytes
+            The raw body of the payload, decoded on every fetch like a response.
+        latency : float
+            Seconds every fetch takes.
+        """
+        super().__init__()
+        self.__content = content
+        self.__latency = latency
+        self.__fetches = 0
+
+    def fetch_matches_payload(self, cur_date: str) -> Optional[dict]:
+        self.__fetches += 1
+        time.sleep(self.__latency)
+        return decode_matches_payload(self.__content)
+
+    async def afetch_matches_payload(self, cur_date: str) -> Optional[dict]:
+        self.__fetches += 1
+        await asyncio.sleep(self.__latency)
+        return decode_matches_payload(self.__content)
+
+    def get_stats(self) -> dict:
+        return {"circuit_state": "closed", "last_status": 200, "fetches": self.__fetches}
+
+def load_fixture(matches: int, payload_path: Optional[str]) -> bytes:
+    """
+    Loads the raw body of the payload of a scenario.
+
+    Parameters:
+    ----------
+    matches : int
+        The number of live matches of the fixture.
+    payload_path : Optional[str]
+        A recorded payload to use instead of the fixture.
+
+    Returns:
+    -------
+    bytes
+        The raw body of the payload.
+    """
+    path = payload_path or os.path.join(FIXTURES_DIR, f"livescore_{matches}_live.json")
+    with open(path, "rb") as file:
+        return file.read()
+
+def build_questions(matches: List[MatchDetails], sessions: int, turns: int) -> List[List[str]]:
+    """
+    Builds the questions asked by every session, about the matches of the payload.
+
+    Parameters:
+    ----------
+    matches : List[MatchDetails]
+        The matches of the payload.
+    sessions : int
+        The number of sessions.
+    turns : int
+        The number of questions of every session.
+
+    Returns:
+    -------
+    List[List[str]]
+        The questions of every session, in order.
+    """
+    questions = []
+    for session in range(sessions):
+        session_questions = []
+        for turn in range(turns):
+            number = session * turns + turn
+            match = matches[number % len(matches)]
+            kind = number % 5
+            if kind == 0:
+                session_questions.append(f"{match.team1.abr} vs {match.team2.abr} score")
+            elif kind == 1:
+                session_questions.append(f"how are {match.team1.name} doing against {match.team2.name}")
+            elif kind == 2:
+                session_questions.append("which matches are being played today?")
+            elif kind == 3:
+                session_questions.append(f"list the matches of the {match.series_name} series")
+            else:
+                session_questions.append("who will win the football world cup?")
+        questions.append(session_questions)
+    return questions
+
+def reset_caches():
+    """
+    Clears the intent and response caches shared by the services, so that scenarios do
+    not reuse the answers of the previous ones.
+    """
+    IntentIdentifierService.clear_cache()
+    ResponseGeneratorService.clear_cache()
+
+async def run_sessions(chain, questions: List[List[str]], tracer: StageTracer, stream: bool) -> float:
+    """
+    Runs the sessions concurrently, each asking its questions in a row.
+
+    Parameters:
+    ----------
+    chain : Runnable
+        The chain to drive.
+    questions : List[List[str]]
+        The questions of every session.
+    tracer : StageTracer
+        The tracer measuring the turns.
+    stream : bool
+        Whether to stream the responses instead of invoking the chain.
+
+    Returns:
+    -------
+    float
+        The wall time of all sessions in seconds.
+    """
+    config = {"callbacks": [tracer]}
+
+    async def session(session_questions: List[str]):
+        for question in session_questions:
+            metadata = generate_metadata(user_input=question)
+            if stream:
+                async for _ in chain.astream(metadata, config=config):
+                    pass
+            else:
+                await chain.ainvoke(metadata, config=config)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(session(session_questions) for session_questions in questions))
+    return time.perf_counter() - started_at
+
+def run_scenario(chain, content: bytes, sessions: int, args: argparse.Namespace) -> dict:
+    """
+    Runs a scenario and measures it.
+
+    Parameters:
+    ----------
+    chain : Runnable
+        The chain to drive.
+    content : bytes
+        The raw body of the payload.
+    sessions : int
+        The number of concurrent sessions.
+    args : argparse.Namespace
+        The options of the benchmark.
+
+    Returns:
+    -------
+    dict
+        The wall time, tracer statistics, fetches and peak memory of the scenario.
+    """
+    client = FixtureLivescoreClient(content, args.fetch_latency)
+    LiveMatchService.set_livescore_client(client)
+    reset_caches()
+    matches = LiveMatchService().fetch_all_matches()
+    questions = build_questions(matches, sessions, args.turns)
+    tracer = StageTracer()
+    elapsed = asyncio.run(run_sessions(chain, questions, tracer, args.stream))
+    result = {"matches": len(matches), "elapsed": elapsed, "stats": tracer.get_stats(), "fetches": client.get_stats()["fetches"]}
+
+    if not args.no_memory:
+        LiveMatchService.set_livescore_client(FixtureLivescoreClient(content, args.fetch_latency))
+        reset_caches()
+        tracemalloc.start()
+        asyncio.run(run_sessions(chain, questions, StageTracer(), args.stream))
+        _, result["peak_memory"] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result
+
+def print_result(matches: int, sessions: int, turns: int, result: dict):
+    """
+    Prints the measurements of a scenario.
+
+    Parameters:
+    ----------
+    matches : int
+        The number of live matches of the scenario.
+    sessions : int
+        The number of concurrent sessions.
+    turns : int
+        The number of questions of every session.
+    result : dict
+        The measurements, as returned by run_scenario.
+    """
+    total_turns = sessions * turns
+    print(
+        f"\n{matches} live matches ({result['matches']} listed), {sessions} sessions x {turns} turns: "
+        f"{total_turns / result['elapsed']:.1f} turns/s, {result['fetches']} livescore fetches"
+        + (f", peak {result['peak_memory'] / 1024:.0f} KiB" if "peak_memory" in result else "")
+    )
+    print(f"  {'stage':<18} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for name, summary in result["stats"]["latency_ms"].items():
+        if summary["count"]:
+            print(
+                f"  {name:<18} {summary['count']:>6} {summary['p50']:>9.1f} {summary['p95']:>9.1f} "
+                f"{summary['p99']:>9.1f} {summary['mean']:>9.1f}"
+            )
+    for stage, usage in result["stats"]["tokens"].items():
+        print(
+            f"  {stage} tokens per turn: {usage.get('input', 0) / total_turns:.0f} in "
+            f"({usage.get('cached', 0) / total_turns:.0f} cached, {usage.get('uncached', 0) / total_turns:.0f} uncached), "
+            f"{usage.get('output', 0) / total_turns:.0f} out"
+        )
+    print("  " + ", ".join(f"{key} x{count}" for key, count in sorted(result["stats"]["outcomes"].items())))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", default="1,10,100", help="Comma separated numbers of concurrent sessions.")
+    parser.add_argument("--matches", default="5,80", help="Comma separated numbers of live matches of the fixtures.")
+    parser.add_argument("--turns", type=int, default=5, help="Questions asked by every session.")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds before the first token of a model.")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds between the streamed tokens of a model.")
+    parser.add_argument("--fetch-latency", type=float, default=0.1, help="Seconds a livescore fetch takes.")
+    parser.add_argument("--stream", action="store_true", help="Stream the responses instead of invoking the chain.")
+    parser.add_argument("--payload", help="A recorded payload to use instead of the fixtures.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the measurement of the peak memory.")
+    args = parser.parse_args()
+
+    chain = generate_chain(
+        "benchmark",
+        intent_llm=FakeChatModel(role="intent", latency=args.llm_latency, token_latency=args.token_latency),
+        response_llm=FakeChatModel(role="response", latency=args.llm_latency, token_latency=args.token_latency)
+    )
+    for matches in (int(value) for value in args.matches.split(",")):
+        content = load_fixture(matches, args.payload)
+        for sessions in (int(value) for value in args.sessions.split(",")):
+            print_result(matches, sessions, args.turns, run_scenario(chain, content, sessions, args))
+
+if __name__ == "__main__":
+    main()
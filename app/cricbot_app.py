@@ -1,7 +1,21 @@
+import math
 import os
+from datetime import datetime
+from collections import deque
+from itertools import islice
+from typing import List
 from dotenv import find_dotenv, load_dotenv
 import streamlit as st
-from src.chains import generate_chain
+from langchain_core.runnables import Runnable
+
+# Load environment variables from a .env file, before Constants reads the settings from them
+load_dotenv(find_dotenv(), override=True)
+
+from src.chains import get_chain
+from src.constants import Constants
+from src.models import MatchDetails
+from src.services import IntentIdentifierService, LiveMatchService, LiveScorePoller, ResponseGeneratorService, RuleBasedIntentService
+from src.tracing import StageTracer, configure_trace_logging
 from src.utils import generate_metadata
 
 # Define avatars for assistant and user
@@ -10,11 +24,19 @@ avatars = {
     "user": "🙋‍♂️"     # Person raising hand emoji for the user
 }
 
-def initialize_environment():
+@st.cache_resource(show_spinner=False)
+def initialize_environment() -> dict:
     """
-    Loads environment variables from a .env file.
+    Configures the trace logging and reads the settings of the app, once per server.
+    The .env file is loaded when the app is imported.
+
+    Returns:
+    -------
+    dict
+        The settings of the app read from the environment.
     """
-    load_dotenv(find_dotenv(), override=True)
+    configure_trace_logging()
+    return {"streaming": os.environ.get("ENABLE_CRICBOT_STREAMING") == "True"}
 
 def get_openai_api_key() -> str:
     """
@@ -35,26 +57,112 @@ def get_openai_api_key() -> str:
         raise EnvironmentError("OPENAI_API_KEY not found in environment variables.")
     return api_key
 
+@st.cache_resource(show_spinner=False)
+def get_shared_chain() -> Runnable:
+    """
+    Returns the processing chain, with its LLM clients, shared by all sessions of the server.
+
+    Returns:
+    -------
+    Runnable
+        The shared processing chain.
+    """
+    return get_chain(get_openai_api_key())
+
+@st.cache_resource(show_spinner=False)
+def get_live_match_service() -> LiveMatchService:
+    """
+    Returns the live match service shared by all sessions of the server.
+
+    Returns:
+    -------
+    LiveMatchService
+        The shared service.
+    """
+    return LiveMatchService()
+
+def get_live_matches_snapshot() -> List[MatchDetails]:
+    """
+    Returns the matches of today shared by all sessions, refreshed every LIVE_MATCHES_CACHE_TTL seconds.
+
+    The snapshot comes from the process-wide snapshot cache of the live match service, so
+    that every session gets the same list, and the caches keyed by the snapshot stay
+    effective, without a Streamlit cache adding its own TTL on top of it.
+
+    Returns:
+    -------
+    List[MatchDetails]
+        The matches of today.
+    """
+    return get_live_match_service().fetch_all_matches()
+
+def add_message(role: str, content: str):
+    """
+    Adds a message to the chat history of the session. Once CHAT_HISTORY_SIZE messages are
+    kept, the oldest message is dropped.
+
+    Parameters:
+    ----------
+    role : str
+        'user' or 'assistant'.
+    content : str
+        The text of the message.
+    """
+    st.session_state.messages.append({"role": role, "content": content})
+    st.session_state.message_count += 1
+
+def display_message(msg: dict):
+    """
+    Displays a message of the chat history.
+
+    Parameters:
+    ----------
+    msg : dict
+        The role and content of the message.
+    """
+    st.chat_message(msg["role"], avatar=avatars[msg["role"]]).write(msg["content"])
+
 def display_initial_messages():
     """
-    Displays the initial message from the assistant.
+    Displays the initial message from the assistant and the chat history.
+
+    Only the latest CHAT_PAGE_SIZE messages are displayed. Older messages are collapsed and
+    displayed one page at a time, so the cost of a rerun does not grow with the session.
     """
     if "messages" not in st.session_state:
-        st.session_state["messages"] = [{"role": "assistant", "content": "Hi! I am Cricbot. You can ask me questions about cricket"}]
+        st.session_state["messages"] = deque(maxlen=Constants.CHAT_HISTORY_SIZE)
+        st.session_state["message_count"] = 0
+        add_message("assistant", "Hi! I am Cricbot. You can ask me questions about cricket")
+
+    messages = st.session_state.messages
+    older = len(messages) - Constants.CHAT_PAGE_SIZE
+    dropped = st.session_state.message_count - len(messages)
+    if older > 0:
+        with st.expander(f"Earlier messages ({older})"):
+            if dropped:
+                st.caption(f"{dropped} older messages are no longer kept.")
+            pages = math.ceil(older / Constants.CHAT_PAGE_SIZE)
+            # Pages are counted from the oldest message, and the page right before the latest
+            # messages is displayed first
+            page = st.number_input("Page", min_value=1, max_value=pages, value=pages, key="history_page") if pages > 1 else 1
+            end = older - (pages - page) * Constants.CHAT_PAGE_SIZE
+            for msg in islice(messages, max(end - Constants.CHAT_PAGE_SIZE, 0), end):
+                display_message(msg)
 
-    for msg in st.session_state.messages:
-        st.chat_message(msg["role"], avatar=avatars[msg["role"]]).write(msg["content"])
+    for msg in islice(messages, max(older, 0), None):
+        display_message(msg)
 
 def handle_user_input():
     """
     Handles user input and generates a response using Cricbot langchain.
     """
     if user_input := st.chat_input():
-        st.session_state.messages.append({"role": "user", "content": user_input})
-        st.chat_message("user", avatar=avatars["user"]).write(user_input)
-        metadata = generate_metadata(user_input=user_input) 
-        chain = generate_chain(get_openai_api_key(), metadata)
-        is_streaming_enabled = os.environ.get("ENABLE_CRICBOT_STREAMING") == "True"
+        add_message("user", user_input)
+        display_message({"role": "user", "content": user_input})
+        match_snapshot = get_live_matches_snapshot()
+        metadata = generate_metadata(user_input=user_input, match_snapshot=match_snapshot)
+        chain = get_shared_chain()
+        is_streaming_enabled = initialize_environment()["streaming"]
         with st.chat_message("assistant", avatar=avatars["assistant"]), st.empty():
             with st.spinner("Cricbot is typing..."):
                 try:
@@ -70,9 +178,86 @@ def handle_user_input():
                 response = st.write_stream(resp_stream)
             else:
                 st.write(response)
-            st.session_state.messages.append({"role": "assistant", "content": response})
+            add_message("assistant", response)
         
 
+def display_debug_panel():
+    """
+    Displays the latency percentiles, token usage and cache outcomes of the chain stages
+    in the sidebar, if the debug panel is enabled.
+    """
+    if not Constants.ENABLE_DEBUG_PANEL:
+        return
+    tracer = StageTracer.get_shared()
+    stats = tracer.get_stats()
+    with st.sidebar.expander("Debug: chain latency", expanded=True):
+        st.table([
+            {"stage": name, **{key: round(value, 1) for key, value in summary.items()}}
+            for name, summary in stats["latency_ms"].items()
+        ])
+        if stats["tokens"]:
+            st.write("Tokens", stats["tokens"])
+        if stats["outcomes"]:
+            st.write("Outcomes", stats["outcomes"])
+        recent_turns = tracer.get_recent_turns()
+        if recent_turns:
+            st.write("Last turn", recent_turns[0])
+
+def display_cache_panel():
+    """
+    Displays the age of the shared snapshot, the hit rates of the caches, the dates held
+    by the scoreboard store, the state of the poller and the share of intents resolved
+    without the intent model in the sidebar.
+
+    The panel only reads the statistics of the caches, so that a rerun neither waits for
+    the livescore API nor counts as a hit or miss of the snapshot cache.
+    """
+    snapshot_stats = LiveMatchService.get_cache_stats()
+    snapshot_requests = snapshot_stats["hits"] + snapshot_stats["misses"]
+    today = datetime.today().strftime("%Y%m%d")
+    snapshot_age = snapshot_stats["ages"].get(today)
+    snapshot_size = snapshot_stats["sizes"].get(today)
+    with st.sidebar.expander("Caches"):
+        if snapshot_age is not None:
+            st.write(
+                (f"Live matches: {snapshot_size}, " if snapshot_size is not None else "Live matches ")
+                + f"refreshed {snapshot_age:.0f}s ago"
+            )
+        else:
+            st.write("Live matches: not fetched yet")
+        st.table([
+            {
+                "cache": "snapshots",
+                "hits": snapshot_stats["hits"],
+                "misses": snapshot_stats["misses"],
+                "hit rate": f"{snapshot_stats['hits'] / snapshot_requests:.0%}" if snapshot_requests else "-",
+            },
+            *(
+                {
+                    "cache": name,
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "hit rate": f"{stats['hit_ratio']:.0%}" if stats["hits"] + stats["misses"] else "-",
+                }
+                for name, stats in (
+                    ("intents", IntentIdentifierService.get_cache_stats()),
+                    ("responses", ResponseGeneratorService.get_cache_stats()),
+                )
+            ),
+        ])
+        scoreboard_stats = LiveMatchService.get_scoreboard_stats()
+        if scoreboard_stats["dates"]:
+            st.write(f"Scoreboard: {scoreboard_stats['matches']} matches of {len(scoreboard_stats['dates'])} dates")
+        poller_stats = LiveScorePoller.get_shared().get_stats()
+        if poller_stats["running"]:
+            st.write(f"Poller: {poller_stats['polls']} polls, every {poller_stats['interval']:.0f}s")
+        rule_stats = RuleBasedIntentService.get_stats()
+        if rule_stats["fast_path"] + rule_stats["llm"]:
+            st.write(
+                f"Intents resolved without the model: {rule_stats['fast_path']} of "
+                f"{rule_stats['fast_path'] + rule_stats['llm']} ({rule_stats['fast_path_ratio']:.0%})"
+            )
+
 def main():
     """
     Main function to run the Streamlit application.
@@ -83,6 +268,8 @@ def main():
     initialize_environment()
     display_initial_messages()
     handle_user_input()
+    display_cache_panel()
+    display_debug_panel()
 
 if __name__ == "__main__":
     main()
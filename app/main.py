@@ -1,23 +1,206 @@
+import argparse
+import asyncio
+import json
 import os
+import sys
+import time
+from collections import deque
+from typing import List, Optional, TextIO
 from dotenv import find_dotenv, load_dotenv
-from src.utils import generate_metadata
-from src.chains import generate_chain
+from langchain_core.runnables import Runnable
 
-# Load environment variables from a .env file
+# Load environment variables from a .env file, before Constants reads the settings from them
 load_dotenv(find_dotenv(), override=True)
 
-if __name__ == "__main__":
+from src.utils import generate_metadata
+from src.chains import get_chain
+from src.constants import Constants
+from src.models import MatchDetails
+from src.services import LiveMatchService, RuleBasedIntentService
+from src.tracing import StageTracer, configure_trace_logging
 
-    # Retrieve the OpenAI API key from environment variables
-    openai_api_key = os.environ.get('OPENAI_API_KEY')
+def parse_query(line: str, line_number: int) -> dict:
+    """
+    Parses a line of a batch file into a query.
+
+    Parameters:
+    ----------
+    line : str
+        A JSON object with the user input as 'input' (or 'user_input') and an optional 'id',
+        or a JSON string with the user input.
+    line_number : int
+        The number of the line, used as id if the line has none.
+
+    Returns:
+    -------
+    dict
+        The id and the user input of the query, or the id and an error if the line is invalid.
+    """
+    try:
+        query = json.loads(line)
+    except ValueError as e:
+        return {"id": line_number, "error": f"Invalid JSON: {e}"}
+    if isinstance(query, str):
+        return {"id": line_number, "input": query}
+    if not isinstance(query, dict) or not isinstance(query.get("input", query.get("user_input")), str):
+        return {"id": line_number, "error": "Expected an object with an 'input' string"}
+    return {"id": query.get("id", line_number), "input": query.get("input", query.get("user_input"))}
+
+async def process_query(chain: Runnable, semaphore: asyncio.Semaphore, query: dict, match_snapshot: Optional[List[MatchDetails]]) -> dict:
+    """
+    Runs a query of a batch through the chain.
+
+    Parameters:
+    ----------
+    chain : Runnable
+        The processing chain.
+    semaphore : asyncio.Semaphore
+        The semaphore bounding the number of queries processed concurrently.
+    query : dict
+        The query, as parsed by parse_query.
+    match_snapshot : Optional[List[MatchDetails]]
+        The matches of today shared by every query of the batch.
+
+    Returns:
+    -------
+    dict
+        The query along with the response or the error, and the latency in milliseconds.
+    """
+    if "error" in query:
+        return query
+    async with semaphore:
+        started_at = time.perf_counter()
+        try:
+            metadata = generate_metadata(user_input=query["input"], match_snapshot=match_snapshot)
+            result = {**query, "response": await chain.ainvoke(metadata)}
+        except Exception as e:
+            result = {**query, "error": f"{type(e).__name__}: {e}"}
+        result["latency_ms"] = round((time.perf_counter() - started_at) * 1000, 1)
+        return result
+
+async def run_batch(chain: Runnable, input_file: TextIO, output_file: TextIO, concurrency: int) -> dict:
+    """
+    Runs the queries of a JSONL file through the chain and writes the results as JSONL.
+
+    Today's matches are fetched once and shared by every query, so that all responses are
+    generated from the same snapshot. Up to `concurrency` queries are processed at once and
+    the results are written in the order of the queries, as soon as they and all queries
+    before them are done.
+
+    Parameters:
+    ----------
+    chain : Runnable
+        The processing chain.
+    input_file : TextIO
+        The queries, one per line (see parse_query).
+    output_file : TextIO
+        The file to write the results to, one JSON object per line.
+    concurrency : int
+        The maximum number of queries processed concurrently.
+
+    Returns:
+    -------
+    dict
+        The number of queries, the number of failed queries and the wall time in seconds.
+    """
+    started_at = time.perf_counter()
+    match_snapshot = await LiveMatchService().afetch_all_matches()
+    semaphore = asyncio.Semaphore(concurrency)
+    # Queries are read ahead of the ones being processed, but not the whole file at once
+    pending: deque = deque()
+    summary = {"queries": 0, "errors": 0}
 
-    # Continuously prompt the user for input and generate responses
+    async def write_oldest():
+        result = await pending.popleft()
+        summary["errors"] += "error" in result
+        output_file.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+
+    for line_number, line in enumerate(input_file, start=1):
+        if not line.strip():
+            continue
+        query = parse_query(line, line_number)
+        pending.append(asyncio.ensure_future(process_query(chain, semaphore, query, match_snapshot)))
+        summary["queries"] += 1
+        if len(pending) >= 4 * concurrency:
+            await write_oldest()
+    while pending:
+        await write_oldest()
+    output_file.flush()
+    summary["seconds"] = round(time.perf_counter() - started_at, 2)
+    return summary
+
+def format_stats() -> str:
+    """
+    Returns the statistics of the chain as plain text. The stage latencies are only
+    measured when tracing is enabled.
+
+    Returns:
+    -------
+    str
+        The latency percentiles of the chain stages, or how to enable tracing, followed
+        by the share of intents resolved without the intent model.
+    """
+    rule_stats = RuleBasedIntentService.get_stats()
+    stage_stats = StageTracer.get_shared().format_stats() if Constants.ENABLE_TRACING \
+        else "Stage latencies are not measured, set CRICBOT_ENABLE_TRACING=True to enable tracing."
+    return stage_stats + (
+        f"\nintents resolved without the model: {rule_stats['fast_path']} of "
+        f"{rule_stats['fast_path'] + rule_stats['llm']} ({rule_stats['fast_path_ratio']:.0%})"
+    )
+
+def run_interactive(chain: Runnable):
+    """
+    Continuously prompts the user for input and prints the responses. 'stats' prints the
+    latency percentiles of the chain stages measured so far and 'exit' ends the session.
+
+    Parameters:
+    ----------
+    chain : Runnable
+        The processing chain.
+    """
     while True:
         user_input = input("User: ")
         if user_input.lower() == "exit":
+            print(format_stats())
             break
+        if user_input.lower() == "stats":
+            print(format_stats())
+            continue
         # Using langchain to sequence LLMs and Data fetching components
         metadata = generate_metadata(user_input=user_input)
-        response = generate_chain(openai_api_key, metadata).invoke(metadata)
-        
+        response = chain.invoke(metadata)
+
         print("Cricbot:", response)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Cricbot, a chatbot for live cricket scores.")
+    parser.add_argument("--batch", metavar="FILE", help="Answer the queries of a JSONL file ('-' for stdin) instead of chatting.")
+    parser.add_argument("--output", metavar="FILE", help="File to write the JSONL results of a batch to. Defaults to stdout.")
+    parser.add_argument("--concurrency", type=int, default=Constants.BATCH_CONCURRENCY, help="Queries of a batch processed concurrently.")
+    args = parser.parse_args()
+
+    # Retrieve the OpenAI API key from environment variables
+    openai_api_key = os.environ.get('OPENAI_API_KEY')
+
+    # The chain is built once and reused for every message
+    chain = get_chain(openai_api_key)
+    configure_trace_logging()
+
+    if args.batch is None:
+        run_interactive(chain)
+    else:
+        input_file = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")
+        output_file = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            summary = asyncio.run(run_batch(chain, input_file, output_file, max(args.concurrency, 1)))
+        finally:
+            if input_file is not sys.stdin:
+                input_file.close()
+            if output_file is not sys.stdout:
+                output_file.close()
+        print(
+            f"Answered {summary['queries']} queries ({summary['errors']} failed) in {summary['seconds']} s",
+            file=sys.stderr
+        )
+        print(format_stats(), file=sys.stderr)
@@ -0,0 +1,54 @@
+import argparse
+import multiprocessing
+import os
+from aiohttp import web
+from dotenv import find_dotenv, load_dotenv
+
+# Load environment variables from a .env file, before Constants reads the settings from them
+load_dotenv(find_dotenv(), override=True)
+
+from src.constants import Constants
+from src.server import CricbotServer
+
+def serve(host: str, port: int, reuse_port: bool):
+    """
+    Runs a worker of the HTTP API server until it is stopped.
+
+    Parameters:
+    ----------
+    host : str
+        The address to listen on.
+    port : int
+        The port to listen on.
+    reuse_port : bool
+        Whether the port is shared with other workers (SO_REUSEPORT), which lets the
+        kernel balance the connections between them.
+    """
+    server = CricbotServer(os.environ.get('OPENAI_API_KEY'))
+    web.run_app(server.create_app(), host=host, port=port, reuse_port=reuse_port, print=None)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Cricbot HTTP API server.")
+    parser.add_argument("--host", default=Constants.SERVER_HOST, help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=Constants.SERVER_PORT, help="Port to listen on.")
+    parser.add_argument("--workers", type=int, default=Constants.SERVER_WORKERS, help="Worker processes, each with its own chain and snapshots.")
+    args = parser.parse_args()
+
+    print(f"Cricbot API listening on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    if args.workers <= 1:
+        serve(args.host, args.port, reuse_port=False)
+    else:
+        # Workers are forked before any chain or connection is created
+        workers = [
+            multiprocessing.Process(target=serve, args=(args.host, args.port, True), daemon=True)
+            for _ in range(args.workers)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
@@ -0,0 +1,2 @@
+from .snapshot_cache import SnapshotCache
+from .lru_cache import LRUCache
\ No newline at end of file
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+class LRUCache:
+    """
+    A thread-safe cache bounded in size, which evicts the least recently used entry
+    once it is full. Entries can optionally expire after a TTL.
+
+    Methods:
+    -------
+    get(key: Hashable) -> Optional[Any]
+        Returns the cached value of the key, or None if it is not cached.
+
+    put(key: Hashable, value: Any)
+        Caches the value for the key.
+
+    delete(key: Hashable)
+        Removes the key from the cache.
+
+    delete_matching(predicate: Callable[[Hashable], bool]) -> int
+        Removes the keys matching the predicate from the cache.
+
+    get_stats() -> dict
+        Returns the hit/miss counters and the size of the cache.
+
+    clear()
+        Removes all entries and resets the counters.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        """
+        Initializes an empty LRUCache.
+
+        Parameters:
+        ----------
+        max_size : int
+            The maximum number of entries to keep.
+        ttl : Optional[float]
+            The number of seconds after which an entry expires. Entries never expire if None.
+        """
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached value of the key, or None if it is not cached.
+
+        Parameters:
+        ----------
+        key : Hashable
+            The key to look up.
+
+        Returns:
+        -------
+        Optional[Any]
+            The cached value, or None on a miss.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                del self.__entries[key]
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Caches the value for the key, evicting the least recently used entry if full.
+
+        Parameters:
+        ----------
+        key : Hashable
+            The key of the value.
+        value : Any
+            The value to cache.
+        """
+        expires_at = time.monotonic() + self.__ttl if self.__ttl is not None else None
+        with self.__lock:
+            self.__entries[key] = (value, expires_at)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """
+        Removes the key from the cache, if present.
+
+        Parameters:
+        ----------
+        key : Hashable
+            The key to remove.
+        """
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Removes the keys matching the predicate from the cache, in a single pass.
+
+        Parameters:
+        ----------
+        predicate : Callable[[Hashable], bool]
+            Returns True for the keys to remove.
+
+        Returns:
+        -------
+        int
+            The number of removed keys.
+        """
+        with self.__lock:
+            keys = [key for key in self.__entries if predicate(key)]
+            for key in keys:
+                del self.__entries[key]
+            return len(keys)
+
+    def get_stats(self) -> dict:
+        """
+        Returns the hit/miss counters and the size of the cache.
+
+        Returns:
+        -------
+        dict
+            The number of hits and misses, the hit ratio, and the current and maximum size.
+        """
+        with self.__lock:
+            total = self.__hits + self.__misses
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hit_ratio": self.__hits / total if total else 0.0,
+                "size": len(self.__entries),
+                "max_size": self.__max_size,
+            }
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
@@ -0,0 +1,386 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sized
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+@dataclass
+class SnapshotEntry:
+    """
+    A class to represent a cached snapshot.
+
+    Attributes:
+    ----------
+    value : Any
+        The cached snapshot.
+    created_at : float
+        The monotonic time at which the snapshot was stored.
+    ttl : float
+        The number of seconds for which the snapshot stays fresh.
+    """
+    value: Any = None
+    created_at: float = 0.0
+    ttl: float = 0.0
+
+    def age(self) -> float:
+        """
+        Returns the age of the snapshot in seconds.
+        """
+        return time.monotonic() - self.created_at
+
+    def is_fresh(self) -> bool:
+        """
+        Indicates if the snapshot is still within its TTL.
+        """
+        return self.age() < self.ttl
+
+@dataclass
+class InFlightLoad:
+    """
+    A class to represent a load which is currently running for a key.
+
+    Attributes:
+    ----------
+    done : threading.Event
+        Set once the load has finished.
+    value : Any
+        The loaded value.
+    error : Optional[Exception]
+        The error raised by the loader, if any.
+    abandoned : bool
+        Set if the load was interrupted (e.g. its caller was cancelled), in which case its
+        waiters retry instead of sharing the interruption.
+    loop : Optional[asyncio.AbstractEventLoop]
+        The event loop running the load, if it is asynchronous.
+    future : Optional[asyncio.Future]
+        Resolved on the event loop once an asynchronous load has finished.
+    """
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[Exception] = None
+    abandoned: bool = False
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    future: Optional[asyncio.Future] = None
+
+class SnapshotCache:
+    """
+    A thread-safe cache of snapshots keyed by string, with a TTL per entry and
+    single-flight de-duplication of concurrent loads for the same key. If bounded, the
+    least recently used snapshots are evicted once the cache is full.
+
+    Methods:
+    -------
+    get_or_load(key: str, loader: Callable[[], Any], ttl: float) -> Any
+        Returns the fresh snapshot for the key, loading it if required.
+
+    aget_or_load(key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any
+        Asynchronously returns the fresh snapshot for the key, loading it if required.
+
+    refresh(key: str, loader: Callable[[], Any], ttl: float) -> Any
+        Loads the snapshot for the key even if a fresh one is cached.
+
+    put(key: str, value: Any, ttl: float)
+        Stores a snapshot for the key, replacing any cached one.
+
+    get_stats() -> dict
+        Returns hit/miss counters and the age of each cached snapshot.
+
+    clear()
+        Removes all cached snapshots and resets the counters.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initializes an empty SnapshotCache.
+
+        Parameters:
+        ----------
+        max_entries : Optional[int]
+            The maximum number of snapshots to keep. Unbounded if None.
+        """
+        self.__max_entries = max_entries
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict = OrderedDict()
+        self.__in_flight: Dict[str, InFlightLoad] = {}
+        self.__hits = 0
+        self.__misses = 0
+        self.__coalesced = 0
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: float, force: bool = False) -> Any:
+        """
+        Returns the fresh snapshot for the key, loading it if required.
+
+        If another caller is already loading the same key, this call waits for
+        that load and shares its result instead of starting a new one.
+        A loader returning None is treated as a failed load and is not cached.
+
+        Parameters:
+        ----------
+        key : str
+            The key of the snapshot.
+        loader : Callable[[], Any]
+            Loads the snapshot when it is missing or stale.
+        ttl : float
+            The number of seconds for which a newly loaded snapshot stays fresh.
+        force : bool
+            Whether to load the snapshot even if a fresh one is cached.
+
+        Returns:
+        -------
+        Any
+            The cached or newly loaded snapshot.
+        """
+        while True:
+            entry, in_flight, is_owner = self.__begin_load(key, force=force)
+            if entry is not None:
+                return entry.value
+            if is_owner:
+                break
+            in_flight.done.wait()
+            # An interrupted load is retried, with one of its waiters as the new owner
+            if not in_flight.abandoned:
+                return self.__get_loaded_value(in_flight)
+
+        try:
+            in_flight.value = loader()
+        except BaseException as e:
+            self.__record_error(in_flight, e)
+            raise
+        finally:
+            self.__finish_load(key, in_flight, ttl)
+        return in_flight.value
+
+    async def aget_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """
+        Asynchronously returns the fresh snapshot for the key, loading it if required.
+
+        Behaves like get_or_load, but awaits the loader and never blocks the event loop
+        while waiting for a load started by another caller. If the caller running a load is
+        cancelled, its waiters do not receive the cancellation: one of them loads again.
+
+        Parameters:
+        ----------
+        key : str
+            The key of the snapshot.
+        loader : Callable[[], Awaitable[Any]]
+            Loads the snapshot when it is missing or stale.
+        ttl : float
+            The number of seconds for which a newly loaded snapshot stays fresh.
+
+        Returns:
+        -------
+        Any
+            The cached or newly loaded snapshot.
+        """
+        while True:
+            entry, in_flight, is_owner = self.__begin_load(key, asyncio.get_running_loop())
+            if entry is not None:
+                return entry.value
+            if is_owner:
+                break
+            if in_flight.future is not None and in_flight.loop is asyncio.get_running_loop():
+                await asyncio.shield(in_flight.future)
+            else:
+                await asyncio.to_thread(in_flight.done.wait)
+            # A load cancelled with its caller (e.g. a client that went away) is retried,
+            # with one of its waiters as the new owner
+            if not in_flight.abandoned:
+                return self.__get_loaded_value(in_flight)
+
+        try:
+            in_flight.value = await loader()
+        except BaseException as e:
+            self.__record_error(in_flight, e)
+            raise
+        finally:
+            self.__finish_load(key, in_flight, ttl)
+        return in_flight.value
+
+    def refresh(self, key: str, loader: Callable[[], Any], ttl: float) -> Any:
+        """
+        Loads the snapshot for the key even if a fresh one is cached.
+
+        The load is single-flight like in get_or_load: if the key is already being loaded,
+        this call shares the result of that load, which is just as recent.
+
+        Parameters:
+        ----------
+        key : str
+            The key of the snapshot.
+        loader : Callable[[], Any]
+            Loads the snapshot.
+        ttl : float
+            The number of seconds for which the loaded snapshot stays fresh.
+
+        Returns:
+        -------
+        Any
+            The newly loaded snapshot.
+        """
+        return self.get_or_load(key, loader, ttl, force=True)
+
+    def put(self, key: str, value: Any, ttl: float):
+        """
+        Stores a snapshot for the key, replacing any cached one.
+
+        Parameters:
+        ----------
+        key : str
+            The key of the snapshot.
+        value : Any
+            The snapshot to store.
+        ttl : float
+            The number of seconds for which the snapshot stays fresh.
+        """
+        with self.__lock:
+            self.__store(key, SnapshotEntry(value, time.monotonic(), ttl))
+
+    def get_stats(self) -> dict:
+        """
+        Returns hit/miss counters and the age and size of each cached snapshot.
+        Looking up the statistics counts neither as a hit nor as a miss.
+
+        Returns:
+        -------
+        dict
+            The number of hits, misses and coalesced loads, and the age in seconds and
+            the number of items (None if the value has no length) of every cached
+            snapshot keyed by its key.
+        """
+        with self.__lock:
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "coalesced": self.__coalesced,
+                "ages": {key: entry.age() for key, entry in self.__entries.items()},
+                "sizes": {
+                    key: len(entry.value) if isinstance(entry.value, Sized) else None
+                    for key, entry in self.__entries.items()
+                },
+            }
+
+    def clear(self):
+        """
+        Removes all cached snapshots and resets the counters.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+            self.__coalesced = 0
+
+    def __begin_load(self, key: str, loop: Optional[asyncio.AbstractEventLoop] = None, force: bool = False) -> Tuple[Optional[SnapshotEntry], Optional[InFlightLoad], bool]:
+        """
+        Looks up the key and registers a new load for it if required.
+
+        Parameters:
+        ----------
+        key : str
+            The key of the snapshot.
+        loop : Optional[asyncio.AbstractEventLoop]
+            The event loop of an asynchronous caller.
+        force : bool
+            Whether to ignore a fresh cached entry.
+
+        Returns:
+        -------
+        Tuple[Optional[SnapshotEntry], Optional[InFlightLoad], bool]
+            The fresh entry if present, otherwise the load to wait for or run, and
+            whether the caller owns (has to run) that load.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and not force and entry.is_fresh():
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return entry, None, False
+            in_flight = self.__in_flight.get(key)
+            if in_flight is not None:
+                self.__coalesced += 1
+                return None, in_flight, False
+            self.__misses += 1
+            in_flight = InFlightLoad()
+            if loop is not None:
+                in_flight.loop = loop
+                in_flight.future = loop.create_future()
+            self.__in_flight[key] = in_flight
+            return None, in_flight, True
+
+    def __finish_load(self, key: str, in_flight: InFlightLoad, ttl: float):
+        """
+        Stores the result of a finished load and wakes up its waiters.
+
+        Parameters:
+        ----------
+        key : str
+            The key of the snapshot.
+        in_flight : InFlightLoad
+            The finished load.
+        ttl : float
+            The number of seconds for which the loaded snapshot stays fresh.
+        """
+        with self.__lock:
+            if in_flight.error is None and not in_flight.abandoned and in_flight.value is not None:
+                self.__store(key, SnapshotEntry(in_flight.value, time.monotonic(), ttl))
+            del self.__in_flight[key]
+        in_flight.done.set()
+        if in_flight.future is not None and not in_flight.future.done():
+            in_flight.future.set_result(None)
+
+    def __store(self, key: str, entry: SnapshotEntry):
+        """
+        Stores an entry, evicting the least recently used ones beyond the bound.
+        Must be called with the lock held.
+
+        Parameters:
+        ----------
+        key : str
+            The key of the snapshot.
+        entry : SnapshotEntry
+            The entry to store.
+        """
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+        if self.__max_entries is not None:
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def __record_error(self, in_flight: InFlightLoad, error: BaseException):
+        """
+        Records the error raised by the loader of a load.
+
+        Errors of the load are shared with its waiters, while interruptions of the caller
+        running it (cancellation, KeyboardInterrupt, SystemExit) are not theirs to receive:
+        the load is marked as abandoned so that they retry it.
+
+        Parameters:
+        ----------
+        in_flight : InFlightLoad
+            The failed load.
+        error : BaseException
+            The error raised by the loader.
+        """
+        if isinstance(error, Exception):
+            in_flight.error = error
+        else:
+            in_flight.abandoned = True
+
+    def __get_loaded_value(self, in_flight: InFlightLoad) -> Any:
+        """
+        Returns the value of a finished load, raising its error if it failed.
+
+        Parameters:
+        ----------
+        in_flight : InFlightLoad
+            The finished load.
+
+        Returns:
+        -------
+        Any
+            The loaded value.
+        """
+        if in_flight.error is not None:
+            raise in_flight.error
+        return in_flight.value
@@ -1 +1 @@
-from .cricbot_chain import generate_chain
\ No newline at end of file
+from .cricbot_chain import generate_chain, get_chain
\ No newline at end of file
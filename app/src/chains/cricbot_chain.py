@@ -1,42 +1,241 @@
-from src.services import IntentHandlerService, ResponseGeneratorService, LiveMatchService, IntentIdentifierService
-from src.utils import get_live_matches_as_string
-from src.models import IntentDetails
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, List, Optional, Union
+from src.constants import Constants
+from src.enums import Intent
+from src.services import IntentHandlerService, ResponseGeneratorService, LiveMatchService, IntentIdentifierService, \
+    RuleBasedIntentService, TemplateResponseService, LiveScorePoller
+from src.tracing import StageTracer, trace_event
+from src.utils import LiveMatchContextBuilder
+from src.models import IntentDetails, MatchDetails
+from langchain_core.language_models import BaseChatModel
 from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.runnables import Runnable, RunnableGenerator, RunnableLambda, RunnablePassthrough
 
-def generate_chain(openai_api_key: str, metadata: dict):
+def generate_chain(openai_api_key: str, intent_llm: Optional[BaseChatModel] = None, response_llm: Optional[BaseChatModel] = None) -> Runnable:
     """
     Creates a processing chain for handling user intents related to cricket matches.
 
+    The chain is stateless: the metadata of a request (e.g. the user input) is passed
+    as the input of the chain, so a single chain can serve every request. Every step
+    has an asynchronous implementation, so `ainvoke`/`astream` never block the event loop.
+
     Parameters:
     ----------
     openai_api_key : str
         The API key for accessing the OpenAI service.
-    metadata : dict
-        Additional metadata to be included in the processing chain.
+    intent_llm : Optional[BaseChatModel]
+        The chat model identifying intents instead of the OpenAI model, e.g. for benchmarks.
+    response_llm : Optional[BaseChatModel]
+        The chat model generating responses instead of the OpenAI model, e.g. for benchmarks.
 
     Returns:
     -------
-    Callable
+    Runnable
         A processing chain that handles user input and generates responses.
     """
     # Initialize services
-    intent_identifier_service = IntentIdentifierService(openai_api_key)
-    response_generator_service = ResponseGeneratorService(openai_api_key)
+    intent_identifier_service = IntentIdentifierService(openai_api_key, intent_llm)
+    response_generator_service = ResponseGeneratorService(openai_api_key, response_llm)
     intent_handler_service = IntentHandlerService()
-    
+    live_match_service = LiveMatchService()
+    rule_based_intent_service = RuleBasedIntentService()
+    template_response_service = TemplateResponseService()
+    live_match_context_builder = LiveMatchContextBuilder()
+    LiveMatchService.add_change_listener(ResponseGeneratorService.invalidate_changed_matches)
+
     # Initialize parsers
     json_parser = JsonOutputParser(pydantic_object=IntentDetails)
     str_parser = StrOutputParser()
-    
-    # Create the processing chain
-    chain = (lambda data: {**data, "live_matches": get_live_matches_as_string(LiveMatchService().fetch_all_matches())}) \
-        | intent_identifier_service.get_prompt_template(json_parser) \
-        | intent_identifier_service.llm \
-        | json_parser \
-        | intent_handler_service.get_addtional_data \
-        | (lambda data: {**metadata, **data}) \
-        | response_generator_service.get_prompt \
-        | response_generator_service.llm \
+
+    # The prompt templates are looked up for every request, so that edited prompt files are
+    # picked up when hot reload is enabled. They are compiled once either way.
+    def get_intent_prompt_template(data: dict) -> Runnable:
+        return intent_identifier_service.get_prompt_template(json_parser)
+
+    async def aget_intent_prompt_template(data: dict) -> Runnable:
+        return get_intent_prompt_template(data)
+
+    intent_model_chain = RunnableLambda(get_intent_prompt_template, afunc=aget_intent_prompt_template) \
+        | intent_identifier_service.llm.with_config(run_name="intent_llm") \
+        | json_parser
+
+    def identify_intent_with_model(data: dict) -> Union[dict, Runnable]:
+        # The same input against the same live matches is only sent to the intent model once
+        cached_intent = intent_identifier_service.get_cached_intent(data)
+        if cached_intent is not None:
+            trace_event(intent_source="cache")
+            return cached_intent
+        trace_event(intent_source="llm")
+        return intent_model_chain | (lambda intent_details: intent_identifier_service.cache_intent(data, intent_details))
+
+    async def aidentify_intent_with_model(data: dict) -> Union[dict, Runnable]:
+        return identify_intent_with_model(data)
+
+    intent_chain = RunnableLambda(lambda data: add_live_matches_context(live_match_context_builder, data)) \
+        | RunnableLambda(identify_intent_with_model, afunc=aidentify_intent_with_model)
+
+    def identify_intent(data: dict) -> Union[dict, Runnable]:
+        # Unambiguous inputs are resolved locally, everything else goes to the intent model
+        if Constants.ENABLE_RULE_BASED_INTENTS:
+            intent_details = rule_based_intent_service.identify_intent(data["user_input"], data["match_snapshot"])
+            if intent_details is not None:
+                trace_event(intent_source="rule")
+                return intent_details
+        return intent_chain
+
+    async def aidentify_intent(data: dict) -> Union[dict, Runnable]:
+        return identify_intent(data)
+
+    response_chain = RunnableLambda(response_generator_service.get_prompt) \
+        | response_generator_service.llm.with_config(run_name="response_llm") \
         | str_parser
-    
+
+    def generate_response(data: dict) -> Union[str, Runnable]:
+        # Configured intents are answered from templates, the rest by the response model
+        # unless the same question was already answered for the current scores
+        if Intent(data["intent"]) in Constants.TEMPLATED_RESPONSE_INTENTS:
+            trace_event(response_source="template")
+            return template_response_service.render(data)
+        cached_response = response_generator_service.get_cached_response(data)
+        if cached_response is not None:
+            trace_event(response_source="cache")
+            return cached_response
+        trace_event(response_source="llm")
+        return response_chain | cache_response(response_generator_service, data)
+
+    async def agenerate_response(data: dict) -> Union[str, Runnable]:
+        return generate_response(data)
+
+    def fetch_match_snapshot(data: dict) -> List[MatchDetails]:
+        if data.get("match_snapshot") is not None:
+            return data["match_snapshot"]
+        matches = live_match_service.fetch_all_matches()
+        trace_event(**LiveMatchService.get_upstream_stats())
+        return matches
+
+    async def afetch_match_snapshot(data: dict) -> List[MatchDetails]:
+        if data.get("match_snapshot") is not None:
+            return data["match_snapshot"]
+        matches = await live_match_service.afetch_all_matches()
+        trace_event(**LiveMatchService.get_upstream_stats())
+        return matches
+
+    # Create the processing chain. Today's matches are fetched once and fanned out to
+    # both the intent prompt and the intent handler, unless the request brings its own
+    # snapshot (e.g. a batch pinned to one snapshot). Every stage is named, so that
+    # StageTracer can measure it.
+    chain = RunnablePassthrough.assign(match_snapshot=RunnableLambda(
+            fetch_match_snapshot,
+            afunc=afetch_match_snapshot
+        ).with_config(run_name="fetch_matches")) \
+        | RunnablePassthrough.assign(intent_details=RunnableLambda(
+            identify_intent,
+            afunc=aidentify_intent
+        ).with_config(run_name="identify_intent")) \
+        | merge_intent_details \
+        | RunnableLambda(
+            intent_handler_service.get_addtional_data,
+            afunc=intent_handler_service.aget_addtional_data
+        ).with_config(run_name="handle_intent") \
+        | RunnableLambda(generate_response, afunc=agenerate_response).with_config(run_name="generate_response")
+
+    return chain.with_config(run_name=StageTracer.TURN)
+
+@lru_cache(maxsize=None)
+def get_chain(openai_api_key: str) -> Runnable:
+    """
+    Returns the processing chain shared by all requests of the process.
+
+    The chain is built on first use for an API key and reused afterwards, which keeps
+    the prompts, parsers and LLM clients (with their connection pools) alive. The
+    background live score poller is started along with it, if enabled.
+    If tracing is enabled, every run of the chain is measured by the shared StageTracer.
+
+    Parameters:
+    ----------
+    openai_api_key : str
+        The API key for accessing the OpenAI service.
+
+    Returns:
+    -------
+    Runnable
+        The shared processing chain.
+    """
+    if Constants.ENABLE_LIVE_SCORE_POLLER:
+        LiveScorePoller.get_shared().start()
+    chain = generate_chain(openai_api_key)
+    if Constants.ENABLE_TRACING:
+        chain = chain.with_config(callbacks=[StageTracer.get_shared()])
     return chain
+
+def add_live_matches_context(live_match_context_builder: LiveMatchContextBuilder, data: dict) -> dict:
+    """
+    Adds the fetched matches and today's date as prompt context for intent identification.
+
+    Parameters:
+    ----------
+    live_match_context_builder : LiveMatchContextBuilder
+        The builder rendering the matches most relevant to the user input within the token budget.
+    data : dict
+        The request metadata along with the 'match_snapshot' of today.
+
+    Returns:
+    -------
+    dict
+        The data along with the matches rendered as 'live_matches' and the ISO date of 'today'.
+    """
+    return {
+        **data,
+        "live_matches": live_match_context_builder.build(data["match_snapshot"], data.get("user_input", "")),
+        "today": datetime.today().strftime("%Y-%m-%d")
+    }
+
+def merge_intent_details(data: dict) -> dict:
+    """
+    Merges the identified intent details into the request metadata.
+
+    Parameters:
+    ----------
+    data : dict
+        The request metadata along with the 'match_snapshot' and 'intent_details'.
+
+    Returns:
+    -------
+    dict
+        The request metadata and match snapshot updated with the intent and entities.
+    """
+    metadata = {key: value for key, value in data.items() if key != "intent_details"}
+    return {**metadata, **data["intent_details"]}
+
+def cache_response(response_generator_service: ResponseGeneratorService, data: dict) -> Runnable:
+    """
+    Creates a step which passes the generated response through and caches it once complete.
+
+    Parameters:
+    ----------
+    response_generator_service : ResponseGeneratorService
+        The service owning the response cache.
+    data : dict
+        The data the response was generated for.
+
+    Returns:
+    -------
+    Runnable
+        A streaming step caching the response.
+    """
+    def transform(chunks: Iterator[str]) -> Iterator[str]:
+        response = ""
+        for chunk in chunks:
+            response += chunk
+            yield chunk
+        response_generator_service.cache_response(data, response)
+
+    async def atransform(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        response = ""
+        async for chunk in chunks:
+            response += chunk
+            yield chunk
+        response_generator_service.cache_response(data, response)
+
+    return RunnableGenerator(transform, atransform)
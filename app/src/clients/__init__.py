@@ -0,0 +1,3 @@
+from .circuit_breaker import CircuitBreaker
+from .livescore_client import LivescoreClient
+from .livescore_payload import EVENT_FIELDS, TEAM_FIELDS, decode_matches_payload, project_matches_payload
@@ -0,0 +1,122 @@
+import threading
+import time
+
+class CircuitBreaker:
+    """
+    A thread-safe circuit breaker which stops calls to a failing upstream for a while.
+
+    The circuit opens after a number of consecutive failures. While open, calls are
+    rejected until the reset timeout has passed, after which a single trial call is
+    let through (half-open). A successful trial closes the circuit again.
+
+    Methods:
+    -------
+    allow_request() -> bool
+        Indicates if a call to the upstream may be made.
+
+    record_success()
+        Records a successful call and closes the circuit.
+
+    record_failure()
+        Records a failed call and opens the circuit if the threshold is reached.
+
+    record_abandoned()
+        Records a call which ended without an outcome, e.g. because it was cancelled.
+
+    get_state() -> str
+        Returns the state of the circuit: 'closed', 'open' or 'half_open'.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Initializes a closed CircuitBreaker.
+
+        Parameters:
+        ----------
+        failure_threshold : int
+            The number of consecutive failures after which the circuit opens.
+        reset_timeout : float
+            The number of seconds to wait before a trial call once the circuit is open.
+        """
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__lock = threading.Lock()
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        """
+        Indicates if a call to the upstream may be made.
+
+        Returns:
+        -------
+        bool
+            True if the circuit is closed, or if this call is the trial call of a half-open circuit.
+        """
+        with self.__lock:
+            state = self.__get_state()
+            if state == CircuitBreaker.CLOSED:
+                return True
+            if state == CircuitBreaker.HALF_OPEN and not self.__trial_in_flight:
+                self.__trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Records a successful call and closes the circuit.
+        """
+        with self.__lock:
+            self.__failures = 0
+            self.__trial_in_flight = False
+
+    def record_failure(self):
+        """
+        Records a failed call and opens the circuit if the threshold is reached.
+        """
+        with self.__lock:
+            self.__failures += 1
+            self.__trial_in_flight = False
+            if self.__failures >= self.__failure_threshold:
+                self.__opened_at = time.monotonic()
+
+    def record_abandoned(self):
+        """
+        Records a call which ended without an outcome, e.g. because it was cancelled.
+        The failure count is unchanged, but another trial call is let through if the
+        abandoned call was the trial of a half-open circuit.
+        """
+        with self.__lock:
+            self.__trial_in_flight = False
+
+    def get_state(self) -> str:
+        """
+        Returns the state of the circuit.
+
+        Returns:
+        -------
+        str
+            'closed', 'open' or 'half_open'.
+        """
+        with self.__lock:
+            return self.__get_state()
+
+    def __get_state(self) -> str:
+        """
+        Returns the state of the circuit. Must be called with the lock held.
+
+        Returns:
+        -------
+        str
+            'closed', 'open' or 'half_open'.
+        """
+        if self.__failures < self.__failure_threshold:
+            return CircuitBreaker.CLOSED
+        if time.monotonic() - self.__opened_at < self.__reset_timeout:
+            return CircuitBreaker.OPEN
+        return CircuitBreaker.HALF_OPEN
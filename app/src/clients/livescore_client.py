@@ -0,0 +1,281 @@
+import asyncio
+import random
+import threading
+import weakref
+from typing import Any, Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.constants import Constants
+from .circuit_breaker import CircuitBreaker
+from .livescore_payload import decode_matches_payload
+
+class LivescoreClient:
+    """
+    An HTTP client for the livescore API with connection pooling, timeouts,
+    retries with jittered backoff and a circuit breaker.
+
+    Methods:
+    -------
+    fetch_matches_payload(cur_date: str) -> Optional[Any]
+        Fetches the matches of a date from the livescore API.
+
+    afetch_matches_payload(cur_date: str) -> Optional[Any]
+        Asynchronously fetches the matches of a date from the livescore API.
+
+    get_stats() -> dict
+        Returns the circuit state and the last status received from the API.
+
+    __get_matches_url(cur_date: str) -> str
+        Returns the URL of the API listing the matches of a date.
+
+    __get_async_client() -> httpx.AsyncClient
+        Returns the pooled asynchronous client of the running event loop.
+
+    __get_backoff(attempt: int) -> float
+        Returns the jittered delay before a retry.
+
+    __decode_response(status: int, content: bytes) -> Optional[Any]
+        Decodes the body of a successful response.
+
+    __record_outcome(completed: bool, status: Optional[int], payload: Optional[Any])
+        Records the outcome of a call with the circuit breaker.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    HEADERS = {
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+    }
+
+    def __init__(self):
+        """
+        Initializes the LivescoreClient with a pooled session configured from Constants.
+        """
+        self.__timeout = (Constants.LIVESCORE_CONNECT_TIMEOUT, Constants.LIVESCORE_READ_TIMEOUT)
+        self.__session = requests.Session()
+        self.__session.headers.update(LivescoreClient.HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=Constants.LIVESCORE_POOL_SIZE,
+            pool_maxsize=Constants.LIVESCORE_POOL_SIZE,
+            max_retries=Retry(
+                total=Constants.LIVESCORE_MAX_RETRIES,
+                backoff_factor=Constants.LIVESCORE_BACKOFF_FACTOR,
+                backoff_jitter=Constants.LIVESCORE_BACKOFF_JITTER,
+                status_forcelist=LivescoreClient.RETRY_STATUSES,
+                allowed_methods=("GET",),
+                raise_on_status=False
+            )
+        )
+        self.__session.mount("https://", adapter)
+        self.__async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self.__circuit_breaker = CircuitBreaker(
+            Constants.LIVESCORE_CIRCUIT_FAILURE_THRESHOLD,
+            Constants.LIVESCORE_CIRCUIT_RESET_TIMEOUT
+        )
+        self.__lock = threading.Lock()
+        self.__last_status: Optional[int] = None
+
+    def fetch_matches_payload(self, cur_date: str) -> Optional[Any]:
+        """
+        Fetches the matches of a date from the livescore API.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date in YYYYMMDD format.
+
+        Returns:
+        -------
+        Optional[Any]
+            The decoded payload projected onto the fields in use, or None if the call
+            failed or the circuit is open.
+        """
+        if not self.__circuit_breaker.allow_request():
+            return None
+        completed = False
+        status = None
+        payload = None
+        try:
+            try:
+                response = self.__session.get(self.__get_matches_url(cur_date), timeout=self.__timeout)
+                status = response.status_code
+                payload = self.__decode_response(response.status_code, response.content)
+            except requests.RequestException:
+                pass
+            completed = True
+        finally:
+            self.__record_outcome(completed, status, payload)
+        return payload
+
+    async def afetch_matches_payload(self, cur_date: str) -> Optional[Any]:
+        """
+        Asynchronously fetches the matches of a date from the livescore API.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date in YYYYMMDD format.
+
+        Returns:
+        -------
+        Optional[Any]
+            The decoded payload projected onto the fields in use, or None if the call
+            failed or the circuit is open.
+        """
+        if not self.__circuit_breaker.allow_request():
+            return None
+        client = self.__get_async_client()
+        url = self.__get_matches_url(cur_date)
+        # The outcome is recorded even if the call is cancelled, so that a half-open
+        # circuit never waits for a trial call which will not complete
+        completed = False
+        status = None
+        payload = None
+        try:
+            try:
+                response = None
+                for attempt in range(Constants.LIVESCORE_MAX_RETRIES + 1):
+                    if attempt > 0:
+                        await asyncio.sleep(self.__get_backoff(attempt))
+                    try:
+                        response = await client.get(url)
+                    except httpx.TransportError:
+                        response = None
+                        continue
+                    if response.status_code not in LivescoreClient.RETRY_STATUSES:
+                        break
+                if response is not None:
+                    status = response.status_code
+                    payload = self.__decode_response(response.status_code, response.content)
+            except httpx.HTTPError:
+                pass
+            completed = True
+        finally:
+            self.__record_outcome(completed, status, payload)
+        return payload
+
+    def get_stats(self) -> dict:
+        """
+        Returns the circuit state and the last status received from the API.
+
+        Returns:
+        -------
+        dict
+            The circuit breaker state and the last HTTP status (None on connection errors).
+        """
+        with self.__lock:
+            last_status = self.__last_status
+        return {
+            "circuit_state": self.__circuit_breaker.get_state(),
+            "last_status": last_status,
+        }
+
+    def __get_matches_url(self, cur_date: str) -> str:
+        """
+        Returns the URL of the API listing the matches of a date.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date in YYYYMMDD format.
+
+        Returns:
+        -------
+        str
+            The URL to fetch the matches from.
+        """
+        return f"https://prod-public-api.livescore.com/v1/api/app/date/cricket/{cur_date}/5.30?locale=en&MD=1"
+
+    def __get_async_client(self) -> httpx.AsyncClient:
+        """
+        Returns the pooled asynchronous client of the running event loop.
+
+        Connections cannot be shared between event loops, so one client is kept per loop.
+
+        Returns:
+        -------
+        httpx.AsyncClient
+            The client of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self.__lock:
+            client = self.__async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    headers=LivescoreClient.HEADERS,
+                    timeout=httpx.Timeout(Constants.LIVESCORE_READ_TIMEOUT, connect=Constants.LIVESCORE_CONNECT_TIMEOUT),
+                    limits=httpx.Limits(
+                        max_connections=Constants.LIVESCORE_POOL_SIZE,
+                        max_keepalive_connections=Constants.LIVESCORE_POOL_SIZE
+                    )
+                )
+                self.__async_clients[loop] = client
+            return client
+
+    def __get_backoff(self, attempt: int) -> float:
+        """
+        Returns the jittered delay before a retry.
+
+        Parameters:
+        ----------
+        attempt : int
+            The number of the upcoming attempt, starting at 1 for the first retry.
+
+        Returns:
+        -------
+        float
+            The delay in seconds.
+        """
+        return Constants.LIVESCORE_BACKOFF_FACTOR * (2 ** (attempt - 1)) \
+            + random.uniform(0, Constants.LIVESCORE_BACKOFF_JITTER)
+
+    def __decode_response(self, status: int, content: bytes) -> Optional[Any]:
+        """
+        Decodes the body of a successful response.
+
+        Parameters:
+        ----------
+        status : int
+            The HTTP status of the response.
+        content : bytes
+            The raw body of the response.
+
+        Returns:
+        -------
+        Optional[Any]
+            The decoded payload, or None if the call failed or the body is not a JSON object.
+        """
+        if not 200 <= status < 300:
+            return None
+        try:
+            return decode_matches_payload(content)
+        except ValueError:
+            return None
+
+    def __record_outcome(self, completed: bool, status: Optional[int], payload: Optional[Any]):
+        """
+        Records the outcome of a call with the circuit breaker. Connection errors,
+        throttling, server errors and successful responses without a valid payload count
+        as upstream failures, while client errors do not.
+
+        Parameters:
+        ----------
+        completed : bool
+            False if the call was interrupted (e.g. cancelled) before it completed.
+        status : Optional[int]
+            The HTTP status of the response, or None if no response was received.
+        payload : Optional[Any]
+            The decoded payload, or None if there is none.
+        """
+        if not completed:
+            self.__circuit_breaker.record_abandoned()
+            return
+        with self.__lock:
+            self.__last_status = status
+        if status is None or status in LivescoreClient.RETRY_STATUSES or status >= 500 \
+                or (200 <= status < 300 and payload is None):
+            self.__circuit_breaker.record_failure()
+        else:
+            self.__circuit_breaker.record_success()
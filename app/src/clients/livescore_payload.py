@@ -0,0 +1,76 @@
+from typing import Any, Optional
+import orjson
+
+# Event fields read into MatchDetails, besides the team names
+EVENT_FIELDS = ('Eid', 'EtTx', 'ECo', 'Eps') + tuple(
+    f'{prefix}{field}'
+    for prefix in ('Tr1', 'Tr2')
+    for field in ('C1', 'CW1', 'CO1', 'CD1', 'C2', 'CW2', 'CO2', 'CD2')
+)
+
+# Team fields read into TeamScoreDetails
+TEAM_FIELDS = ('Nm', 'Abr')
+
+_EVENT_FIELD_SET = frozenset(EVENT_FIELDS)
+_TEAM_FIELD_SET = frozenset(TEAM_FIELDS)
+
+def decode_matches_payload(content: bytes) -> Optional[Any]:
+    """
+    Decodes a livescore date payload and keeps only the fields the live match service uses.
+
+    The payload is decoded from bytes with orjson, which is faster than the standard
+    library, and then projected so that snapshot processing and the diffing of events
+    only see the ~25 keys they read instead of every key of every event.
+
+    Parameters:
+    ----------
+    content : bytes
+        The raw body of the API response.
+
+    Returns:
+    -------
+    Optional[Any]
+        The projected payload with the same 'Stages' -> 'Events' shape, or None if the
+        body is not a JSON object.
+
+    Raises:
+    ------
+    ValueError
+        If the body is not valid JSON.
+    """
+    payload = orjson.loads(content)
+    if not isinstance(payload, dict):
+        return None
+    return project_matches_payload(payload)
+
+def project_matches_payload(payload: dict) -> dict:
+    """
+    Projects a decoded livescore date payload onto the fields the live match service uses.
+
+    Parameters:
+    ----------
+    payload : dict
+        The decoded JSON payload.
+
+    Returns:
+    -------
+    dict
+        A payload with only the series id and name, and the EVENT_FIELDS and team
+        TEAM_FIELDS of every event. Missing fields stay missing.
+    """
+    stages = []
+    for stage in payload.get('Stages', []):
+        events = []
+        for event in stage.get('Events', []):
+            projected = {key: value for key, value in event.items() if key in _EVENT_FIELD_SET}
+            for team_key in ('T1', 'T2'):
+                teams = event.get(team_key)
+                if teams:
+                    projected[team_key] = [{key: value for key, value in teams[0].items() if key in _TEAM_FIELD_SET}]
+            events.append(projected)
+        stages.append({
+            'Scd': stage.get('Scd', ''),
+            'Snm': stage.get('Snm', ''),
+            'Events': events,
+        })
+    return {'Stages': stages}
@@ -1,4 +1,37 @@
 import os
+from src.enums import Intent
+
+def _parse_intents(value: str, name: str, allowed: frozenset) -> frozenset:
+    """
+    Parses a comma separated list of intents from an environment variable.
+
+    Parameters:
+    ----------
+    value : str
+        The value of the environment variable.
+    name : str
+        The name of the environment variable, for the error message.
+    allowed : frozenset
+        The intents which may be listed.
+
+    Returns:
+    -------
+    frozenset
+        The listed intents.
+
+    Raises:
+    ------
+    ValueError
+        If a listed value is not one of the allowed intents.
+    """
+    intents = set()
+    for intent in (intent.strip() for intent in value.split(",")):
+        if not intent:
+            continue
+        if intent not in {allowed_intent.value for allowed_intent in allowed}:
+            raise ValueError(f"{name} lists '{intent}', expected any of: {', '.join(sorted(allowed_intent.value for allowed_intent in allowed))}")
+        intents.add(Intent(intent))
+    return frozenset(intents)
 
 class Constants:
     """
@@ -10,8 +43,67 @@ class Constants:
     INTENT_IDENTIFIER_GPT_MODEL: str = "gpt-4o"
     RESPONSE_GENERATOR_GPT_MODEL: str = "gpt-4o"
 
-    # Base file path for storing prompt files
-    BASE_FILE_PATH: str = os.path.join("app", "src", "prompts")
+    # Optional background poller keeping today's matches in memory. It polls faster (in seconds)
+    # while matches are in progress.
+    ENABLE_LIVE_SCORE_POLLER: bool = os.environ.get("CRICBOT_ENABLE_LIVE_SCORE_POLLER") == "True"
+    LIVE_POLL_INTERVAL: float = float(os.environ.get("CRICBOT_LIVE_POLL_INTERVAL", 10))
+    IDLE_POLL_INTERVAL: float = float(os.environ.get("CRICBOT_IDLE_POLL_INTERVAL", 120))
+
+    # Periods (livescore 'Eps') of matches which have not started or are over
+    NOT_IN_PROGRESS_PERIODS: frozenset = frozenset({"NS", "FT", "AET", "Aband.", "Canc.", "Postp.", "NR", "Awrd."})
+
+    # Formats (livescore 'EtTx', lowercased) of international fixtures
+    INTERNATIONAL_FORMATS: frozenset = frozenset({"test", "odi", "t20i"})
+
+    # Budget (in estimated tokens) of the live matches listed in the intent prompt. Matches
+    # in progress, international fixtures and matches of teams named by the user come first.
+    INTENT_CONTEXT_TOKEN_BUDGET: int = int(os.environ.get("CRICBOT_INTENT_CONTEXT_TOKEN_BUDGET", 1000))
+
+    # HTTP client of the livescore API: pool size, timeouts (in seconds), retries with jittered
+    # exponential backoff, and a circuit breaker serving the last good snapshot while it is open
+    LIVESCORE_POOL_SIZE: int = int(os.environ.get("CRICBOT_LIVESCORE_POOL_SIZE", 20))
+    LIVESCORE_CONNECT_TIMEOUT: float = float(os.environ.get("CRICBOT_LIVESCORE_CONNECT_TIMEOUT", 3.05))
+    LIVESCORE_READ_TIMEOUT: float = float(os.environ.get("CRICBOT_LIVESCORE_READ_TIMEOUT", 10))
+    LIVESCORE_MAX_RETRIES: int = int(os.environ.get("CRICBOT_LIVESCORE_MAX_RETRIES", 2))
+    LIVESCORE_BACKOFF_FACTOR: float = float(os.environ.get("CRICBOT_LIVESCORE_BACKOFF_FACTOR", 0.3))
+    LIVESCORE_BACKOFF_JITTER: float = float(os.environ.get("CRICBOT_LIVESCORE_BACKOFF_JITTER", 0.3))
+    LIVESCORE_CIRCUIT_FAILURE_THRESHOLD: int = int(os.environ.get("CRICBOT_LIVESCORE_CIRCUIT_FAILURE_THRESHOLD", 5))
+    LIVESCORE_CIRCUIT_RESET_TIMEOUT: float = float(os.environ.get("CRICBOT_LIVESCORE_CIRCUIT_RESET_TIMEOUT", 30))
+
+    # Resolves unambiguous inputs like "IND vs AUS score" locally instead of calling the intent model
+    ENABLE_RULE_BASED_INTENTS: bool = os.environ.get("CRICBOT_ENABLE_RULE_BASED_INTENTS", "True") == "True"
+
+    # Intents whose responses are rendered from match data with fixed templates instead of the
+    # response model, e.g. CRICBOT_TEMPLATED_RESPONSE_INTENTS="live_score,live_matches".
+    # Only the intents which have a template are accepted.
+    TEMPLATED_RESPONSE_INTENTS: frozenset = _parse_intents(
+        os.environ.get("CRICBOT_TEMPLATED_RESPONSE_INTENTS", ""),
+        "CRICBOT_TEMPLATED_RESPONSE_INTENTS",
+        frozenset({Intent.live_score, Intent.live_matches})
+    )
+
+    # Intents identified by the intent model, reused for the same normalized input and live matches
+    INTENT_CACHE_SIZE: int = int(os.environ.get("CRICBOT_INTENT_CACHE_SIZE", 2048))
+    INTENT_CACHE_TTL: float = float(os.environ.get("CRICBOT_INTENT_CACHE_TTL", 10 * 60))
+
+    # Maximum number of generated responses cached for repeated questions on unchanged scores
+    RESPONSE_CACHE_SIZE: int = int(os.environ.get("CRICBOT_RESPONSE_CACHE_SIZE", 1024))
+
+    # Connection pool of the HTTP client shared by the OpenAI chat models. Idle connections
+    # are kept alive between chat turns so that TLS setup is not paid on every request.
+    OPENAI_MAX_CONNECTIONS: int = int(os.environ.get("CRICBOT_OPENAI_MAX_CONNECTIONS", 100))
+    OPENAI_KEEPALIVE_EXPIRY: float = float(os.environ.get("CRICBOT_OPENAI_KEEPALIVE_EXPIRY", 120))
+
+    # Base file path for storing prompt files, relative to the package so that it does not
+    # depend on the working directory
+    BASE_FILE_PATH: str = os.environ.get(
+        "CRICBOT_PROMPTS_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+    )
+
+    # Reload prompt files when they are modified, e.g. while editing prompts. Prompts are
+    # otherwise read and compiled once per process.
+    PROMPT_HOT_RELOAD: bool = os.environ.get("CRICBOT_PROMPT_HOT_RELOAD", "False") == "True"
 
     # File names for system messages and prompts
     INTENT_IDENTIFIER_PROMPT: str = "intent_identifier_prompt.txt"
@@ -19,6 +111,67 @@ class Constants:
     ALL_LIVE_MATCHES_RESPONSE_PROMPT: str = "all_live_matches_response_prompt.txt"
     FALLBACK_RESPONSE_PROMPT: str = "fallback_response_prompt.txt"
 
+    # Freshness of cached live match snapshots (in seconds). Today's and future dates change
+    # while matches are played, past dates are practically immutable.
+    LIVE_MATCHES_CACHE_TTL: float = float(os.environ.get("CRICBOT_LIVE_MATCHES_CACHE_TTL", 15))
+    PAST_MATCHES_CACHE_TTL: float = float(os.environ.get("CRICBOT_PAST_MATCHES_CACHE_TTL", 24 * 60 * 60))
+
+    # Number of snapshots (e.g. dates) whose team name index is kept
+    TEAM_INDEX_CACHE_SIZE: int = 16
+
+    # Per-stage latency tracing of the chain: number of recent latencies the percentiles of
+    # each stage are computed over, JSON logs of every turn on stderr, and the Streamlit panel
+    ENABLE_TRACING: bool = os.environ.get("CRICBOT_ENABLE_TRACING", "False") == "True"
+    TRACE_HISTOGRAM_SAMPLES: int = int(os.environ.get("CRICBOT_TRACE_HISTOGRAM_SAMPLES", 1024))
+    ENABLE_TRACE_LOGS: bool = os.environ.get("CRICBOT_ENABLE_TRACE_LOGS", "False") == "True"
+    ENABLE_DEBUG_PANEL: bool = os.environ.get("CRICBOT_ENABLE_DEBUG_PANEL", "False") == "True"
+
+    # Number of queries of a batch run (python app/main.py --batch) processed concurrently
+    BATCH_CONCURRENCY: int = int(os.environ.get("CRICBOT_BATCH_CONCURRENCY", 16))
+
+    # HTTP API server (python app/server.py): address, worker processes, requests processed
+    # concurrently per worker, requests waiting beyond those before 429 is returned, and
+    # seconds before a request is answered with 504
+    SERVER_HOST: str = os.environ.get("CRICBOT_SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.environ.get("CRICBOT_SERVER_PORT", 8080))
+    SERVER_WORKERS: int = int(os.environ.get("CRICBOT_SERVER_WORKERS", 1))
+    SERVER_MAX_CONCURRENCY: int = int(os.environ.get("CRICBOT_SERVER_MAX_CONCURRENCY", 32))
+    SERVER_MAX_QUEUE: int = int(os.environ.get("CRICBOT_SERVER_MAX_QUEUE", 64))
+    SERVER_REQUEST_TIMEOUT: float = float(os.environ.get("CRICBOT_SERVER_REQUEST_TIMEOUT", 30))
+
+    # Messages of the Streamlit chat history kept per session, and displayed per page
+    CHAT_HISTORY_SIZE: int = int(os.environ.get("CRICBOT_CHAT_HISTORY_SIZE", 200))
+    CHAT_PAGE_SIZE: int = int(os.environ.get("CRICBOT_CHAT_PAGE_SIZE", 20))
+
+    # Number of snapshots whose rendered intent prompt context is kept
+    LIVE_MATCH_CONTEXT_CACHE_SIZE: int = 16
+
+    # Number of dates whose matches are kept in the columnar scoreboard store, and the
+    # longest range of dates a single question may ask for
+    SCOREBOARD_MAX_DATES: int = int(os.environ.get("CRICBOT_SCOREBOARD_MAX_DATES", 31))
+    MAX_MATCH_QUERY_DAYS: int = int(os.environ.get("CRICBOT_MAX_MATCH_QUERY_DAYS", 14))
+
+    # Minimum confidence (0 to 1) for a misspelt or partial team name to be matched
+    FUZZY_TEAM_MATCH_THRESHOLD: float = float(os.environ.get("CRICBOT_FUZZY_TEAM_MATCH_THRESHOLD", 0.6))
+
+    # Common nicknames of teams mapped to their cleaned names
+    TEAM_ALIASES: dict = {
+        "men in blue": "india",
+        "aussies": "australia",
+        "baggy greens": "australia",
+        "proteas": "south africa",
+        "kiwis": "new zealand",
+        "blackcaps": "new zealand",
+        "black caps": "new zealand",
+        "windies": "west indies",
+        "three lions": "england",
+        "green shirts": "pakistan",
+        "shaheens": "pakistan",
+        "tigers": "bangladesh",
+        "lions": "sri lanka",
+        "afghans": "afghanistan",
+    }
+
     # Standard response messages for various scenarios
     REASON_NOT_PRESENT: str = "Not able to understand the given input."
     MATCHES_NOT_PRESENT_REASON: str = "There are no live matches"
@@ -1,2 +1,3 @@
 from .match_details import MatchDetails, TeamScoreDetails
+from .match_change import MatchChange
 from .intent_details import IntentDetails
\ No newline at end of file
@@ -18,13 +18,19 @@ class Entities(BaseModel):
     reason : Optional[str]
         The reason why intent identification might have failed.
     date : Optional[datetime]
-        The date of the match.
+        The date of the match, or the first date of a range of dates.
+    end_date : Optional[datetime]
+        The last date of a range of dates.
+    format : Optional[str]
+        The format of the matches (e.g. 'T20', 'ODI', 'Test').
     """
     series: Optional[str] = Field(None, description="Series of a cricket match")
     team1: Optional[str] = Field(None, description="Name of team 1")
     team2: Optional[str] = Field(None, description="Name of team 2")
     reason: Optional[str] = Field(None, description="Reason why intent identification failed")
-    date: Optional[datetime] = Field(None, description="Date of the match")
+    date: Optional[datetime] = Field(None, description="Date of the match, or first date of a range of dates")
+    end_date: Optional[datetime] = Field(None, description="Last date of a range of dates")
+    format: Optional[str] = Field(None, description="Format of the matches, like T20, ODI or Test")
 
 class IntentDetails(BaseModel):
     """
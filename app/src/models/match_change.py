@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Optional
+from .match_details import MatchDetails
+
+@dataclass
+class MatchChange:
+    """
+    A class to represent a change of a match between two snapshots of a date.
+
+    Attributes:
+    ----------
+    match_id : str
+        The unique identifier of the match.
+    old : Optional[MatchDetails]
+        The match in the previous snapshot, or None if it was added.
+    new : Optional[MatchDetails]
+        The match in the new snapshot, or None if it was removed.
+    """
+    match_id: str
+    old: Optional[MatchDetails] = None
+    new: Optional[MatchDetails] = None
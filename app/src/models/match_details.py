@@ -1,11 +1,14 @@
 from dataclasses import dataclass, field
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TeamScoreDetails:
     """
     A class to represent the score details of a cricket team.
 
+    Instances are immutable and slotted, so that snapshots kept in memory stay compact
+    and instances can be shared between snapshots, hashed and compared by value.
+
     Attributes:
     ----------
     name : str
@@ -40,11 +43,14 @@ class TeamScoreDetails:
     over2: Optional[float] = None
     declared2: bool = False
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MatchDetails:
     """
     A class to represent the details of a cricket match.
 
+    Instances are immutable and slotted, so that snapshots kept in memory stay compact
+    and instances can be shared between snapshots, hashed and compared by value.
+
     Attributes:
     ----------
     id : Optional[str]
@@ -57,15 +63,21 @@ class MatchDetails:
         The name of the series.
     status : str
         The current status of the match (e.g., 'ongoing', 'completed').
+    period : str
+        The short state of play (e.g., 'NS' before the start, '1st Inns', 'Stumps', 'FT' once finished).
     team1 : TeamScoreDetails
         An instance of TeamScoreDetails representing the first team.
     team2 : TeamScoreDetails
         An instance of TeamScoreDetails representing the second team.
+    date : Optional[str]
+        The date (YYYYMMDD) of the listing the match was fetched from, if known.
     """
     id: Optional[str] = None
     format: str = ''
     series_id: Optional[str] = None
     series_name: str = ''
     status: str = ''
+    period: str = ''
     team1: TeamScoreDetails = field(default_factory=TeamScoreDetails)
     team2: TeamScoreDetails = field(default_factory=TeamScoreDetails)
+    date: Optional[str] = None
@@ -0,0 +1 @@
+from .cricbot_server import CricbotServer
\ No newline at end of file
@@ -0,0 +1,347 @@
+import asyncio
+import json
+import time
+import traceback
+from typing import Optional
+from aiohttp import web
+from langchain_core.runnables import Runnable
+from src.chains import get_chain
+from src.constants import Constants
+from src.services import LiveMatchService, LiveScorePoller, RuleBasedIntentService
+from src.tracing import StageTracer
+from src.utils import generate_metadata
+
+class CricbotServer:
+    """
+    An asynchronous HTTP API serving the Cricbot chain.
+
+    The chain, its LLM clients and the live match snapshots are shared by all requests of
+    the process. At most SERVER_MAX_CONCURRENCY requests are processed at once, and at most
+    SERVER_MAX_QUEUE more wait for their turn; further requests are rejected with 429 so
+    that a load balancer can retry them on another instance. Requests not answered within
+    SERVER_REQUEST_TIMEOUT seconds are answered with 504.
+
+    Endpoints:
+    ---------
+    POST /chat
+        Answers {"input": "..."} with {"response": "...", "latency_ms": ...}. With
+        "stream": true or 'Accept: text/event-stream', the response is streamed as
+        server-sent events: one message per chunk ({"chunk": "..."}), then a 'done' event
+        ({"latency_ms": ...}), or an 'error' event.
+    GET /health
+        Returns the number of requests in flight and the limits.
+    GET /stats
+        Returns the latency, token and cache statistics of the chain.
+
+    Methods:
+    -------
+    create_app() -> web.Application
+        Creates the aiohttp application.
+
+    __on_startup(app: web.Application)
+        Builds the shared chain before the first request.
+
+    __handle_chat(request: web.Request) -> web.StreamResponse
+        Answers a chat request, as JSON or server-sent events.
+
+    __handle_health(request: web.Request) -> web.Response
+        Returns the load of the server.
+
+    __handle_stats(request: web.Request) -> web.Response
+        Returns the statistics of the chain and the caches.
+
+    __invoke(metadata: dict, started_at: float, timeout: float) -> web.Response
+        Answers a request with the whole response as JSON.
+
+    __stream(request: web.Request, metadata: dict, started_at: float, timeout: float) -> web.StreamResponse
+        Streams the response of a request as server-sent events.
+
+    __wants_stream(request: web.Request, body: dict) -> bool
+        Indicates if the response of a request is to be streamed.
+
+    __error(status: int, message: str) -> web.Response
+        Returns an error response.
+    """
+
+    SSE_CONTENT_TYPE = "text/event-stream"
+
+    def __init__(
+        self,
+        openai_api_key: str,
+        max_concurrency: int = Constants.SERVER_MAX_CONCURRENCY,
+        max_queue: int = Constants.SERVER_MAX_QUEUE,
+        request_timeout: float = Constants.SERVER_REQUEST_TIMEOUT
+    ):
+        """
+        Initializes the CricbotServer.
+
+        Parameters:
+        ----------
+        openai_api_key : str
+            The API key for accessing the OpenAI service.
+        max_concurrency : int
+            The maximum number of requests processed at once.
+        max_queue : int
+            The maximum number of requests waiting to be processed.
+        request_timeout : float
+            The seconds within which a request must be answered, waiting included.
+        """
+        self.__openai_api_key = openai_api_key
+        self.__max_concurrency = max_concurrency
+        self.__max_queue = max_queue
+        self.__request_timeout = request_timeout
+        self.__chain: Optional[Runnable] = None
+        # Created on startup, in the event loop of the server
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+        # Requests being processed or waiting, all handled in the event loop of the server
+        self.__admitted = 0
+        self.__rejected = 0
+        self.__timed_out = 0
+
+    def create_app(self) -> web.Application:
+        """
+        Creates the aiohttp application.
+
+        Returns:
+        -------
+        web.Application
+            The application with the routes of the API.
+        """
+        app = web.Application()
+        app.on_startup.append(self.__on_startup)
+        app.router.add_post("/chat", self.__handle_chat)
+        app.router.add_get("/health", self.__handle_health)
+        app.router.add_get("/stats", self.__handle_stats)
+        return app
+
+    async def __on_startup(self, app: web.Application):
+        """
+        Builds the shared chain before the first request.
+
+        Parameters:
+        ----------
+        app : web.Application
+            The application being started.
+        """
+        self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        self.__chain = get_chain(self.__openai_api_key)
+
+    async def __handle_chat(self, request: web.Request) -> web.StreamResponse:
+        """
+        Answers a chat request, as JSON or server-sent events.
+
+        Parameters:
+        ----------
+        request : web.Request
+            The request, with a JSON body holding the user input as 'input'.
+
+        Returns:
+        -------
+        web.StreamResponse
+            The response, 400 for an invalid body, 429 if too many requests are waiting,
+            or 504 if the request was not answered in time.
+        """
+        started_at = time.perf_counter()
+        try:
+            body = await request.json()
+        except ValueError:
+            return self.__error(400, "The body must be a JSON object")
+        user_input = body.get("input") if isinstance(body, dict) else None
+        if not isinstance(user_input, str) or not user_input.strip():
+            return self.__error(400, "'input' must be a non-empty string")
+        if self.__admitted >= self.__max_concurrency + self.__max_queue:
+            self.__rejected += 1
+            response = self.__error(429, "Too many requests, please retry later")
+            response.headers["Retry-After"] = "1"
+            return response
+
+        self.__admitted += 1
+        try:
+            try:
+                # Unlike wait_for, the timeout cannot expire once the permit is acquired,
+                # so a permit is never taken without being released
+                async with asyncio.timeout(self.__request_timeout):
+                    await self.__semaphore.acquire()
+            except asyncio.TimeoutError:
+                self.__timed_out += 1
+                return self.__error(504, "The request was not processed in time")
+            try:
+                timeout = self.__request_timeout - (time.perf_counter() - started_at)
+                metadata = generate_metadata(user_input=user_input)
+                if self.__wants_stream(request, body):
+                    return await self.__stream(request, metadata, started_at, timeout)
+                return await self.__invoke(metadata, started_at, timeout)
+            finally:
+                self.__semaphore.release()
+        finally:
+            self.__admitted -= 1
+
+    async def __handle_health(self, request: web.Request) -> web.Response:
+        """
+        Returns the load of the server.
+
+        Parameters:
+        ----------
+        request : web.Request
+            The request.
+
+        Returns:
+        -------
+        web.Response
+            The requests in flight, the limits and the number of rejected and timed out requests.
+        """
+        return web.json_response({
+            "status": "ok",
+            "in_flight": self.__admitted,
+            "max_concurrency": self.__max_concurrency,
+            "max_queue": self.__max_queue,
+            "rejected": self.__rejected,
+            "timed_out": self.__timed_out,
+        })
+
+    async def __handle_stats(self, request: web.Request) -> web.Response:
+        """
+        Returns the statistics of the chain and the caches.
+
+        Parameters:
+        ----------
+        request : web.Request
+            The request.
+
+        Returns:
+        -------
+        web.Response
+            The stage statistics of the shared tracer, the statistics of the snapshot
+            cache, the scoreboard store, the poller and the livescore API, and the intents
+            resolved without the intent model.
+        """
+        return web.json_response({
+            "stages": StageTracer.get_shared().get_stats(),
+            "snapshot_cache": LiveMatchService.get_cache_stats(),
+            "scoreboard": LiveMatchService.get_scoreboard_stats(),
+            "poller": LiveScorePoller.get_shared().get_stats(),
+            "upstream": LiveMatchService.get_upstream_stats(),
+            "rule_based_intents": RuleBasedIntentService.get_stats(),
+        }, dumps=lambda data: json.dumps(data, default=str))
+
+    async def __invoke(self, metadata: dict, started_at: float, timeout: float) -> web.Response:
+        """
+        Answers a request with the whole response as JSON.
+
+        Parameters:
+        ----------
+        metadata : dict
+            The input of the chain.
+        started_at : float
+            The time the request was received at, from time.perf_counter.
+        timeout : float
+            The seconds left to answer the request.
+
+        Returns:
+        -------
+        web.Response
+            The response and the latency in milliseconds, 504 on timeout or 500 on errors.
+        """
+        try:
+            response = await asyncio.wait_for(self.__chain.ainvoke(metadata), timeout)
+        except asyncio.TimeoutError:
+            self.__timed_out += 1
+            return self.__error(504, "The response was not generated in time")
+        except Exception:
+            traceback.print_exc()
+            return self.__error(500, "Cricbot is not able to generate response. Please try again later!")
+        return web.json_response({
+            "response": response,
+            "latency_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        })
+
+    async def __stream(self, request: web.Request, metadata: dict, started_at: float, timeout: float) -> web.StreamResponse:
+        """
+        Streams the response of a request as server-sent events.
+
+        Parameters:
+        ----------
+        request : web.Request
+            The request.
+        metadata : dict
+            The input of the chain.
+        started_at : float
+            The time the request was received at, from time.perf_counter.
+        timeout : float
+            The seconds left to answer the request.
+
+        Returns:
+        -------
+        web.StreamResponse
+            The stream of messages, ended by a 'done' or 'error' event.
+        """
+        response = web.StreamResponse(headers={
+            "Content-Type": CricbotServer.SSE_CONTENT_TYPE,
+            "Cache-Control": "no-cache",
+            # Keeps reverse proxies from buffering the events
+            "X-Accel-Buffering": "no",
+        })
+        await response.prepare(request)
+
+        async def send(event: Optional[str], data: dict):
+            # Events without a name are delivered as messages
+            prefix = f"event: {event}\n" if event else ""
+            await response.write(f"{prefix}data: {json.dumps(data)}\n\n".encode())
+
+        async def send_chunks():
+            async for chunk in self.__chain.astream(metadata):
+                await send(None, {"chunk": chunk})
+
+        try:
+            try:
+                await asyncio.wait_for(send_chunks(), timeout)
+                await send("done", {"latency_ms": round((time.perf_counter() - started_at) * 1000, 1)})
+            except asyncio.TimeoutError:
+                self.__timed_out += 1
+                await send("error", {"error": "The response was not generated in time"})
+            except ConnectionResetError:
+                raise
+            except Exception:
+                traceback.print_exc()
+                await send("error", {"error": "Cricbot is not able to generate response. Please try again later!"})
+            await response.write_eof()
+        except ConnectionResetError:
+            # The client went away, there is nobody to answer, not even with an error
+            pass
+        return response
+
+    def __wants_stream(self, request: web.Request, body: dict) -> bool:
+        """
+        Indicates if the response of a request is to be streamed.
+
+        Parameters:
+        ----------
+        request : web.Request
+            The request.
+        body : dict
+            The JSON body of the request.
+
+        Returns:
+        -------
+        bool
+            True if the body asks for streaming or the client accepts only server-sent events.
+        """
+        return body.get("stream") is True or request.headers.get("Accept", "").startswith(CricbotServer.SSE_CONTENT_TYPE)
+
+    def __error(self, status: int, message: str) -> web.Response:
+        """
+        Returns an error response.
+
+        Parameters:
+        ----------
+        status : int
+            The HTTP status.
+        message : str
+            The description of the error.
+
+        Returns:
+        -------
+        web.Response
+            The JSON error response.
+        """
+        return web.json_response({"error": message}, status=status)
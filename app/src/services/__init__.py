@@ -1,4 +1,7 @@
 from .intent_identifier_service import IntentIdentifierService
 from .live_match_service import LiveMatchService
 from .response_generator_service import ResponseGeneratorService
-from .intent_handler_service import IntentHandlerService
\ No newline at end of file
+from .intent_handler_service import IntentHandlerService
+from .rule_based_intent_service import RuleBasedIntentService
+from .template_response_service import TemplateResponseService
+from .live_score_poller import LiveScorePoller
\ No newline at end of file
@@ -1,7 +1,8 @@
+from typing import List, Optional
 from .live_match_service import LiveMatchService
 from src.constants import Constants
 from src.enums import Intent
-from src.models import IntentDetails
+from src.models import IntentDetails, MatchDetails
 
 class IntentHandlerService:
     """
@@ -17,10 +18,16 @@ class IntentHandlerService:
     get_addtional_data(data: dict) -> dict
         Processes the input data to fetch additional information based on the identified intent.
 
-    __get_current_matches_intent_data(intent_details: IntentDetails) -> dict
+    aget_addtional_data(data: dict) -> dict
+        Asynchronously processes the input data to fetch additional information based on the identified intent.
+
+    __get_match_snapshot(data: dict, intent_details: IntentDetails) -> Optional[List[MatchDetails]]
+        Returns the already fetched matches if they cover the date asked for.
+
+    __get_current_matches_intent_data(intent_details: IntentDetails, live_matches: List[MatchDetails]) -> dict
         Handles the 'live_matches' intent and returns relevant match data.
 
-    __get_live_score_intent_data(intent_details: IntentDetails) -> dict
+    __get_live_score_intent_data(match_score: Optional[MatchDetails], live_matches: List[MatchDetails]) -> dict
         Handles the 'live_score' intent and returns the match score or fallback data.
 
     __get_fallback_intent_data(intent_details: IntentDetails) -> dict
@@ -40,7 +47,48 @@ class IntentHandlerService:
         Parameters:
         ----------
         data : dict
-            The input data containing intent and entities.
+            The input data containing intent and entities, and optionally the already
+            fetched matches of today under 'match_snapshot'.
+
+        Returns:
+        -------
+        dict
+            The enriched data with additional information based on the intent.
+        """
+        intent_details = IntentDetails(**data)
+        entities = intent_details.entities
+        snapshot = self.__get_match_snapshot(data, intent_details)
+        match intent_details.intent:
+            case Intent.live_matches:
+                live_matches = self.__live_match_service.find_matches(
+                    entities.date,
+                    entities.end_date,
+                    series=entities.series,
+                    format=entities.format,
+                    live_matches=data.get("match_snapshot")
+                )
+                additional_data = self.__get_current_matches_intent_data(intent_details, live_matches)
+            case Intent.live_score:
+                match_score, live_matches = self.__live_match_service.fetch_live_score(
+                    entities.team1, 
+                    entities.team2,
+                    entities.date,
+                    snapshot
+                )
+                additional_data = self.__get_live_score_intent_data(match_score, live_matches)
+            case _:
+                additional_data = self.__get_fallback_intent_data(intent_details)
+        return {**data, **additional_data}
+
+    async def aget_addtional_data(self, data: dict) -> dict:
+        """
+        Asynchronously processes the input data to fetch additional information based on the identified intent.
+
+        Parameters:
+        ----------
+        data : dict
+            The input data containing intent and entities, and optionally the already
+            fetched matches of today under 'match_snapshot'.
 
         Returns:
         -------
@@ -48,16 +96,51 @@ class IntentHandlerService:
             The enriched data with additional information based on the intent.
         """
         intent_details = IntentDetails(**data)
+        entities = intent_details.entities
+        snapshot = self.__get_match_snapshot(data, intent_details)
         match intent_details.intent:
             case Intent.live_matches:
-                additional_data = self.__get_current_matches_intent_data(intent_details)
+                live_matches = await self.__live_match_service.afind_matches(
+                    entities.date,
+                    entities.end_date,
+                    series=entities.series,
+                    format=entities.format,
+                    live_matches=data.get("match_snapshot")
+                )
+                additional_data = self.__get_current_matches_intent_data(intent_details, live_matches)
             case Intent.live_score:
-                additional_data = self.__get_live_score_intent_data(intent_details)
+                match_score, live_matches = await self.__live_match_service.afetch_live_score(
+                    entities.team1, 
+                    entities.team2,
+                    entities.date,
+                    snapshot
+                )
+                additional_data = self.__get_live_score_intent_data(match_score, live_matches)
             case _:
                 additional_data = self.__get_fallback_intent_data(intent_details)
         return {**data, **additional_data}
 
-    def __get_current_matches_intent_data(self, intent_details: IntentDetails) -> dict:
+    def __get_match_snapshot(self, data: dict, intent_details: IntentDetails) -> Optional[List[MatchDetails]]:
+        """
+        Returns the already fetched matches if they cover the date asked for.
+
+        Parameters:
+        ----------
+        data : dict
+            The input data which may contain the 'match_snapshot' of today.
+        intent_details : IntentDetails
+            The details of the identified intent.
+
+        Returns:
+        -------
+        Optional[List[MatchDetails]]
+            The matches to reuse, or None if they have to be fetched.
+        """
+        if intent_details.entities.date is not None:
+            return None
+        return data.get("match_snapshot")
+
+    def __get_current_matches_intent_data(self, intent_details: IntentDetails, live_matches: List[MatchDetails]) -> dict:
         """
         Handles the 'live_matches' intent and returns relevant match data.
 
@@ -65,6 +148,8 @@ class IntentHandlerService:
         ----------
         intent_details : IntentDetails
             The details of the identified intent.
+        live_matches : List[MatchDetails]
+            The matches of the requested dates, already filtered by series and format.
 
         Returns:
         -------
@@ -72,40 +157,34 @@ class IntentHandlerService:
             Additional data for live matches.
         """
         entities = intent_details.entities
-        live_matches = self.__live_match_service.fetch_all_matches(entities.date)
-        series = entities.series
-        if series:
-            live_matches_of_series = [match for match in live_matches if match.series_name.lower() == series.lower()]
-            additional_data = {
-                "series": series,
-                "live_matches": live_matches_of_series
-            }
-        else:
-            additional_data = {
-                "live_matches": live_matches
-            }
+        additional_data = {
+            "live_matches": live_matches
+        }
+        if entities.series:
+            additional_data["series"] = entities.series
+        if entities.format:
+            additional_data["format"] = entities.format
+        if entities.date:
+            additional_data["date"] = entities.date
+            additional_data["end_date"] = entities.end_date or entities.date
         return additional_data
 
-    def __get_live_score_intent_data(self, intent_details: IntentDetails) -> dict:
+    def __get_live_score_intent_data(self, match_score: Optional[MatchDetails], live_matches: List[MatchDetails]) -> dict:
         """
         Handles the 'live_score' intent and returns the match score or fallback data.
 
         Parameters:
         ----------
-        intent_details : IntentDetails
-            The details of the identified intent.
+        match_score : Optional[MatchDetails]
+            The match between the requested teams, or None if not found.
+        live_matches : List[MatchDetails]
+            The matches of the requested date.
 
         Returns:
         -------
         dict
             Additional data for the live score or fallback information.
         """
-        entities = intent_details.entities
-        match_score, live_matches = self.__live_match_service.fetch_live_score(
-            entities.team1, 
-            entities.team2,
-            entities.date
-        )
         if match_score is None and len(live_matches) > 0:
             additional_data = {
                 "intent": Intent.live_matches,
@@ -1,9 +1,14 @@
 # Import necessary modules and classes
+import copy
+import hashlib
+from typing import Optional, Tuple
 from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
+from src.caches import LRUCache
 from src.constants import Constants
-from src.utils import read_prompt_from_file, get_live_matches_as_string
+from src.utils import load_prompt_template, get_live_matches_as_string, get_openai_http_client, get_openai_async_http_client, normalize_text
 
 class IntentIdentifierService:
     """
@@ -11,16 +16,34 @@ class IntentIdentifierService:
 
     Attributes:
     ----------
-    llm : ChatOpenAI
-        An instance of ChatOpenAI configured with a specific model and API key.
+    llm : BaseChatModel
+        An instance of ChatOpenAI configured with a specific model and API key, unless
+        another chat model was given.
 
     Methods:
     -------
     get_prompt_template(parser: JsonOutputParser)
         Constructs a prompt template for the language model.
+
+    get_cached_intent(data: dict) -> Optional[dict]
+        Returns the intent identified earlier for the same input and live matches.
+
+    cache_intent(data: dict, intent_details: dict) -> dict
+        Caches the intent identified for the input and live matches in the data.
+
+    get_cache_stats() -> dict
+        Returns the hit/miss counters of the shared intent cache.
+
+    clear_cache()
+        Removes all entries of the shared intent cache.
+
+    __get_cache_key(data: dict) -> Tuple[str, str, str]
+        Returns the cache key of the normalized input and the context of the prompt.
     """
 
-    def __init__(self, openai_api_key: str):
+    __intent_cache = LRUCache(Constants.INTENT_CACHE_SIZE, Constants.INTENT_CACHE_TTL)
+
+    def __init__(self, openai_api_key: str, llm: Optional[BaseChatModel] = None):
         """
         Initializes the IntentIdentifierService with the specified OpenAI API key.
 
@@ -28,17 +51,27 @@ class IntentIdentifierService:
         ----------
         openai_api_key : str
             The API key for accessing the OpenAI service.
+        llm : Optional[BaseChatModel]
+            The chat model to use instead of the OpenAI model, e.g. a fake model for benchmarks.
         """
         # Initialize the language model with the specified model and API key
-        self.llm = ChatOpenAI(
+        self.llm = llm or ChatOpenAI(
             model=Constants.INTENT_IDENTIFIER_GPT_MODEL, 
-            api_key=openai_api_key
+            api_key=openai_api_key,
+            http_client=get_openai_http_client(),
+            http_async_client=get_openai_async_http_client(),
+            # Report token usage on streamed responses as well, for tracing
+            stream_usage=True
         )
+        self.__format_instructions: Optional[Tuple[JsonOutputParser, str]] = None
     
     def get_prompt_template(self, parser: JsonOutputParser) -> PromptTemplate:
         """
         Constructs a chat prompt template for the language model.
 
+        The template is compiled once (see load_prompt_template), so this is cheap enough to
+        call for every request, which picks up edited prompts when hot reload is enabled.
+
         Parameters:
         ----------
         parser : JsonOutputParser
@@ -49,8 +82,84 @@ class IntentIdentifierService:
         PromptTemplate
             The constructed chat prompt template.
         """
-        # Create a prompt template using a predefined template file and parser instructions
-        return PromptTemplate.from_template(
-            template=read_prompt_from_file(Constants.INTENT_IDENTIFIER_PROMPT),
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
\ No newline at end of file
+        # The format instructions are generated from the JSON schema of the parser, which is
+        # too slow to repeat for every request, so they are kept along with their parser
+        if self.__format_instructions is None or self.__format_instructions[0] is not parser:
+            self.__format_instructions = (parser, parser.get_format_instructions())
+        return load_prompt_template(
+            Constants.INTENT_IDENTIFIER_PROMPT,
+            format_instructions=self.__format_instructions[1]
+        )
+
+    def get_cached_intent(self, data: dict) -> Optional[dict]:
+        """
+        Returns the intent identified earlier for the same input and live matches.
+
+        Parameters:
+        ----------
+        data : dict
+            The prompt input containing 'user_input' and the 'live_matches' context.
+
+        Returns:
+        -------
+        Optional[dict]
+            A copy of the parsed intent details, or None if not cached.
+        """
+        intent_details = IntentIdentifierService.__intent_cache.get(self.__get_cache_key(data))
+        return copy.deepcopy(intent_details) if intent_details is not None else None
+
+    def cache_intent(self, data: dict, intent_details: dict) -> dict:
+        """
+        Caches the intent identified for the input and live matches in the data.
+
+        Parameters:
+        ----------
+        data : dict
+            The prompt input containing 'user_input' and the 'live_matches' context.
+        intent_details : dict
+            The parsed intent details.
+
+        Returns:
+        -------
+        dict
+            The intent details, unchanged.
+        """
+        IntentIdentifierService.__intent_cache.put(self.__get_cache_key(data), copy.deepcopy(intent_details))
+        return intent_details
+
+    @staticmethod
+    def clear_cache():
+        """
+        Removes all entries of the shared intent cache and resets its counters.
+        """
+        IntentIdentifierService.__intent_cache.clear()
+
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """
+        Returns the hit/miss counters of the shared intent cache.
+
+        Returns:
+        -------
+        dict
+            The statistics of the process-wide intent cache.
+        """
+        return IntentIdentifierService.__intent_cache.get_stats()
+
+    def __get_cache_key(self, data: dict) -> Tuple[str, str, str]:
+        """
+        Returns the cache key of the normalized input and the context of the prompt.
+
+        Parameters:
+        ----------
+        data : dict
+            The prompt input containing 'user_input' and the 'live_matches' and 'today' context.
+
+        Returns:
+        -------
+        Tuple[str, str, str]
+            The normalized user input, a fingerprint of the live matches and today's date,
+            which relative dates like 'tomorrow' are resolved against.
+        """
+        fingerprint = hashlib.blake2b(data.get("live_matches", "").encode(), digest_size=16).hexdigest()
+        return normalize_text(data.get("user_input") or ""), fingerprint, data.get("today", "")
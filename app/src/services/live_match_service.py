@@ -1,31 +1,102 @@
-from datetime import datetime
-from typing import Any, List, Optional, Tuple
-import requests
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from src.models import MatchDetails, TeamScoreDetails
-from src.utils import clean_team_name, clean_team_names
+from src.caches import LRUCache, SnapshotCache
+from src.clients import EVENT_FIELDS, TEAM_FIELDS, LivescoreClient
+from src.constants import Constants
+from src.models import MatchChange, MatchDetails, TeamScoreDetails
+from src.utils import ScoreboardStore, TeamIndex
 
 class LiveMatchService:
     """
     A service class to fetch and identify live cricket match scores.
 
+    Fetched matches are kept in a process-wide snapshot cache keyed by date, so that
+    every instance of the service shares the same snapshots and in-flight fetches.
+    If the API is failing, the last good snapshot of the date is served instead.
+
     Methods:
     -------
     fetch_live_score(team1: str, team2: str) -> Tuple[Optional[MatchDetails], List[MatchDetails]]
         Fetches live scores and finds the match between the specified teams.
 
+    afetch_live_score(team1: str, team2: str) -> Tuple[Optional[MatchDetails], List[MatchDetails]]
+        Asynchronously fetches live scores and finds the match between the specified teams.
+
     fetch_all_live_matches(date: Optional[str] = None) -> List[MatchDetails]
         Retrieves all live matches from the external API for a given date.
 
-    __process_matches_data(response: Any) -> List[MatchDetails]
-        Processes the API response to extract match details.
+    afetch_all_matches(date: Optional[datetime] = None) -> List[MatchDetails]
+        Asynchronously retrieves all live matches from the external API for a given date.
+
+    refresh_matches(ttl: float, date: Optional[datetime] = None) -> List[MatchDetails]
+        Fetches the matches of a date bypassing the cache and stores them in the cache.
+
+    find_matches(start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, series: Optional[str] = None, team: Optional[str] = None, format: Optional[str] = None, live_matches: Optional[List[MatchDetails]] = None) -> List[MatchDetails]
+        Finds the matches of a range of dates by series, team and format.
+
+    afind_matches(start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, series: Optional[str] = None, team: Optional[str] = None, format: Optional[str] = None, live_matches: Optional[List[MatchDetails]] = None) -> List[MatchDetails]
+        Asynchronously finds the matches of a range of dates by series, team and format.
+
+    create_matches(payload: Any) -> List[MatchDetails]
+        Creates the matches of a decoded API payload, independently of the cached snapshots.
+
+    get_cache_stats() -> dict
+        Returns the hit/miss counters and the snapshot ages and sizes of the shared cache.
+
+    get_scoreboard_stats() -> dict
+        Returns the dates and number of matches held by the scoreboard store.
+
+    get_upstream_stats() -> dict
+        Returns the circuit state and last status of the livescore API client.
+
+    set_livescore_client(livescore_client: LivescoreClient)
+        Replaces the livescore API client shared by all instances.
+
+    __get_snapshot(date: Optional[datetime]) -> Optional[List[MatchDetails]]
+        Returns the cached snapshot of a date, fetching it if required.
+
+    __aget_snapshot(date: Optional[datetime]) -> Optional[List[MatchDetails]]
+        Asynchronously returns the cached snapshot of a date, fetching it if required.
+
+    __get_snapshot_key(date: Optional[datetime]) -> Tuple[str, float]
+        Returns the snapshot cache key and TTL for a date.
+
+    __get_query_dates(start_date: Optional[datetime], end_date: Optional[datetime]) -> List[datetime]
+        Returns the dates of a range, bounded to MAX_MATCH_QUERY_DAYS.
+
+    __query_store(dates: List[datetime], snapshots: List[Optional[List[MatchDetails]]], series: Optional[str], team: Optional[str], format: Optional[str]) -> List[MatchDetails]
+        Stores the snapshots of the dates and queries the matches of the range.
 
-    __create_match_details(event: dict, series_id: str, series_name: str) -> MatchDetails
+    __load_matches(cur_date: str) -> Optional[List[MatchDetails]]
+        Fetches the matches of a date from the external API.
+
+    __aload_matches(cur_date: str) -> Optional[List[MatchDetails]]
+        Asynchronously fetches the matches of a date from the external API.
+
+    add_change_listener(listener: Callable[[str, List[MatchChange]], None])
+        Registers a listener called with the changed matches of each fetch.
+
+    __process_payload(cur_date: str, payload: Optional[Any]) -> Optional[List[MatchDetails]]
+        Processes the API payload of a date and remembers it as the last good snapshot.
+
+    __process_matches_data(response: Any, previous_states: Dict[str, Tuple[tuple, MatchDetails]], cur_date: Optional[str] = None) -> Tuple[List[MatchDetails], Dict[str, Tuple[tuple, MatchDetails]], List[MatchChange]]
+        Processes the API response to extract match details, reusing unchanged matches.
+
+    __get_event_state(event: dict, series_id: str, series_name: str) -> tuple
+        Returns the values of all event fields a MatchDetails object is created from.
+
+    __create_match_details(event: dict, series_id: str, series_name: str, cur_date: Optional[str]) -> MatchDetails
         Creates a MatchDetails object from event data.
 
     __create_team_details(event: dict, team_key: str, score_prefix: str) -> TeamScoreDetails
         Creates a TeamScoreDetails object from event data.
 
+    __intern(value: Optional[str]) -> Optional[str]
+        Interns a string repeated across matches and snapshots, like team and series names.
+
     __safe_int(value: Optional[str]) -> Optional[int]
         Safely converts a string to an integer.
 
@@ -34,9 +105,21 @@ class LiveMatchService:
 
     __find_match(matches: List[MatchDetails], team1: str, team2: str) -> Optional[MatchDetails]
         Finds a match between the specified teams from the list of matches.
+
+    __get_team_index(matches: List[MatchDetails]) -> TeamIndex
+        Returns the team index of a snapshot, building it on first use.
     """
 
-    def fetch_live_score(self, team1: str, team2: str, date: Optional[datetime] = None) -> Tuple[Optional[MatchDetails], List[MatchDetails]]:
+    __snapshot_cache = SnapshotCache(Constants.SCOREBOARD_MAX_DATES)
+    __livescore_client = LivescoreClient()
+    # Dates are supplied by users, so the state kept per date is bounded like the scoreboard store
+    __last_good_snapshots = LRUCache(Constants.SCOREBOARD_MAX_DATES)
+    __match_states = LRUCache(Constants.SCOREBOARD_MAX_DATES)
+    __change_listeners: List[Callable[[str, List[MatchChange]], None]] = []
+    __team_indexes = LRUCache(Constants.TEAM_INDEX_CACHE_SIZE)
+    __scoreboard_store = ScoreboardStore()
+
+    def fetch_live_score(self, team1: str, team2: str, date: Optional[datetime] = None, live_matches: Optional[List[MatchDetails]] = None) -> Tuple[Optional[MatchDetails], List[MatchDetails]]:
         """
         Fetches live scores and finds the match between the specified teams.
 
@@ -46,6 +129,35 @@ class LiveMatchService:
             The name of the first team.
         team2 : str
             The name of the second team.
+        date : Optional[datetime]
+            The date of the match. Defaults to today.
+        live_matches : Optional[List[MatchDetails]]
+            Already fetched matches of the date to search, if available.
+
+        Returns:
+        -------
+        Tuple[Optional[MatchDetails], List[MatchDetails]]
+            A tuple containing the details of the match between the specified teams, 
+            or None if not found, and a list of all live matches.
+        """
+        if live_matches is None:
+            live_matches = self.fetch_all_matches(date)
+        return (self.__find_match(live_matches, team1, team2), live_matches)
+
+    async def afetch_live_score(self, team1: str, team2: str, date: Optional[datetime] = None, live_matches: Optional[List[MatchDetails]] = None) -> Tuple[Optional[MatchDetails], List[MatchDetails]]:
+        """
+        Asynchronously fetches live scores and finds the match between the specified teams.
+
+        Parameters:
+        ----------
+        team1 : str
+            The name of the first team.
+        team2 : str
+            The name of the second team.
+        date : Optional[datetime]
+            The date of the match. Defaults to today.
+        live_matches : Optional[List[MatchDetails]]
+            Already fetched matches of the date to search, if available.
 
         Returns:
         -------
@@ -53,7 +165,8 @@ class LiveMatchService:
             A tuple containing the details of the match between the specified teams, 
             or None if not found, and a list of all live matches.
         """
-        live_matches = self.fetch_all_matches(date)
+        if live_matches is None:
+            live_matches = await self.afetch_all_matches(date)
         return (self.__find_match(live_matches, team1, team2), live_matches)
 
     def fetch_all_matches(self, date: Optional[datetime] = None) -> List[MatchDetails]:
@@ -70,15 +183,413 @@ class LiveMatchService:
         List[MatchDetails]
             A list of MatchDetails objects representing live matches.
         """
+        matches = self.__get_snapshot(date)
+        return matches if matches is not None else []
+
+    async def afetch_all_matches(self, date: Optional[datetime] = None) -> List[MatchDetails]:
+        """
+        Asynchronously retrieves all live matches from the external API for a given date.
+
+        Parameters:
+        ----------
+        date : Optional[str]
+            The date for which to fetch live matches in YYYYMMDD format. Defaults to today.
+
+        Returns:
+        -------
+        List[MatchDetails]
+            A list of MatchDetails objects representing live matches.
+        """
+        matches = await self.__aget_snapshot(date)
+        return matches if matches is not None else []
+
+    def refresh_matches(self, ttl: float, date: Optional[datetime] = None) -> List[MatchDetails]:
+        """
+        Fetches the matches of a date bypassing the cache and stores them in the cache.
+
+        The fetch is single-flight with the fetches of requests, so that snapshots of the
+        same date are never processed concurrently.
+
+        Parameters:
+        ----------
+        ttl : float
+            The number of seconds for which the refreshed snapshot stays fresh.
+        date : Optional[datetime]
+            The date for which to refresh the matches. Defaults to today.
+
+        Returns:
+        -------
+        List[MatchDetails]
+            The refreshed matches.
+        """
+        cur_date, _ = self.__get_snapshot_key(date)
+        matches = LiveMatchService.__snapshot_cache.refresh(
+            cur_date,
+            lambda: self.__load_matches(cur_date),
+            ttl
+        )
+        return matches if matches is not None else []
+
+    def find_matches(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        series: Optional[str] = None,
+        team: Optional[str] = None,
+        format: Optional[str] = None,
+        live_matches: Optional[List[MatchDetails]] = None
+    ) -> List[MatchDetails]:
+        """
+        Finds the matches of a range of dates by series, team and format.
+
+        Dates whose snapshot is cached are not fetched again, and the matches of the
+        whole range are filtered in a single pass over the scoreboard store.
+
+        Parameters:
+        ----------
+        start_date : Optional[datetime]
+            The first date of the range. Defaults to today.
+        end_date : Optional[datetime]
+            The last date of the range (inclusive). Defaults to the start date.
+        series : Optional[str]
+            The series of the matches, if any.
+        team : Optional[str]
+            A team playing the matches, if any.
+        format : Optional[str]
+            The format of the matches (e.g. 'T20', 'Test'), if any.
+        live_matches : Optional[List[MatchDetails]]
+            Already fetched matches of today, if available.
+
+        Returns:
+        -------
+        List[MatchDetails]
+            The matching matches, ordered by date.
+        """
+        dates = self.__get_query_dates(start_date, end_date)
+        today = datetime.today().strftime("%Y%m%d")
+        snapshots = [
+            live_matches if live_matches is not None and date.strftime("%Y%m%d") == today else self.__get_snapshot(date)
+            for date in dates
+        ]
+        return self.__query_store(dates, snapshots, series, team, format)
+
+    async def afind_matches(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        series: Optional[str] = None,
+        team: Optional[str] = None,
+        format: Optional[str] = None,
+        live_matches: Optional[List[MatchDetails]] = None
+    ) -> List[MatchDetails]:
+        """
+        Asynchronously finds the matches of a range of dates by series, team and format.
+        The dates which are not cached are fetched concurrently.
+
+        Parameters:
+        ----------
+        start_date : Optional[datetime]
+            The first date of the range. Defaults to today.
+        end_date : Optional[datetime]
+            The last date of the range (inclusive). Defaults to the start date.
+        series : Optional[str]
+            The series of the matches, if any.
+        team : Optional[str]
+            A team playing the matches, if any.
+        format : Optional[str]
+            The format of the matches (e.g. 'T20', 'Test'), if any.
+        live_matches : Optional[List[MatchDetails]]
+            Already fetched matches of today, if available.
+
+        Returns:
+        -------
+        List[MatchDetails]
+            The matching matches, ordered by date.
+        """
+        dates = self.__get_query_dates(start_date, end_date)
+        today = datetime.today().strftime("%Y%m%d")
+
+        async def fetch(date: datetime) -> Optional[List[MatchDetails]]:
+            if live_matches is not None and date.strftime("%Y%m%d") == today:
+                return live_matches
+            return await self.__aget_snapshot(date)
+
+        snapshots = await asyncio.gather(*(fetch(date) for date in dates))
+        return self.__query_store(dates, snapshots, series, team, format)
+
+    def create_matches(self, payload: Any) -> List[MatchDetails]:
+        """
+        Creates the matches of a decoded API payload, independently of the cached snapshots.
+
+        No match is reused from a previous snapshot and the change listeners are not called,
+        e.g. to measure the processing of payloads.
+
+        Parameters:
+        ----------
+        payload : Any
+            The decoded JSON payload of the date API.
+
+        Returns:
+        -------
+        List[MatchDetails]
+            The matches of the payload.
+        """
+        return self.__process_matches_data(payload, {})[0]
+
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """
+        Returns the hit/miss counters and snapshot ages of the shared cache.
+
+        Returns:
+        -------
+        dict
+            The statistics of the process-wide live match snapshot cache.
+        """
+        return LiveMatchService.__snapshot_cache.get_stats()
+
+    @staticmethod
+    def get_upstream_stats() -> dict:
+        """
+        Returns the circuit state and last status of the livescore API client.
+
+        Returns:
+        -------
+        dict
+            The statistics of the shared livescore API client.
+        """
+        return LiveMatchService.__livescore_client.get_stats()
+
+    @staticmethod
+    def get_scoreboard_stats() -> dict:
+        """
+        Returns the dates and number of matches held by the scoreboard store.
+
+        Returns:
+        -------
+        dict
+            The statistics of the process-wide scoreboard store.
+        """
+        return LiveMatchService.__scoreboard_store.get_stats()
+
+    @staticmethod
+    def set_livescore_client(livescore_client: LivescoreClient):
+        """
+        Replaces the livescore API client shared by all instances, e.g. with a client serving
+        recorded payloads for benchmarks. The matches fetched with the previous client are dropped.
+
+        Parameters:
+        ----------
+        livescore_client : LivescoreClient
+            The client to fetch the matches with.
+        """
+        LiveMatchService.__livescore_client = livescore_client
+        LiveMatchService.__snapshot_cache.clear()
+        LiveMatchService.__last_good_snapshots.clear()
+        LiveMatchService.__match_states.clear()
+        LiveMatchService.__scoreboard_store = ScoreboardStore()
+
+    def __get_query_dates(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> List[datetime]:
+        """
+        Returns the dates of a range, bounded to MAX_MATCH_QUERY_DAYS.
+
+        Parameters:
+        ----------
+        start_date : Optional[datetime]
+            The first date of the range. Defaults to today.
+        end_date : Optional[datetime]
+            The last date of the range (inclusive). Defaults to the start date.
+
+        Returns:
+        -------
+        List[datetime]
+            Every date of the range, in order.
+        """
+        start_date = start_date or datetime.today()
+        end_date = end_date or start_date
+        if end_date.date() < start_date.date():
+            start_date, end_date = end_date, start_date
+        days = min((end_date.date() - start_date.date()).days + 1, Constants.MAX_MATCH_QUERY_DAYS)
+        return [start_date + timedelta(days=day) for day in range(days)]
+
+    def __query_store(self, dates: List[datetime], snapshots: List[Optional[List[MatchDetails]]], series: Optional[str], team: Optional[str], format: Optional[str]) -> List[MatchDetails]:
+        """
+        Stores the snapshots of the dates and queries the matches of the range.
+
+        Parameters:
+        ----------
+        dates : List[datetime]
+            The dates of the range, in order.
+        snapshots : List[Optional[List[MatchDetails]]]
+            The matches of every date, None for a failed fetch without a previous snapshot.
+        series : Optional[str]
+            The series of the matches, if any.
+        team : Optional[str]
+            A team playing the matches, if any.
+        format : Optional[str]
+            The format of the matches, if any.
+
+        Returns:
+        -------
+        List[MatchDetails]
+            The matching matches, ordered by date.
+        """
+        store = LiveMatchService.__scoreboard_store
+        for date, matches in zip(dates, snapshots):
+            # Failed fetches of dates without a previous snapshot must not hide stored matches,
+            # while dates without matches are stored like the others
+            if matches is not None:
+                store.put(date.strftime("%Y%m%d"), matches)
+        return store.query(
+            dates[0].strftime("%Y%m%d"),
+            dates[-1].strftime("%Y%m%d"),
+            series=series,
+            team=team,
+            format=format
+        )
+
+    def __get_snapshot(self, date: Optional[datetime]) -> Optional[List[MatchDetails]]:
+        """
+        Returns the cached snapshot of a date, fetching it if required.
+
+        Parameters:
+        ----------
+        date : Optional[datetime]
+            The date of the snapshot. Defaults to today.
+
+        Returns:
+        -------
+        Optional[List[MatchDetails]]
+            The matches of the date, or None if the fetch failed and there is no previous snapshot.
+        """
+        cur_date, ttl = self.__get_snapshot_key(date)
+        return LiveMatchService.__snapshot_cache.get_or_load(
+            cur_date,
+            lambda: self.__load_matches(cur_date),
+            ttl
+        )
+
+    async def __aget_snapshot(self, date: Optional[datetime]) -> Optional[List[MatchDetails]]:
+        """
+        Asynchronously returns the cached snapshot of a date, fetching it if required.
+
+        Parameters:
+        ----------
+        date : Optional[datetime]
+            The date of the snapshot. Defaults to today.
+
+        Returns:
+        -------
+        Optional[List[MatchDetails]]
+            The matches of the date, or None if the fetch failed and there is no previous snapshot.
+        """
+        cur_date, ttl = self.__get_snapshot_key(date)
+        return await LiveMatchService.__snapshot_cache.aget_or_load(
+            cur_date,
+            lambda: self.__aload_matches(cur_date),
+            ttl
+        )
+
+    def __get_snapshot_key(self, date: Optional[datetime]) -> Tuple[str, float]:
+        """
+        Returns the snapshot cache key and TTL for a date.
+
+        Parameters:
+        ----------
+        date : Optional[datetime]
+            The date of the matches. Defaults to today.
+
+        Returns:
+        -------
+        Tuple[str, float]
+            The date in YYYYMMDD format and the TTL of its snapshot in seconds.
+        """
         cur_date = (date if date else datetime.today()).strftime("%Y%m%d")
-        url = f"https://prod-public-api.livescore.com/v1/api/app/date/cricket/{cur_date}/5.30?locale=en&MD=1"
-        response = requests.get(url)
-        if response.ok:
-            return self.__process_matches_data(response.json())
-        else:
-            return []
+        today = datetime.today().strftime("%Y%m%d")
+        ttl = Constants.PAST_MATCHES_CACHE_TTL if cur_date < today else Constants.LIVE_MATCHES_CACHE_TTL
+        return cur_date, ttl
+
+    def __load_matches(self, cur_date: str) -> Optional[List[MatchDetails]]:
+        """
+        Fetches the matches of a date from the external API.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date for which to fetch matches in YYYYMMDD format.
+
+        Returns:
+        -------
+        Optional[List[MatchDetails]]
+            A list of MatchDetails objects, or the last good snapshot of the date
+            (None if there is none) if the API call failed.
+        """
+        payload = LiveMatchService.__livescore_client.fetch_matches_payload(cur_date)
+        return self.__process_payload(cur_date, payload)
+
+    async def __aload_matches(self, cur_date: str) -> Optional[List[MatchDetails]]:
+        """
+        Asynchronously fetches the matches of a date from the external API.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date for which to fetch matches in YYYYMMDD format.
+
+        Returns:
+        -------
+        Optional[List[MatchDetails]]
+            A list of MatchDetails objects, or the last good snapshot of the date
+            (None if there is none) if the API call failed.
+        """
+        payload = await LiveMatchService.__livescore_client.afetch_matches_payload(cur_date)
+        return self.__process_payload(cur_date, payload)
+
+    def __process_payload(self, cur_date: str, payload: Optional[Any]) -> Optional[List[MatchDetails]]:
+        """
+        Processes the API payload of a date and remembers it as the last good snapshot.
+
+        Only matches whose data changed since the previous snapshot of the date are
+        created again; the others are reused. The changes are sent to the change listeners.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date of the payload in YYYYMMDD format.
+        payload : Optional[Any]
+            The decoded JSON payload, or None if the API call failed.
+
+        Returns:
+        -------
+        Optional[List[MatchDetails]]
+            The matches of the payload, or the last good snapshot of the date if the call failed.
+        """
+        if payload is None:
+            return LiveMatchService.__last_good_snapshots.get(cur_date)
+        previous_states = LiveMatchService.__match_states.get(cur_date) or {}
+        matches, states, changes = self.__process_matches_data(payload, previous_states, cur_date)
+        LiveMatchService.__match_states.put(cur_date, states)
+        LiveMatchService.__last_good_snapshots.put(cur_date, matches)
+        if changes:
+            for listener in list(LiveMatchService.__change_listeners):
+                listener(cur_date, changes)
+        return matches
 
-    def __process_matches_data(self, response: Any) -> List[MatchDetails]:
+    @staticmethod
+    def add_change_listener(listener: Callable[[str, List[MatchChange]], None]):
+        """
+        Registers a listener called with the date and changed matches whenever a fetch
+        of a date differs from the previous one. Registering a listener twice has no effect.
+
+        Parameters:
+        ----------
+        listener : Callable[[str, List[MatchChange]], None]
+            The listener to call with the date in YYYYMMDD format and the changes.
+        """
+        if listener not in LiveMatchService.__change_listeners:
+            LiveMatchService.__change_listeners.append(listener)
+
+    def __process_matches_data(self, response: Any, previous_states: Dict[str, Tuple[tuple, MatchDetails]], cur_date: Optional[str] = None) -> Tuple[List[MatchDetails], Dict[str, Tuple[tuple, MatchDetails]], List[MatchChange]]:
         """
         Processes the API response to extract match details.
 
@@ -86,23 +597,72 @@ class LiveMatchService:
         ----------
         response : Any
             The JSON response from the API.
+        previous_states : Dict[str, Tuple[tuple, MatchDetails]]
+            The state and details of every match of the previous snapshot, keyed by match id.
+        cur_date : Optional[str]
+            The date of the listing in YYYYMMDD format, if known.
 
         Returns:
         -------
-        List[MatchDetails]
-            A list of MatchDetails objects extracted from the response.
+        Tuple[List[MatchDetails], Dict[str, Tuple[tuple, MatchDetails]], List[MatchChange]]
+            A list of MatchDetails objects extracted from the response, the state and
+            details of every match keyed by match id, and the matches which changed.
         """
         matches = []
+        states = {}
+        changes = []
         for stage in response.get('Stages', []):
             series_id = stage.get('Scd', '')
             series_name = stage.get('Snm', '')
 
             for event in stage.get('Events', []):
-                match_details = self.__create_match_details(event, series_id, series_name)
+                match_id = event.get('Eid')
+                state = self.__get_event_state(event, series_id, series_name)
+                previous = previous_states.get(match_id)
+                if previous is not None and previous[0] == state:
+                    match_details = previous[1]
+                else:
+                    match_details = self.__create_match_details(event, series_id, series_name, cur_date)
+                    if match_id is not None:
+                        changes.append(MatchChange(match_id, previous[1] if previous else None, match_details))
+                if match_id is not None:
+                    states[match_id] = (state, match_details)
                 matches.append(match_details)
-        return matches
 
-    def __create_match_details(self, event: dict, series_id: str, series_name: str) -> MatchDetails:
+        for match_id, (_, match_details) in previous_states.items():
+            if match_id not in states:
+                changes.append(MatchChange(match_id, match_details, None))
+        return matches, states, changes
+
+    def __get_event_state(self, event: dict, series_id: str, series_name: str) -> tuple:
+        """
+        Returns the values of all event fields a MatchDetails object is created from.
+
+        Parameters:
+        ----------
+        event : dict
+            The event data containing match information.
+        series_id : str
+            The ID of the series.
+        series_name : str
+            The name of the series.
+
+        Returns:
+        -------
+        tuple
+            The field values, equal for two events exactly when their MatchDetails are equal.
+        """
+        team1 = event.get('T1', [{}])[0]
+        team2 = event.get('T2', [{}])[0]
+        return (
+            series_id,
+            series_name,
+            *(team1.get(key) for key in TEAM_FIELDS),
+            *(team2.get(key) for key in TEAM_FIELDS),
+            *(event.get(key) for key in EVENT_FIELDS)
+        )
+
+    def __create_match_details(self, event: dict, series_id: str, series_name: str, cur_date: Optional[str]) -> MatchDetails:
         """
         Creates a MatchDetails object from event data.
 
@@ -114,25 +674,26 @@ class LiveMatchService:
             The ID of the series.
         series_name : str
             The name of the series.
+        cur_date : Optional[str]
+            The date of the listing in YYYYMMDD format, if known.
 
         Returns:
         -------
         MatchDetails
             The MatchDetails object populated with event data.
         """
-        match_details = MatchDetails(
+        return MatchDetails(
             id=event.get('Eid'),
-            format=event.get('EtTx', ''),
-            series_id=series_id,
-            series_name=series_name,
-            status=event.get('ECo', '')
+            format=self.__intern(event.get('EtTx', '')),
+            series_id=self.__intern(series_id),
+            series_name=self.__intern(series_name),
+            status=event.get('ECo', ''),
+            period=self.__intern(event.get('Eps', '')),
+            team1=self.__create_team_details(event, 'T1', 'Tr1'),
+            team2=self.__create_team_details(event, 'T2', 'Tr2'),
+            date=cur_date
         )
 
-        match_details.team1 = self.__create_team_details(event, 'T1', 'Tr1')
-        match_details.team2 = self.__create_team_details(event, 'T2', 'Tr2')
-
-        return match_details
-
     def __create_team_details(self, event: dict, team_key: str, score_prefix: str) -> TeamScoreDetails:
         """
         Creates a TeamScoreDetails object from event data.
@@ -153,8 +714,8 @@ class LiveMatchService:
         """
         team_data = event.get(team_key, [{}])[0]
         return TeamScoreDetails(
-            name=team_data.get('Nm', ''),
-            abr=team_data.get('Abr', ''),
+            name=self.__intern(team_data.get('Nm', '')),
+            abr=self.__intern(team_data.get('Abr', '')),
             run=self.__safe_int(event.get(f'{score_prefix}C1')),
             wicket=self.__safe_int(event.get(f'{score_prefix}CW1')),
             over=self.__safe_float(event.get(f'{score_prefix}CO1')),
@@ -165,6 +726,22 @@ class LiveMatchService:
             declared2=event.get(f'{score_prefix}CD2', False)
         )
 
+    def __intern(self, value: Optional[str]) -> Optional[str]:
+        """
+        Interns a string repeated across matches and snapshots, like team and series names.
+
+        Parameters:
+        ----------
+        value : Optional[str]
+            The string to intern.
+
+        Returns:
+        -------
+        Optional[str]
+            The interned string, or the value itself if it is not a string.
+        """
+        return sys.intern(value) if isinstance(value, str) else value
+
     def __safe_int(self, value: Optional[str]) -> Optional[int]:
         """
         Safely converts a string to an integer.
@@ -223,13 +800,29 @@ class LiveMatchService:
         """
         if team1.lower() == team2.lower():
             return None
-        for match in matches:
-            teams = clean_team_names([
-                match.team1.name, 
-                match.team2.name, 
-                match.team1.abr, 
-                match.team2.abr
-            ])
-            if clean_team_name(team1) in teams and clean_team_name(team2) in teams:
-                return match
-        return None
+        return self.__get_team_index(matches).find_match(team1, team2)
+
+    def __get_team_index(self, matches: List[MatchDetails]) -> TeamIndex:
+        """
+        Returns the team index of a snapshot, building it on first use.
+
+        Snapshots are shared through the snapshot cache, so the index is kept along with
+        the list it was built from and reused for as long as the same list is looked up.
+
+        Parameters:
+        ----------
+        matches : List[MatchDetails]
+            The snapshot to index.
+
+        Returns:
+        -------
+        TeamIndex
+            The index of the snapshot.
+        """
+        key = id(matches)
+        entry = LiveMatchService.__team_indexes.get(key)
+        if entry is not None and entry[0] is matches:
+            return entry[1]
+        team_index = TeamIndex(matches)
+        LiveMatchService.__team_indexes.put(key, (matches, team_index))
+        return team_index
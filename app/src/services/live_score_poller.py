@@ -0,0 +1,164 @@
+import threading
+import time
+import traceback
+from typing import Optional
+from src.constants import Constants
+from src.utils import is_match_in_progress
+from .live_match_service import LiveMatchService
+
+class LiveScorePoller:
+    """
+    A background refresher which keeps the matches of today hot in memory.
+
+    The poller refreshes the shared live match snapshot on a schedule, so that request
+    handling is served from the cache without network I/O. It polls every
+    LIVE_POLL_INTERVAL seconds while matches are in progress, and every
+    IDLE_POLL_INTERVAL seconds otherwise.
+
+    Methods:
+    -------
+    get_shared() -> LiveScorePoller
+        Returns the poller shared by the process.
+
+    start()
+        Starts polling in a daemon thread, if not running yet.
+
+    stop()
+        Stops polling.
+
+    is_running() -> bool
+        Indicates if the poller is running.
+
+    get_stats() -> dict
+        Returns the polling interval, number of polls and age of the snapshot.
+
+    __run()
+        Polls until stopped.
+
+    __poll() -> float
+        Refreshes the matches once and returns the delay before the next poll.
+    """
+
+    __shared_lock = threading.Lock()
+    __shared_poller: Optional["LiveScorePoller"] = None
+
+    def __init__(self, live_match_service: Optional[LiveMatchService] = None):
+        """
+        Initializes a stopped LiveScorePoller.
+
+        Parameters:
+        ----------
+        live_match_service : Optional[LiveMatchService]
+            The service used to refresh the matches.
+        """
+        self.__live_match_service = live_match_service or LiveMatchService()
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.__matches = 0
+        self.__refreshed_at: Optional[float] = None
+        self.__interval = Constants.LIVE_POLL_INTERVAL
+        self.__polls = 0
+
+    @staticmethod
+    def get_shared() -> "LiveScorePoller":
+        """
+        Returns the poller shared by the process.
+
+        Returns:
+        -------
+        LiveScorePoller
+            The shared poller, which may not be started yet.
+        """
+        with LiveScorePoller.__shared_lock:
+            if LiveScorePoller.__shared_poller is None:
+                LiveScorePoller.__shared_poller = LiveScorePoller()
+            return LiveScorePoller.__shared_poller
+
+    def start(self):
+        """
+        Starts polling in a daemon thread, if not running yet.
+        """
+        with self.__lock:
+            if self.__thread is not None and self.__thread.is_alive():
+                return
+            self.__stop_event.clear()
+            self.__thread = threading.Thread(target=self.__run, name="live-score-poller", daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        """
+        Stops polling and waits for the polling thread to finish.
+        """
+        self.__stop_event.set()
+        with self.__lock:
+            thread = self.__thread
+            self.__thread = None
+        if thread is not None:
+            thread.join()
+
+    def is_running(self) -> bool:
+        """
+        Indicates if the poller is running.
+
+        Returns:
+        -------
+        bool
+            True if the polling thread is alive.
+        """
+        with self.__lock:
+            return self.__thread is not None and self.__thread.is_alive()
+
+    def get_stats(self) -> dict:
+        """
+        Returns the polling interval, number of polls and age of the snapshot.
+
+        Returns:
+        -------
+        dict
+            The polling statistics.
+        """
+        with self.__lock:
+            return {
+                "running": self.__thread is not None and self.__thread.is_alive(),
+                "interval": self.__interval,
+                "polls": self.__polls,
+                "matches": self.__matches,
+                "age": time.monotonic() - self.__refreshed_at if self.__refreshed_at is not None else None,
+            }
+
+    def __run(self):
+        """
+        Polls until stopped.
+        """
+        while not self.__stop_event.is_set():
+            try:
+                delay = self.__poll()
+            except Exception:
+                traceback.print_exc()
+                delay = Constants.LIVE_POLL_INTERVAL
+            self.__stop_event.wait(delay)
+
+    def __poll(self) -> float:
+        """
+        Refreshes the matches once and returns the delay before the next poll.
+
+        The refreshed snapshot stays fresh in the cache for longer than the slowest
+        polling interval, so requests never have to fetch while the poller is running.
+
+        Returns:
+        -------
+        float
+            The number of seconds to wait before the next poll.
+        """
+        matches = self.__live_match_service.refresh_matches(
+            Constants.IDLE_POLL_INTERVAL + Constants.LIVE_MATCHES_CACHE_TTL
+        )
+        interval = Constants.LIVE_POLL_INTERVAL if any(is_match_in_progress(match) for match in matches) \
+            else Constants.IDLE_POLL_INTERVAL
+        with self.__lock:
+            self.__matches = len(matches)
+            self.__refreshed_at = time.monotonic()
+            self.__interval = interval
+            self.__polls += 1
+        return interval
@@ -1,8 +1,11 @@
-from typing import Any, List, Optional
+from datetime import datetime
+from typing import Any, Hashable, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
+from src.caches import LRUCache
 from src.enums import Intent
-from src.models import TeamScoreDetails, MatchDetails
-from src.utils import get_live_matches_as_string, read_prompt_from_file
+from src.models import TeamScoreDetails, MatchChange, MatchDetails
+from src.utils import format_match_date, get_live_matches_as_string, load_prompt_template, normalize_text, get_openai_http_client, get_openai_async_http_client
 from src.constants import Constants
 from langchain.prompts import PromptTemplate
 
@@ -12,14 +15,32 @@ class ResponseGeneratorService:
 
     Attributes:
     ----------
-    llm : ChatOpenAI
-        An instance of ChatOpenAI configured with a specific model and API key.
+    llm : BaseChatModel
+        An instance of ChatOpenAI configured with a specific model and API key, unless
+        another chat model was given.
 
     Methods:
     -------
     get_prompt(data: dict) -> str
 
-    
+    get_cached_response(data: dict) -> Optional[str]
+        Returns the previously generated response for the same question and match state.
+
+    cache_response(data: dict, response: str)
+        Caches a generated response for the question and match state in the data.
+
+    invalidate_changed_matches(cur_date: str, changes: List[MatchChange])
+        Drops the cached live score responses of matches whose data changed.
+
+    get_cache_stats() -> dict
+        Returns the hit/miss counters of the shared response cache.
+
+    clear_cache()
+        Removes all entries of the shared response cache.
+
+    __get_cache_key(data: dict) -> Optional[Tuple[Hashable, Hashable]]
+        Returns the cache key of the question and the state of the matches it is about.
+
     __get_live_score_prompt(user_input: str, match_details: MatchDetails) -> str
         Constructs the prompt for generating a live score response.
 
@@ -29,7 +50,7 @@ class ResponseGeneratorService:
     __get_live_score_prompt_template() -> PromptTemplate
         Retrieves the template for live score prompts.
 
-    __get_all_live_matches_prompt(user_input: str, live_matches: List[MatchDetails], series: str) -> str
+    __get_all_live_matches_prompt(user_input: str, live_matches: List[MatchDetails], series: str, match_format: Optional[str], date: Optional[datetime], end_date: Optional[datetime]) -> str
         Constructs the prompt for generating a response listing all live matches.
 
     __get_all_live_matches_prompt_template() -> PromptTemplate
@@ -42,7 +63,9 @@ class ResponseGeneratorService:
         Retrieves the template for fallback prompts.
     """
 
-    def __init__(self, openai_api_key: str):
+    __response_cache = LRUCache(Constants.RESPONSE_CACHE_SIZE)
+
+    def __init__(self, openai_api_key: str, llm: Optional[BaseChatModel] = None):
         """
         Initializes the ResponseGeneratorService with the specified OpenAI API key.
 
@@ -50,10 +73,16 @@ class ResponseGeneratorService:
         ----------
         openai_api_key : str
             The API key for accessing the OpenAI service.
+        llm : Optional[BaseChatModel]
+            The chat model to use instead of the OpenAI model, e.g. a fake model for benchmarks.
         """
-        self.llm = ChatOpenAI(
+        self.llm = llm or ChatOpenAI(
             model=Constants.RESPONSE_GENERATOR_GPT_MODEL, 
-            api_key=openai_api_key
+            api_key=openai_api_key,
+            http_client=get_openai_http_client(),
+            http_async_client=get_openai_async_http_client(),
+            # Report token usage on streamed responses as well, for tracing
+            stream_usage=True
         )
     
     def get_prompt(self, data: dict) -> str:
@@ -80,7 +109,10 @@ class ResponseGeneratorService:
                 prompt = self.__get_all_live_matches_prompt(
                     data.get("user_input"), 
                     data.get("live_matches", []),
-                    data.get("series")
+                    data.get("series"),
+                    data.get("format"),
+                    data.get("date"),
+                    data.get("end_date")
                 )
             case _:
                 prompt = self.__get_fallback_prompt(
@@ -89,6 +121,135 @@ class ResponseGeneratorService:
                 )
         return prompt
 
+    def get_cached_response(self, data: dict) -> Optional[str]:
+        """
+        Returns the previously generated response for the same question and match state.
+
+        A cached response is dropped as soon as the score of its match(es) has changed.
+
+        Parameters:
+        ----------
+        data : dict
+            A dictionary containing the intent details and match data.
+
+        Returns:
+        -------
+        Optional[str]
+            The cached response, or None if there is none for the current match state.
+        """
+        cache_key = self.__get_cache_key(data)
+        if cache_key is None:
+            return None
+        key, state = cache_key
+        entry = ResponseGeneratorService.__response_cache.get(key)
+        if entry is None:
+            return None
+        cached_state, response = entry
+        if cached_state != state:
+            ResponseGeneratorService.__response_cache.delete(key)
+            return None
+        return response
+
+    def cache_response(self, data: dict, response: str):
+        """
+        Caches a generated response for the question and match state in the data.
+
+        Parameters:
+        ----------
+        data : dict
+            A dictionary containing the intent details and match data.
+        response : str
+            The generated response.
+        """
+        cache_key = self.__get_cache_key(data)
+        if cache_key is not None and response:
+            key, state = cache_key
+            ResponseGeneratorService.__response_cache.put(key, (state, response))
+
+    @staticmethod
+    def invalidate_changed_matches(cur_date: str, changes: List[MatchChange]):
+        """
+        Drops the cached live score responses of matches whose data changed.
+
+        Meant to be registered as a change listener of LiveMatchService.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date of the changed matches in YYYYMMDD format.
+        changes : List[MatchChange]
+            The changed matches.
+        """
+        # Responses are cached per question, so every question about a changed match is dropped
+        match_ids = {change.match_id for change in changes}
+        ResponseGeneratorService.__response_cache.delete_matching(
+            lambda key: key[0] == Intent.live_score.value and key[1] in match_ids
+        )
+
+    @staticmethod
+    def clear_cache():
+        """
+        Removes all entries of the shared response cache and resets its counters.
+        """
+        ResponseGeneratorService.__response_cache.clear()
+
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """
+        Returns the hit/miss counters of the shared response cache.
+
+        Returns:
+        -------
+        dict
+            The statistics of the process-wide response cache.
+        """
+        return ResponseGeneratorService.__response_cache.get_stats()
+
+    def __get_cache_key(self, data: dict) -> Optional[Tuple[Hashable, Hashable]]:
+        """
+        Returns the cache key of the question and the state of the matches it is about.
+
+        The key is made of the intent, its normalized entities, i.e. the id of the match or
+        the series and format of the listed matches, and the normalized user input, since
+        different questions about the same matches (e.g. "what's the score?" and "what's the
+        required run rate?") are answered differently. The state holds those matches, which are immutable and compared
+        by value, so that any change of score or status invalidates the cached response.
+
+        Parameters:
+        ----------
+        data : dict
+            A dictionary containing the intent details and match data.
+
+        Returns:
+        -------
+        Optional[Tuple[Hashable, Hashable]]
+            The key and match state, or None if the response must not be cached.
+        """
+        match data.get('intent'):
+            case Intent.live_score:
+                match_details = data.get("match_score")
+                if not isinstance(match_details, MatchDetails) or match_details.id is None:
+                    return None
+                return (
+                    (Intent.live_score.value, match_details.id, normalize_text(data.get("user_input") or "")),
+                    match_details
+                )
+            case Intent.live_matches:
+                series = data.get("series")
+                format = data.get("format")
+                live_matches = data.get("live_matches", [])
+                return (
+                    (
+                        Intent.live_matches.value,
+                        series.strip().lower() if series else None,
+                        format.strip().lower() if format else None,
+                        normalize_text(data.get("user_input") or "")
+                    ),
+                    tuple(live_matches)
+                )
+            case _:
+                return None
+
     def __get_live_score_prompt(self, user_input: str, match_details: MatchDetails) -> str:
         """
         Constructs the prompt for generating a live score response.
@@ -157,13 +318,21 @@ class ResponseGeneratorService:
         PromptTemplate
             The template object for live score prompts.
         """
-        return PromptTemplate.from_template(
-            template=read_prompt_from_file(Constants.LIVE_SCORE_RESPONSE_PROMPT)
-        )
+        return load_prompt_template(Constants.LIVE_SCORE_RESPONSE_PROMPT)
     
-    def __get_all_live_matches_prompt(self, user_input: str, live_matches: List[MatchDetails], series: str) -> str:
+    def __get_all_live_matches_prompt(
+        self,
+        user_input: str,
+        live_matches: List[MatchDetails],
+        series: str,
+        match_format: Optional[str],
+        date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> str:
         """
         Constructs the prompt for generating a response listing all live matches.
+        The matches carry their dates if dates were asked for, and their formats if they
+        were filtered by format.
 
         Parameters:
         ----------
@@ -173,17 +342,30 @@ class ResponseGeneratorService:
             A list of MatchDetails objects representing live matches.
         series : str
             The series name for filtering matches.
+        match_format : Optional[str]
+            The format the matches were filtered by, if any.
+        date : Optional[datetime]
+            The first date of the matches asked for, if any.
+        end_date : Optional[datetime]
+            The last date of the matches asked for, if any.
 
         Returns:
         -------
         str
             The formatted prompt string.
         """
+        dates = None
+        if date:
+            dates = format_match_date(date.strftime("%Y%m%d"))
+            if end_date and end_date.date() != date.date():
+                dates += f" to {format_match_date(end_date.strftime('%Y%m%d'))}"
         prompt_template = self.__get_all_live_matches_prompt_template()
         prompt = prompt_template.format(
             user_input=user_input,
             series=series,
-            live_matches=get_live_matches_as_string(live_matches)
+            format=match_format,
+            dates=dates,
+            live_matches=get_live_matches_as_string(live_matches, show_dates=bool(date), show_formats=bool(match_format))
         )
         return prompt
     
@@ -196,9 +378,7 @@ class ResponseGeneratorService:
         PromptTemplate
             The template object for all live matches prompts.
         """
-        return PromptTemplate.from_template(
-            template=read_prompt_from_file(Constants.ALL_LIVE_MATCHES_RESPONSE_PROMPT)
-        )
+        return load_prompt_template(Constants.ALL_LIVE_MATCHES_RESPONSE_PROMPT)
 
     def __get_fallback_prompt(self, user_input: str, reason: str) -> str:
         """
@@ -232,6 +412,4 @@ class ResponseGeneratorService:
         PromptTemplate
             The template object for fallback prompts.
         """
-        return PromptTemplate.from_template(
-            template=read_prompt_from_file(Constants.FALLBACK_RESPONSE_PROMPT)
-        )
+        return load_prompt_template(Constants.FALLBACK_RESPONSE_PROMPT)
@@ -0,0 +1,228 @@
+import threading
+from typing import List, Optional, Set
+from src.enums import Intent
+from src.models import MatchDetails
+from src.utils import normalize_text
+
+class RuleBasedIntentService:
+    """
+    A service class to identify common user intents locally, without a language model call.
+
+    Only inputs which can be resolved with high confidence against the current matches
+    are classified, e.g. "IND vs AUS score" or "live matches". For everything else None
+    is returned and the language model has to identify the intent.
+
+    Methods:
+    -------
+    identify_intent(user_input: str, live_matches: List[MatchDetails]) -> Optional[dict]
+        Identifies the intent and entities of the user input if it is unambiguous.
+
+    get_stats() -> dict
+        Returns how often the fast path resolved the intent.
+
+    __find_live_score_intent(text: str, tokens: Set[str], live_matches: List[MatchDetails]) -> Optional[dict]
+        Identifies the 'live_score' intent if exactly one match has both teams mentioned.
+
+    __find_live_matches_intent(text: str, tokens: Set[str], live_matches: List[MatchDetails]) -> Optional[dict]
+        Identifies the 'live_matches' intent, optionally for a series.
+
+    __contains_phrase(text: str, phrase: str) -> bool
+        Checks if the phrase appears as whole words in the text.
+
+    __remove_phrase(tokens: Set[str], phrase: str) -> Set[str]
+        Removes the words of the phrase from the tokens.
+    """
+
+    # Words which can accompany a score or match list request without changing its meaning.
+    # Team qualifiers like "a" (India A), "w" or "u19" are deliberately not fillers: left
+    # over after the team names, they keep the input from resolving to the senior teams
+    FILLER_WORDS = {
+        "all", "and", "any", "are", "between", "cricket", "current", "currently", "doing",
+        "get", "give", "going", "happening", "how", "is", "it", "latest", "list", "live", "match",
+        "me", "now", "of", "on", "ongoing", "please", "pls", "s", "score", "scores", "show", "status",
+        "tell", "the", "there", "today", "todays", "update", "updates", "v", "versus", "vs", "what",
+        "whats", "which", "who", "winning", "in", "series"
+    }
+    MATCH_LIST_WORDS = {"matches", "games", "fixtures"}
+    # Words hinting at a date or other details that have to be resolved by the language model
+    AMBIGUOUS_WORDS = {
+        "yesterday", "tomorrow", "last", "next", "week", "jan", "january", "feb", "february", "mar",
+        "march", "apr", "april", "may", "jun", "june", "jul", "july", "aug", "august", "sep", "sept",
+        "september", "oct", "october", "nov", "november", "dec", "december"
+    }
+
+    __lock = threading.Lock()
+    __fast_path_count = 0
+    __llm_count = 0
+
+    def identify_intent(self, user_input: str, live_matches: List[MatchDetails]) -> Optional[dict]:
+        """
+        Identifies the intent and entities of the user input if it is unambiguous.
+
+        Parameters:
+        ----------
+        user_input : str
+            The input text from the user.
+        live_matches : List[MatchDetails]
+            The current matches to resolve team and series names against.
+
+        Returns:
+        -------
+        Optional[dict]
+            The intent and entities in the same shape as the language model output,
+            or None if the language model has to identify the intent.
+        """
+        text = normalize_text(user_input or "")
+        tokens = set(text.split())
+        intent_details = None
+        if tokens and not tokens & self.AMBIGUOUS_WORDS and not any(token.isdigit() for token in tokens):
+            intent_details = self.__find_live_score_intent(text, tokens, live_matches) \
+                or self.__find_live_matches_intent(text, tokens, live_matches)
+
+        with RuleBasedIntentService.__lock:
+            if intent_details is None:
+                RuleBasedIntentService.__llm_count += 1
+            else:
+                RuleBasedIntentService.__fast_path_count += 1
+        return intent_details
+
+    @staticmethod
+    def get_stats() -> dict:
+        """
+        Returns how often the fast path resolved the intent.
+
+        Returns:
+        -------
+        dict
+            The number of inputs resolved by the fast path and by the language model,
+            and the share of the fast path.
+        """
+        with RuleBasedIntentService.__lock:
+            fast_path_count = RuleBasedIntentService.__fast_path_count
+            llm_count = RuleBasedIntentService.__llm_count
+        total = fast_path_count + llm_count
+        return {
+            "fast_path": fast_path_count,
+            "llm": llm_count,
+            "fast_path_ratio": fast_path_count / total if total else 0.0
+        }
+
+    def __find_live_score_intent(self, text: str, tokens: Set[str], live_matches: List[MatchDetails]) -> Optional[dict]:
+        """
+        Identifies the 'live_score' intent if exactly one match has both teams mentioned.
+
+        Parameters:
+        ----------
+        text : str
+            The normalized user input.
+        tokens : Set[str]
+            The words of the normalized user input.
+        live_matches : List[MatchDetails]
+            The current matches.
+
+        Returns:
+        -------
+        Optional[dict]
+            The 'live_score' intent details, or None if not unambiguous.
+        """
+        found_match = None
+        remaining_tokens = tokens
+        for match in live_matches:
+            team_phrases = []
+            for team in (match.team1, match.team2):
+                phrase = next(
+                    (phrase for phrase in (normalize_text(team.name), normalize_text(team.abr)) if phrase and self.__contains_phrase(text, phrase)),
+                    None
+                )
+                if phrase is None:
+                    break
+                team_phrases.append(phrase)
+            else:
+                if found_match is not None:
+                    return None
+                found_match = match
+                for phrase in team_phrases:
+                    remaining_tokens = self.__remove_phrase(remaining_tokens, phrase)
+
+        if found_match is None or remaining_tokens - self.FILLER_WORDS:
+            return None
+        return {
+            "intent": Intent.live_score.value,
+            "entities": {
+                "team1": found_match.team1.name,
+                "team2": found_match.team2.name
+            }
+        }
+
+    def __find_live_matches_intent(self, text: str, tokens: Set[str], live_matches: List[MatchDetails]) -> Optional[dict]:
+        """
+        Identifies the 'live_matches' intent, optionally for a series.
+
+        Parameters:
+        ----------
+        text : str
+            The normalized user input.
+        tokens : Set[str]
+            The words of the normalized user input.
+        live_matches : List[MatchDetails]
+            The current matches.
+
+        Returns:
+        -------
+        Optional[dict]
+            The 'live_matches' intent details, or None if not unambiguous.
+        """
+        if not tokens & self.MATCH_LIST_WORDS:
+            return None
+        remaining_tokens = tokens - self.MATCH_LIST_WORDS
+        series_names = {match.series_name for match in live_matches if match.series_name}
+        mentioned_series = [name for name in series_names if self.__contains_phrase(text, normalize_text(name))]
+        if len(mentioned_series) > 1:
+            return None
+
+        entities = {}
+        if mentioned_series:
+            entities["series"] = mentioned_series[0]
+            remaining_tokens = self.__remove_phrase(remaining_tokens, normalize_text(mentioned_series[0]))
+        if remaining_tokens - self.FILLER_WORDS:
+            return None
+        return {
+            "intent": Intent.live_matches.value,
+            "entities": entities
+        }
+
+    def __contains_phrase(self, text: str, phrase: str) -> bool:
+        """
+        Checks if the phrase appears as whole words in the text.
+
+        Parameters:
+        ----------
+        text : str
+            The normalized text.
+        phrase : str
+            The normalized phrase.
+
+        Returns:
+        -------
+        bool
+            True if the phrase is present in the text.
+        """
+        return f" {phrase} " in f" {text} "
+
+    def __remove_phrase(self, tokens: Set[str], phrase: str) -> Set[str]:
+        """
+        Removes the words of the phrase from the tokens.
+
+        Parameters:
+        ----------
+        tokens : Set[str]
+            The words of the text.
+        phrase : str
+            The normalized phrase.
+
+        Returns:
+        -------
+        Set[str]
+            The remaining words.
+        """
+        return tokens - set(phrase.split())
@@ -0,0 +1,247 @@
+from datetime import datetime
+from typing import List, Optional
+from src.enums import Intent
+from src.models import MatchDetails, TeamScoreDetails
+from src.utils import format_match_date
+
+class TemplateResponseService:
+    """
+    A service class to generate responses from match data with fixed templates,
+    without a language model call.
+
+    Methods:
+    -------
+    render(data: dict) -> str
+        Renders the response for the intent in the provided data.
+
+    __render_live_score(match_details: MatchDetails) -> str
+        Renders the live score of a match.
+
+    __render_live_matches(live_matches: List[MatchDetails], series: Optional[str], match_format: Optional[str], date: Optional[datetime], end_date: Optional[datetime]) -> str
+        Renders the list of matches grouped by series.
+
+    __describe_filters(series: Optional[str], match_format: Optional[str], date: Optional[datetime], end_date: Optional[datetime]) -> str
+        Describes the matches asked for, for the response when there are none.
+
+    __format_team_score(team_details: TeamScoreDetails, is_test: bool) -> str
+        Formats the score line of a team.
+
+    __format_innings(run: Optional[int], wicket: Optional[int], over: Optional[float], declared: bool, show_overs: bool) -> str
+        Formats the score of a single innings.
+    """
+
+    def render(self, data: dict) -> str:
+        """
+        Renders the response for the intent in the provided data.
+
+        Parameters:
+        ----------
+        data : dict
+            A dictionary containing the intent and the match data of the intent.
+
+        Returns:
+        -------
+        str
+            The rendered response.
+
+        Raises:
+        ------
+        ValueError
+            If the intent is not supported by the templates.
+        """
+        match data.get('intent'):
+            case Intent.live_score:
+                return self.__render_live_score(data.get("match_score"))
+            case Intent.live_matches:
+                return self.__render_live_matches(
+                    data.get("live_matches", []),
+                    data.get("series"),
+                    data.get("format"),
+                    data.get("date"),
+                    data.get("end_date")
+                )
+            case intent:
+                raise ValueError(f"No response template for intent '{intent}'")
+
+    def __render_live_score(self, match_details: MatchDetails) -> str:
+        """
+        Renders the live score of a match.
+
+        Parameters:
+        ----------
+        match_details : MatchDetails
+            The details of the cricket match.
+
+        Returns:
+        -------
+        str
+            The live score of the match.
+        """
+        is_test = "test" in match_details.format.lower() \
+            or match_details.team1.run2 is not None \
+            or match_details.team2.run2 is not None
+        lines = [
+            f"{match_details.team1.name} vs {match_details.team2.name}",
+            self.__format_team_score(match_details.team1, is_test),
+            self.__format_team_score(match_details.team2, is_test),
+        ]
+        if match_details.status:
+            lines.append(match_details.status)
+        details = ", ".join(detail for detail in (match_details.format, match_details.series_name) if detail)
+        if details:
+            lines.insert(0, f"{details}:")
+        return "  \n".join(lines)
+
+    def __render_live_matches(
+        self,
+        live_matches: List[MatchDetails],
+        series: Optional[str],
+        match_format: Optional[str],
+        date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> str:
+        """
+        Renders the list of matches grouped by series. The date of every match is shown if
+        dates were asked for, and its format if the matches were filtered by format.
+
+        Parameters:
+        ----------
+        live_matches : List[MatchDetails]
+            A list of MatchDetails objects representing live matches.
+        series : Optional[str]
+            The series the matches were filtered by, if any.
+        match_format : Optional[str]
+            The format the matches were filtered by, if any.
+        date : Optional[datetime]
+            The first date of the matches asked for, if any.
+        end_date : Optional[datetime]
+            The last date of the matches asked for, if any.
+
+        Returns:
+        -------
+        str
+            The matches listed under their series.
+        """
+        if not live_matches:
+            return f"There are no {self.__describe_filters(series, match_format, date, end_date)}."
+
+        # Matches of several dates are not ordered by series, so they are bucketed by series
+        # in the order the series first appear
+        matches_by_series = {}
+        for match in live_matches:
+            matches_by_series.setdefault(match.series_name, []).append(match)
+
+        sections = []
+        for series_name, matches in matches_by_series.items():
+            lines = [f"**{series_name}**"] if series_name else []
+            for match in matches:
+                line = f"- {match.team1.name} ({match.team1.abr}) vs {match.team2.name} ({match.team2.abr})"
+                details = [
+                    detail for detail in (
+                        format_match_date(match.date) if date else None,
+                        match.format if match_format else None
+                    ) if detail
+                ]
+                if details:
+                    line += f" ({', '.join(details)})"
+                if match.status:
+                    line += f": {match.status}"
+                lines.append(line)
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+
+    def __describe_filters(
+        self,
+        series: Optional[str],
+        match_format: Optional[str],
+        date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> str:
+        """
+        Describes the matches asked for, for the response when there are none.
+
+        Parameters:
+        ----------
+        series : Optional[str]
+            The series the matches were filtered by, if any.
+        match_format : Optional[str]
+            The format the matches were filtered by, if any.
+        date : Optional[datetime]
+            The first date of the matches asked for, if any.
+        end_date : Optional[datetime]
+            The last date of the matches asked for, if any.
+
+        Returns:
+        -------
+        str
+            The description, e.g. 'T20 matches in IPL on Sat 12 Oct 2024'.
+        """
+        # Without a date the matches of today's listing are asked for
+        description = f"{match_format} matches" if match_format else "matches"
+        if not date:
+            description = f"live {description}"
+        if series:
+            description += f" in {series}"
+        if not date:
+            return description if series else f"{description} right now"
+        first_date = format_match_date(date.strftime("%Y%m%d"))
+        if end_date and end_date.date() != date.date():
+            return f"{description} between {first_date} and {format_match_date(end_date.strftime('%Y%m%d'))}"
+        return f"{description} on {first_date}"
+
+    def __format_team_score(self, team_details: TeamScoreDetails, is_test: bool) -> str:
+        """
+        Formats the score line of a team.
+
+        Parameters:
+        ----------
+        team_details : TeamScoreDetails
+            The details of the team.
+        is_test : bool
+            Indicates if both innings of the team have to be shown without overs.
+
+        Returns:
+        -------
+        str
+            The score line, e.g. 'IND: 245/6 (41.2)' or 'IND: 350/7d & 120/2'.
+        """
+        innings = [self.__format_innings(
+            team_details.run, team_details.wicket, team_details.over, team_details.declared, not is_test
+        )]
+        if is_test and team_details.run2 is not None:
+            innings.append(self.__format_innings(
+                team_details.run2, team_details.wicket2, team_details.over2, team_details.declared2, False
+            ))
+        score = " & ".join(inning for inning in innings if inning)
+        return f"{team_details.abr}: {score}" if score else f"{team_details.abr}:"
+
+    def __format_innings(self, run: Optional[int], wicket: Optional[int], over: Optional[float], declared: bool, show_overs: bool) -> str:
+        """
+        Formats the score of a single innings.
+
+        Parameters:
+        ----------
+        run : Optional[int]
+            The number of runs scored.
+        wicket : Optional[int]
+            The number of wickets lost.
+        over : Optional[float]
+            The number of overs played.
+        declared : bool
+            Indicates if the innings was declared.
+        show_overs : bool
+            Indicates if the overs have to be shown.
+
+        Returns:
+        -------
+        str
+            The score of the innings, or an empty string if no runs are available.
+        """
+        if run is None:
+            return ""
+        score = f"{run}/{wicket}" if wicket is not None else f"{run}"
+        if declared:
+            score += "d"
+        if show_overs and over is not None:
+            score += f" ({over:g})"
+        return score
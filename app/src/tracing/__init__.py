@@ -0,0 +1,2 @@
+from .latency_histogram import LatencyHistogram
+from .stage_tracer import StageTracer, trace_event, configure_trace_logging
\ No newline at end of file
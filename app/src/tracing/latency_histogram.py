@@ -0,0 +1,93 @@
+import math
+import threading
+from collections import deque
+from typing import Dict
+
+class LatencyHistogram:
+    """
+    A thread-safe histogram of the most recent latencies of an operation.
+
+    Percentiles are computed over a bounded window of recent samples, so that they follow
+    the current behaviour of the process instead of its whole lifetime.
+
+    Methods:
+    -------
+    record(value: float)
+        Records a latency.
+
+    get_summary() -> Dict[str, float]
+        Returns the count, mean and p50/p95/p99 of the recorded latencies.
+
+    __get_percentile(samples: list, percentile: float) -> float
+        Returns a percentile of sorted samples by the nearest-rank method.
+    """
+
+    def __init__(self, max_samples: int):
+        """
+        Initializes an empty LatencyHistogram.
+
+        Parameters:
+        ----------
+        max_samples : int
+            The number of most recent samples percentiles are computed over.
+        """
+        self.__lock = threading.Lock()
+        self.__samples: deque = deque(maxlen=max_samples)
+        self.__count = 0
+        self.__total = 0.0
+
+    def record(self, value: float):
+        """
+        Records a latency.
+
+        Parameters:
+        ----------
+        value : float
+            The latency, in milliseconds.
+        """
+        with self.__lock:
+            self.__samples.append(value)
+            self.__count += 1
+            self.__total += value
+
+    def get_summary(self) -> Dict[str, float]:
+        """
+        Returns the count, mean and p50/p95/p99 of the recorded latencies.
+
+        Returns:
+        -------
+        Dict[str, float]
+            The number of latencies and their mean since start, and the percentiles of
+            the recent samples (0 if nothing was recorded).
+        """
+        with self.__lock:
+            samples = sorted(self.__samples)
+            count = self.__count
+            total = self.__total
+        return {
+            "count": count,
+            "mean": total / count if count else 0.0,
+            "p50": self.__get_percentile(samples, 50),
+            "p95": self.__get_percentile(samples, 95),
+            "p99": self.__get_percentile(samples, 99),
+        }
+
+    def __get_percentile(self, samples: list, percentile: float) -> float:
+        """
+        Returns a percentile of sorted samples by the nearest-rank method.
+
+        Parameters:
+        ----------
+        samples : list
+            The sorted samples.
+        percentile : float
+            The percentile, between 0 and 100.
+
+        Returns:
+        -------
+        float
+            The smallest sample greater than or equal to the given percent of the samples.
+        """
+        if not samples:
+            return 0.0
+        return samples[max(math.ceil(percentile / 100 * len(samples)) - 1, 0)]
@@ -0,0 +1,359 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.callbacks.manager import dispatch_custom_event
+from langchain_core.outputs import LLMResult
+from src.constants import Constants
+from .latency_histogram import LatencyHistogram
+
+# Name of the custom events carrying the cache and upstream outcomes of a stage
+TRACE_EVENT = "cricbot_trace"
+
+# Logger of the structured (JSON) record of every chat turn
+trace_logger = logging.getLogger("cricbot.trace")
+
+def trace_event(**data: Any):
+    """
+    Attaches outcomes like cache hits or the upstream status to the trace of the current turn.
+
+    Parameters:
+    ----------
+    **data : Any
+        The outcomes, e.g. intent_source='cache'.
+    """
+    try:
+        dispatch_custom_event(TRACE_EVENT, data)
+    except RuntimeError:
+        # Not called from within a chain run, so there is no turn to attach the outcomes to
+        pass
+
+def configure_trace_logging():
+    """
+    Prints the structured record of every chat turn to stderr, if ENABLE_TRACE_LOGS is set.
+    Calling it more than once has no effect.
+    """
+    if Constants.ENABLE_TRACE_LOGS and not trace_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        trace_logger.addHandler(handler)
+        trace_logger.setLevel(logging.INFO)
+        trace_logger.propagate = False
+
+class StageTracer(BaseCallbackHandler):
+    """
+    A callback handler measuring the stages of the Cricbot chain.
+
+    Runs are matched to stages by their run name (see STAGES). For every chat turn, the
+    tracer records the wall time of each stage, the time to the first response token, the
+    token usage of every model call (with the prompt tokens served from the provider's prefix
+    cache, and the others), and the outcomes attached with trace_event. Each completed turn is
+    logged as one JSON record on the 'cricbot.trace' logger, and the latencies feed per-stage
+    histograms.
+
+    Methods:
+    -------
+    get_shared() -> StageTracer
+        Returns the tracer shared by the process.
+
+    get_stats() -> dict
+        Returns the latency percentiles, token usage and outcome counts of all turns.
+
+    get_recent_turns() -> List[dict]
+        Returns the records of the most recent turns, latest first.
+
+    format_stats() -> str
+        Returns the statistics as a plain text table.
+
+    __start_run(run_id: UUID, parent_run_id: Optional[UUID], name: Optional[str])
+        Starts timing a run and attaches it to its turn.
+
+    __drop_abandoned_turns(now: float)
+        Drops the turns older than ABANDONED_TURN_AGE along with their runs.
+
+    __end_run(run_id: UUID, error: Optional[BaseException] = None)
+        Stops timing a run and completes its turn if it is the root run.
+
+    __complete_turn(turn: dict, error: Optional[BaseException])
+        Records the latencies of a completed turn and logs it.
+    """
+
+    # Name of the root run of a chat turn, and the run names of its stages
+    TURN = "cricbot"
+    STAGES = ("fetch_matches", "identify_intent", "intent_llm", "handle_intent", "generate_response", "response_llm")
+    # Latency from the start of the turn to the first streamed token of the response model
+    FIRST_TOKEN = "first_token"
+    # Outcomes counted over all turns
+    COUNTED_OUTCOMES = ("intent_source", "response_source")
+    # Seconds after which a turn which never ended (e.g. a stream the client stopped reading)
+    # is dropped along with its runs
+    ABANDONED_TURN_AGE = 10 * 60
+
+    # The handler is cheap and thread-safe, so it runs in the calling thread even for async
+    # runs, which keeps the events of a run in order
+    run_inline = True
+
+    __shared_lock = threading.Lock()
+    __shared_tracer: Optional["StageTracer"] = None
+
+    def __init__(self, max_samples: int = Constants.TRACE_HISTOGRAM_SAMPLES):
+        """
+        Initializes a StageTracer without measurements.
+
+        Parameters:
+        ----------
+        max_samples : int
+            The number of most recent latencies of each stage percentiles are computed over.
+        """
+        self.__lock = threading.Lock()
+        self.__runs: Dict[UUID, tuple] = {}
+        self.__turns: Dict[UUID, dict] = {}
+        self.__histograms = {
+            name: LatencyHistogram(max_samples)
+            for name in (StageTracer.TURN, *StageTracer.STAGES, StageTracer.FIRST_TOKEN)
+        }
+        self.__tokens: Dict[str, Dict[str, int]] = {}
+        self.__outcomes: Dict[str, int] = {}
+        self.__recent_turns: deque = deque(maxlen=20)
+
+    @staticmethod
+    def get_shared() -> "StageTracer":
+        """
+        Returns the tracer shared by the process.
+
+        Returns:
+        -------
+        StageTracer
+            The shared tracer.
+        """
+        with StageTracer.__shared_lock:
+            if StageTracer.__shared_tracer is None:
+                StageTracer.__shared_tracer = StageTracer()
+            return StageTracer.__shared_tracer
+
+    def on_chain_start(self, serialized: Dict[str, Any], inputs: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any):
+        self.__start_run(run_id, parent_run_id, kwargs.get("name"))
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any):
+        self.__end_run(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self.__end_run(run_id, error)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any):
+        self.__start_run(run_id, parent_run_id, kwargs.get("name"))
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any):
+        self.__start_run(run_id, parent_run_id, kwargs.get("name"))
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any):
+        with self.__lock:
+            run = self.__runs.get(run_id)
+            if run is None or run[1] != "response_llm":
+                return
+            turn = self.__turns.get(run[0])
+            if turn is not None and StageTracer.FIRST_TOKEN not in turn["stages"]:
+                turn["stages"][StageTracer.FIRST_TOKEN] = (time.perf_counter() - turn["started_at"]) * 1000
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        usage: Dict[str, int] = {}
+        for generations in response.generations:
+            for generation in generations:
+                usage_metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                usage["input"] = usage.get("input", 0) + usage_metadata.get("input_tokens", 0)
+                usage["output"] = usage.get("output", 0) + usage_metadata.get("output_tokens", 0)
+                cached = (usage_metadata.get("input_token_details") or {}).get("cache_read", 0) or 0
+                usage["cached"] = usage.get("cached", 0) + cached
+        # Prompt tokens not served from the provider's prefix cache
+        usage["uncached"] = usage.get("input", 0) - usage.get("cached", 0)
+        with self.__lock:
+            run = self.__runs.get(run_id)
+            turn = self.__turns.get(run[0]) if run is not None else None
+            if turn is not None and run[1] in StageTracer.STAGES:
+                turn["tokens"][run[1]] = usage
+        self.__end_run(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self.__end_run(run_id, error)
+
+    def on_custom_event(self, name: str, data: Any, *, run_id: UUID, **kwargs: Any):
+        if name != TRACE_EVENT:
+            return
+        with self.__lock:
+            run = self.__runs.get(run_id)
+            turn = self.__turns.get(run[0]) if run is not None else None
+            if turn is not None:
+                turn["outcomes"].update(data)
+
+    def get_stats(self) -> dict:
+        """
+        Returns the latency percentiles, token usage and outcome counts of all turns.
+
+        Returns:
+        -------
+        dict
+            The latency summary (in milliseconds) of the turns and of every stage, the
+            total tokens of every model stage, and the counts of the intent and response
+            sources (e.g. 'response_source=cache').
+        """
+        with self.__lock:
+            tokens = {stage: dict(usage) for stage, usage in self.__tokens.items()}
+            outcomes = dict(self.__outcomes)
+        return {
+            "latency_ms": {name: histogram.get_summary() for name, histogram in self.__histograms.items()},
+            "tokens": tokens,
+            "outcomes": outcomes,
+        }
+
+    def get_recent_turns(self) -> List[dict]:
+        """
+        Returns the records of the most recent turns, latest first.
+
+        Returns:
+        -------
+        List[dict]
+            The records, as logged on the 'cricbot.trace' logger.
+        """
+        with self.__lock:
+            return list(reversed(self.__recent_turns))
+
+    def format_stats(self) -> str:
+        """
+        Returns the statistics as a plain text table.
+
+        Returns:
+        -------
+        str
+            One line per stage with its count and p50/p95/p99/mean latencies, followed by
+            the token usage and the outcome counts.
+        """
+        stats = self.get_stats()
+        lines = [f"{'stage':<18} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean ms':>9}"]
+        for name, summary in stats["latency_ms"].items():
+            lines.append(
+                f"{name:<18} {summary['count']:>6} {summary['p50']:>9.1f} {summary['p95']:>9.1f} "
+                f"{summary['p99']:>9.1f} {summary['mean']:>9.1f}"
+            )
+        for stage, usage in stats["tokens"].items():
+            input_tokens = usage.get("input", 0)
+            cached_ratio = usage.get("cached", 0) / input_tokens if input_tokens else 0.0
+            lines.append(
+                f"{stage} tokens: {input_tokens} in ({usage.get('cached', 0)} cached, "
+                f"{usage.get('uncached', 0)} uncached, {cached_ratio:.0%} cache hits), {usage.get('output', 0)} out"
+            )
+        if stats["outcomes"]:
+            lines.append("outcomes: " + ", ".join(f"{key} x{count}" for key, count in sorted(stats["outcomes"].items())))
+        return "\n".join(lines)
+
+    def __start_run(self, run_id: UUID, parent_run_id: Optional[UUID], name: Optional[str]):
+        """
+        Starts timing a run and attaches it to its turn.
+
+        Parameters:
+        ----------
+        run_id : UUID
+            The id of the run.
+        parent_run_id : Optional[UUID]
+            The id of the parent run, None for the root run of a turn.
+        name : Optional[str]
+            The run name, matched against TURN and STAGES.
+        """
+        now = time.perf_counter()
+        with self.__lock:
+            parent = self.__runs.get(parent_run_id) if parent_run_id is not None else None
+            if parent is None:
+                if name != StageTracer.TURN:
+                    return
+                self.__drop_abandoned_turns(now)
+                self.__turns[run_id] = {"started_at": now, "stages": {}, "tokens": {}, "outcomes": {}}
+                root_id = run_id
+            else:
+                root_id = parent[0]
+            self.__runs[run_id] = (root_id, name, now)
+
+    def __drop_abandoned_turns(self, now: float):
+        """
+        Drops the turns older than ABANDONED_TURN_AGE along with their runs. Must be
+        called with the lock held.
+
+        Parameters:
+        ----------
+        now : float
+            The current time, from time.perf_counter.
+        """
+        # Turns are kept in the order they started, so only the oldest ones are checked
+        abandoned = set()
+        for root_id, turn in self.__turns.items():
+            if now - turn["started_at"] < StageTracer.ABANDONED_TURN_AGE:
+                break
+            abandoned.add(root_id)
+        if not abandoned:
+            return
+        for root_id in abandoned:
+            del self.__turns[root_id]
+        for run_id in [run_id for run_id, run in self.__runs.items() if run[0] in abandoned]:
+            del self.__runs[run_id]
+
+    def __end_run(self, run_id: UUID, error: Optional[BaseException] = None):
+        """
+        Stops timing a run and completes its turn if it is the root run.
+
+        Parameters:
+        ----------
+        run_id : UUID
+            The id of the run.
+        error : Optional[BaseException]
+            The error the run failed with, if any.
+        """
+        now = time.perf_counter()
+        with self.__lock:
+            run = self.__runs.pop(run_id, None)
+            if run is None:
+                return
+            root_id, name, started_at = run
+            turn = self.__turns.get(root_id)
+            if turn is None:
+                return
+            if name in StageTracer.STAGES:
+                turn["stages"][name] = turn["stages"].get(name, 0.0) + (now - started_at) * 1000
+            if run_id != root_id:
+                return
+            del self.__turns[root_id]
+            turn["stages"][StageTracer.TURN] = (now - started_at) * 1000
+        self.__complete_turn(turn, error)
+
+    def __complete_turn(self, turn: dict, error: Optional[BaseException]):
+        """
+        Records the latencies of a completed turn and logs it.
+
+        Parameters:
+        ----------
+        turn : dict
+            The measurements of the turn.
+        error : Optional[BaseException]
+            The error the turn failed with, if any.
+        """
+        for name, latency in turn["stages"].items():
+            self.__histograms[name].record(latency)
+        record = {
+            "latency_ms": {name: round(latency, 1) for name, latency in turn["stages"].items()},
+            "tokens": turn["tokens"],
+            **turn["outcomes"],
+        }
+        if error is not None:
+            record["error"] = type(error).__name__
+        with self.__lock:
+            for stage, usage in turn["tokens"].items():
+                totals = self.__tokens.setdefault(stage, {})
+                for key, value in usage.items():
+                    totals[key] = totals.get(key, 0) + value
+            for key in StageTracer.COUNTED_OUTCOMES:
+                if key in turn["outcomes"]:
+                    outcome = f"{key}={turn['outcomes'][key]}"
+                    self.__outcomes[outcome] = self.__outcomes.get(outcome, 0) + 1
+            self.__recent_turns.append(record)
+        trace_logger.info(json.dumps(record, default=str))
@@ -1,2 +1,8 @@
 from .common_util import get_live_matches_as_string, \
-    clean_team_name, clean_team_names, read_prompt_from_file, generate_metadata
\ No newline at end of file
+    clean_team_name, clean_team_names, generate_metadata, normalize_text, is_match_in_progress, format_match_date
+from .http_util import get_openai_http_client, get_openai_async_http_client
+from .prompt_util import read_prompt_from_file, load_prompt_template
+from .team_index import TeamIndex
+from .fuzzy_team_resolver import FuzzyTeamResolver
+from .scoreboard_store import ScoreboardStore
+from .live_match_context_builder import LiveMatchContextBuilder
\ No newline at end of file
@@ -1,16 +1,68 @@
-import os
-from typing import List
+import re
+from datetime import datetime
+from typing import List, Optional
 from src.models.match_details import MatchDetails
 from src.constants import Constants
 
 def generate_metadata(**kwargs)-> dict:
     return kwargs
 
-def get_live_matches_as_string(live_matches: List[MatchDetails]) -> str: 
+def get_live_matches_as_string(live_matches: List[MatchDetails], show_dates: bool = False, show_formats: bool = False) -> str: 
+    """
+    Lists the matches one per line, with their teams and series.
+
+    Parameters:
+    ----------
+    live_matches : List[MatchDetails]
+        The matches to list.
+    show_dates : bool
+        Whether to add the date of every match, e.g. for matches of a range of dates.
+    show_formats : bool
+        Whether to add the format of every match.
+
+    Returns:
+    -------
+    str
+        The listed matches.
+    """
     return "\n".join([
-        f"{match.team1.name} ({match.team1.abr}) vs {match.team2.name} ({match.team2.abr}) [Series: {match.series_name}]" 
+        f"{match.team1.name} ({match.team1.abr}) vs {match.team2.name} ({match.team2.abr}) [Series: {match.series_name}]"
+        + (f" [Date: {format_match_date(match.date)}]" if show_dates and match.date else "")
+        + (f" [Format: {match.format}]" if show_formats and match.format else "")
         for match in live_matches
     ])
+
+def format_match_date(cur_date: Optional[str]) -> str:
+    """
+    Formats a date of the livescore API for display.
+
+    Parameters:
+    ----------
+    cur_date : Optional[str]
+        The date in YYYYMMDD format.
+
+    Returns:
+    -------
+    str
+        The date like 'Sat 12 Oct 2024', or an empty string if there is none.
+    """
+    return datetime.strptime(cur_date, "%Y%m%d").strftime("%a %d %b %Y") if cur_date else ""
+def is_match_in_progress(match: MatchDetails) -> bool:
+    """
+    Checks if a match is being played, i.e. it has started and is not over.
+
+    Parameters:
+    ----------
+    match : MatchDetails
+        The match to check.
+
+    Returns:
+    -------
+    bool
+        True if the match is in progress.
+    """
+    return bool(match.period) and match.period not in Constants.NOT_IN_PROGRESS_PERIODS
+
 def clean_team_name(team: str) -> str:
     """
     Cleans a single team name by stripping whitespace and converting it to lowercase.
@@ -43,27 +95,18 @@ def clean_team_names(teams: List[str]) -> List[str]:
     """
     return [clean_team_name(team) for team in teams]
 
-def read_prompt_from_file(file_name: str) -> str:
+def normalize_text(text: str) -> str:
     """
-    Reads the content of a prompt file located in the base file path.
+    Normalizes free text by lowercasing it and keeping only its alphanumeric words.
 
     Parameters:
     ----------
-    file_name : str
-        The name of the file to read.
+    text : str
+        The text to normalize.
 
     Returns:
     -------
     str
-        The content of the file as a string.
-
-    Raises:
-    ------
-    FileNotFoundError
-        If the file does not exist at the specified path.
-    IOError
-        If there is an error reading the file.
+        The normalized text with words separated by single spaces.
     """
-    file_path = os.path.join(Constants.BASE_FILE_PATH, file_name)
-    with open(file_path, 'r') as f:
-        return f.read()
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
@@ -0,0 +1,125 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .common_util import clean_team_name
+
+class FuzzyTeamResolver:
+    """
+    A fuzzy matcher of team names, which tolerates typos and partial names like
+    'sri lanka w' or 'newzealand'.
+
+    Candidates are first selected with a trigram index and then re-ranked by edit
+    distance. The confidence of a match is the average of both similarities.
+
+    Methods:
+    -------
+    resolve(text: str) -> Optional[Tuple[str, float]]
+        Returns the closest known name and the confidence of the match.
+
+    __get_trigrams(text: str) -> Set[str]
+        Returns the trigrams of a padded text.
+
+    __get_edit_distance(source: str, target: str) -> int
+        Returns the Levenshtein distance between two texts.
+    """
+
+    # Number of candidates sharing the most trigrams which are re-ranked by edit distance
+    MAX_CANDIDATES = 5
+
+    def __init__(self, names: Iterable[str]):
+        """
+        Builds the trigram index of the names.
+
+        Parameters:
+        ----------
+        names : Iterable[str]
+            The cleaned names (and abbreviations) to match against.
+        """
+        self.__names: List[str] = sorted(set(names))
+        self.__name_trigrams: List[Set[str]] = [self.__get_trigrams(name) for name in self.__names]
+        self.__trigram_index: Dict[str, List[int]] = {}
+        for position, trigrams in enumerate(self.__name_trigrams):
+            for trigram in trigrams:
+                self.__trigram_index.setdefault(trigram, []).append(position)
+
+    def resolve(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        Returns the closest known name and the confidence of the match.
+
+        Parameters:
+        ----------
+        text : str
+            The team name as typed by the user.
+
+        Returns:
+        -------
+        Optional[Tuple[str, float]]
+            The closest name and a confidence between 0 and 1, or None if no name
+            shares a trigram with the text.
+        """
+        query = clean_team_name(text)
+        if not query:
+            return None
+        query_trigrams = self.__get_trigrams(query)
+        shared_counts: Dict[int, int] = {}
+        for trigram in query_trigrams:
+            for position in self.__trigram_index.get(trigram, ()):
+                shared_counts[position] = shared_counts.get(position, 0) + 1
+        if not shared_counts:
+            return None
+
+        def get_trigram_similarity(position: int) -> float:
+            return 2 * shared_counts[position] / (len(query_trigrams) + len(self.__name_trigrams[position]))
+
+        candidates = sorted(shared_counts, key=get_trigram_similarity, reverse=True)[:self.MAX_CANDIDATES]
+        best_name, best_confidence = None, 0.0
+        for position in candidates:
+            name = self.__names[position]
+            edit_similarity = 1 - self.__get_edit_distance(query, name) / max(len(query), len(name))
+            confidence = (get_trigram_similarity(position) + edit_similarity) / 2
+            if confidence > best_confidence:
+                best_name, best_confidence = name, confidence
+        return best_name, best_confidence
+
+    def __get_trigrams(self, text: str) -> Set[str]:
+        """
+        Returns the trigrams of a padded text.
+
+        Parameters:
+        ----------
+        text : str
+            The cleaned text.
+
+        Returns:
+        -------
+        Set[str]
+            The trigrams, padded so that short abbreviations still have some.
+        """
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def __get_edit_distance(self, source: str, target: str) -> int:
+        """
+        Returns the Levenshtein distance between two texts.
+
+        Parameters:
+        ----------
+        source : str
+            The first text.
+        target : str
+            The second text.
+
+        Returns:
+        -------
+        int
+            The minimum number of insertions, deletions and substitutions.
+        """
+        previous = list(range(len(target) + 1))
+        for i, source_char in enumerate(source, 1):
+            current = [i]
+            for j, target_char in enumerate(target, 1):
+                current.append(min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (source_char != target_char)
+                ))
+            previous = current
+        return previous[-1]
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import weakref
+from functools import lru_cache
+import httpx
+from src.constants import Constants
+
+@lru_cache(maxsize=None)
+def get_openai_http_client() -> httpx.Client:
+    """
+    Returns the process-wide HTTP client used by the OpenAI chat models.
+
+    Sharing one client keeps its keep-alive connection pool warm across chat turns
+    and across the chat models of different services.
+
+    Returns:
+    -------
+    httpx.Client
+        The shared HTTP client.
+    """
+    return httpx.Client(limits=_get_openai_limits())
+
+@lru_cache(maxsize=None)
+def get_openai_async_http_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide asynchronous HTTP client used by the OpenAI chat models.
+
+    Used by ainvoke and astream, e.g. by the API server, so that asynchronous turns
+    share a warm connection pool like synchronous ones. Connections cannot be shared
+    between event loops, so the client keeps one connection pool per running loop.
+
+    Returns:
+    -------
+    httpx.AsyncClient
+        The shared asynchronous HTTP client.
+    """
+    return httpx.AsyncClient(transport=_PerLoopAsyncTransport())
+
+class _PerLoopAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    An asynchronous transport sending the requests of every event loop through a
+    connection pool of that loop, e.g. for CLI runs calling asyncio.run more than once.
+
+    Methods:
+    -------
+    handle_async_request(request: httpx.Request) -> httpx.Response
+        Sends a request through the connection pool of the running event loop.
+
+    aclose()
+        Closes the connection pool of the running event loop.
+
+    __get_transport() -> httpx.AsyncHTTPTransport
+        Returns the transport of the running event loop.
+    """
+
+    def __init__(self):
+        """
+        Initializes the transport without connection pools.
+        """
+        self.__lock = threading.Lock()
+        self.__transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = weakref.WeakKeyDictionary()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.__get_transport().handle_async_request(request)
+
+    async def aclose(self):
+        with self.__lock:
+            transport = self.__transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    def __get_transport(self) -> httpx.AsyncHTTPTransport:
+        """
+        Returns the transport of the running event loop, creating it on first use.
+
+        Returns:
+        -------
+        httpx.AsyncHTTPTransport
+            The transport holding the connection pool of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self.__lock:
+            transport = self.__transports.get(loop)
+            if transport is None:
+                transport = self.__transports[loop] = httpx.AsyncHTTPTransport(limits=_get_openai_limits())
+            return transport
+
+def _get_openai_limits() -> httpx.Limits:
+    """
+    Returns the connection pool limits of the OpenAI HTTP clients.
+
+    Returns:
+    -------
+    httpx.Limits
+        The maximum and keep-alive connections, and the keep-alive expiry.
+    """
+    return httpx.Limits(
+        max_connections=Constants.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=Constants.OPENAI_MAX_CONNECTIONS,
+        keepalive_expiry=Constants.OPENAI_KEEPALIVE_EXPIRY
+    )
@@ -0,0 +1,272 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from src.caches import LRUCache
+from src.constants import Constants
+from src.models import MatchDetails
+from .common_util import get_live_matches_as_string, is_match_in_progress, normalize_text
+
+@dataclass
+class LiveMatchContext:
+    """
+    A class to represent the rendered prompt context of a snapshot.
+
+    Attributes:
+    ----------
+    lines : List[str]
+        The rendered line of every match of the snapshot.
+    tokens : List[int]
+        The estimated number of tokens of every line.
+    ranking : List[int]
+        The positions of the matches, most relevant first regardless of the user input.
+    ranks : List[int]
+        The rank of the match at every position, i.e. its index in the ranking.
+    team_positions : Dict[str, Set[int]]
+        The positions of the matches of every normalized team name, abbreviation and alias.
+    max_name_words : int
+        The largest number of words of a team key.
+    full : str
+        All matches rendered, as listed by get_live_matches_as_string.
+    full_tokens : int
+        The estimated number of tokens of all matches.
+    default : Optional[str]
+        The matches fitting the budget when the user input names no team, rendered on first use.
+    """
+    lines: List[str] = field(default_factory=list)
+    tokens: List[int] = field(default_factory=list)
+    ranking: List[int] = field(default_factory=list)
+    ranks: List[int] = field(default_factory=list)
+    team_positions: Dict[str, Set[int]] = field(default_factory=dict)
+    max_name_words: int = 1
+    full: str = ''
+    full_tokens: int = 0
+    default: Optional[str] = None
+
+class LiveMatchContextBuilder:
+    """
+    Renders the live matches listed as context of the intent prompt within a token budget.
+
+    On heavy days, listing every match inflates the intent prompt. When all matches do not
+    fit the budget, the matches of teams named in the user input are listed first, then the
+    matches in progress and international fixtures, then the others. The lines, the ranking
+    and the default rendering are computed once per snapshot.
+
+    Methods:
+    -------
+    build(matches: List[MatchDetails], user_input: str = '') -> str
+        Renders the matches most relevant to the user input within the token budget.
+
+    estimate_tokens(text: str) -> int
+        Estimates the number of tokens of a text.
+
+    __get_context(matches: List[MatchDetails]) -> LiveMatchContext
+        Returns the prompt context of a snapshot, computing it on first use.
+
+    __create_context(matches: List[MatchDetails]) -> LiveMatchContext
+        Computes the lines, ranking and team keys of a snapshot.
+
+    __get_priority(match: MatchDetails) -> int
+        Returns the relevance of a match regardless of the user input.
+
+    __find_mentioned_positions(context: LiveMatchContext, user_input: str) -> Set[int]
+        Returns the positions of the matches whose teams are named in the user input.
+
+    __render(context: LiveMatchContext, first_positions: Set[int]) -> str
+        Renders the most relevant matches within the token budget.
+    """
+
+    # Average number of characters per token of English text
+    CHARS_PER_TOKEN = 4
+
+    __contexts = LRUCache(Constants.LIVE_MATCH_CONTEXT_CACHE_SIZE)
+
+    def __init__(self, token_budget: int = Constants.INTENT_CONTEXT_TOKEN_BUDGET):
+        """
+        Initializes the LiveMatchContextBuilder.
+
+        Parameters:
+        ----------
+        token_budget : int
+            The maximum estimated number of tokens of the rendered matches.
+        """
+        self.__token_budget = token_budget
+
+    def build(self, matches: List[MatchDetails], user_input: str = '') -> str:
+        """
+        Renders the matches most relevant to the user input within the token budget.
+
+        Parameters:
+        ----------
+        matches : List[MatchDetails]
+            The snapshot of the matches.
+        user_input : str
+            The input text from the user.
+
+        Returns:
+        -------
+        str
+            One line per listed match, in the order of the snapshot, followed by the number
+            of matches left out if the budget was exceeded.
+        """
+        context = self.__get_context(matches)
+        if context.full_tokens <= self.__token_budget:
+            return context.full
+        mentioned_positions = self.__find_mentioned_positions(context, user_input)
+        if mentioned_positions:
+            return self.__render(context, mentioned_positions)
+        if context.default is None:
+            context.default = self.__render(context, set())
+        return context.default
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        Estimates the number of tokens of a text.
+
+        Parameters:
+        ----------
+        text : str
+            The text.
+
+        Returns:
+        -------
+        int
+            The estimated number of tokens, at CHARS_PER_TOKEN characters per token.
+        """
+        return -(-len(text) // LiveMatchContextBuilder.CHARS_PER_TOKEN)
+
+    def __get_context(self, matches: List[MatchDetails]) -> LiveMatchContext:
+        """
+        Returns the prompt context of a snapshot, computing it on first use.
+
+        Snapshots are shared through the snapshot cache, so the context is kept along with
+        the list it was computed from and reused for as long as the same list is rendered.
+
+        Parameters:
+        ----------
+        matches : List[MatchDetails]
+            The snapshot of the matches.
+
+        Returns:
+        -------
+        LiveMatchContext
+            The prompt context of the snapshot.
+        """
+        key = id(matches)
+        entry = LiveMatchContextBuilder.__contexts.get(key)
+        if entry is not None and entry[0] is matches:
+            return entry[1]
+        context = self.__create_context(matches)
+        LiveMatchContextBuilder.__contexts.put(key, (matches, context))
+        return context
+
+    def __create_context(self, matches: List[MatchDetails]) -> LiveMatchContext:
+        """
+        Computes the lines, ranking and team keys of a snapshot.
+
+        Parameters:
+        ----------
+        matches : List[MatchDetails]
+            The snapshot of the matches.
+
+        Returns:
+        -------
+        LiveMatchContext
+            The prompt context of the snapshot.
+        """
+        context = LiveMatchContext()
+        for position, match in enumerate(matches):
+            line = get_live_matches_as_string([match])
+            context.lines.append(line)
+            # One more token for the line break
+            context.tokens.append(self.estimate_tokens(line) + 1)
+            for team in (match.team1, match.team2):
+                for key in (normalize_text(team.name), normalize_text(team.abr)):
+                    if key:
+                        context.team_positions.setdefault(key, set()).add(position)
+        for alias, name in Constants.TEAM_ALIASES.items():
+            positions = context.team_positions.get(normalize_text(name))
+            if positions:
+                context.team_positions.setdefault(normalize_text(alias), set()).update(positions)
+        context.max_name_words = max((len(key.split()) for key in context.team_positions), default=1)
+        priorities = [self.__get_priority(match) for match in matches]
+        context.ranking = sorted(range(len(matches)), key=lambda position: -priorities[position])
+        context.ranks = [0] * len(matches)
+        for rank, position in enumerate(context.ranking):
+            context.ranks[position] = rank
+        context.full = "\n".join(context.lines)
+        context.full_tokens = self.estimate_tokens(context.full)
+        return context
+
+    def __get_priority(self, match: MatchDetails) -> int:
+        """
+        Returns the relevance of a match regardless of the user input.
+
+        Parameters:
+        ----------
+        match : MatchDetails
+            The match.
+
+        Returns:
+        -------
+        int
+            2 for a match in progress, plus 1 for an international fixture.
+        """
+        in_progress = 2 if is_match_in_progress(match) else 0
+        international = 1 if (match.format or '').lower() in Constants.INTERNATIONAL_FORMATS else 0
+        return in_progress + international
+
+    def __find_mentioned_positions(self, context: LiveMatchContext, user_input: str) -> Set[int]:
+        """
+        Returns the positions of the matches whose teams are named in the user input.
+
+        Parameters:
+        ----------
+        context : LiveMatchContext
+            The prompt context of the snapshot.
+        user_input : str
+            The input text from the user.
+
+        Returns:
+        -------
+        Set[int]
+            The positions of the matches of every team name, abbreviation or alias found
+            as a sequence of words of the input.
+        """
+        words = normalize_text(user_input or '').split()
+        positions: Set[int] = set()
+        for size in range(1, context.max_name_words + 1):
+            for start in range(len(words) - size + 1):
+                positions.update(context.team_positions.get(" ".join(words[start:start + size]), ()))
+        return positions
+
+    def __render(self, context: LiveMatchContext, first_positions: Set[int]) -> str:
+        """
+        Renders the most relevant matches within the token budget.
+
+        Parameters:
+        ----------
+        context : LiveMatchContext
+            The prompt context of the snapshot.
+        first_positions : Set[int]
+            The positions of the matches to list before the others.
+
+        Returns:
+        -------
+        str
+            The listed matches in the order of the snapshot, and the number of matches left out.
+        """
+        order = sorted(first_positions, key=context.ranks.__getitem__) \
+            + [position for position in context.ranking if position not in first_positions]
+        selected = []
+        used_tokens = 0
+        for position in order:
+            if used_tokens + context.tokens[position] > self.__token_budget:
+                continue
+            selected.append(position)
+            used_tokens += context.tokens[position]
+        selected.sort()
+        lines = [context.lines[position] for position in selected]
+        left_out = len(context.lines) - len(selected)
+        if left_out:
+            lines.append(f"... and {left_out} more matches which are not listed")
+        return "\n".join(lines)
@@ -0,0 +1,73 @@
+import os
+from typing import Dict, Optional, Tuple
+from langchain_core.prompts import PromptTemplate
+from src.constants import Constants
+
+# Contents of the prompt files keyed by path, along with their modification time when
+# hot reload is enabled. Concurrent first loads may read a file twice, which is harmless.
+_prompt_contents: Dict[str, Tuple[Optional[int], str]] = {}
+
+# Compiled templates keyed by file name and partial variables, along with their content
+_prompt_templates: Dict[tuple, Tuple[str, PromptTemplate]] = {}
+
+def read_prompt_from_file(file_name: str) -> str:
+    """
+    Reads the content of a prompt file located in the base file path.
+
+    The file is read once per process. If PROMPT_HOT_RELOAD is enabled, it is read again
+    whenever its modification time changes.
+
+    Parameters:
+    ----------
+    file_name : str
+        The name of the file to read.
+
+    Returns:
+    -------
+    str
+        The content of the file as a string.
+
+    Raises:
+    ------
+    FileNotFoundError
+        If the file does not exist at the specified path.
+    IOError
+        If there is an error reading the file.
+    """
+    file_path = os.path.join(Constants.BASE_FILE_PATH, file_name)
+    modified_at = os.stat(file_path).st_mtime_ns if Constants.PROMPT_HOT_RELOAD else None
+    cached = _prompt_contents.get(file_path)
+    if cached is not None and cached[0] == modified_at:
+        return cached[1]
+    with open(file_path, 'r') as f:
+        content = f.read()
+    _prompt_contents[file_path] = (modified_at, content)
+    return content
+
+def load_prompt_template(file_name: str, **partial_variables: str) -> PromptTemplate:
+    """
+    Returns the compiled template of a prompt file.
+
+    The template is compiled once per file and partial variables, and compiled again only
+    if the content of the file changed (see read_prompt_from_file).
+
+    Parameters:
+    ----------
+    file_name : str
+        The name of the prompt file.
+    **partial_variables : str
+        The variables of the template filled in upfront.
+
+    Returns:
+    -------
+    PromptTemplate
+        The compiled template.
+    """
+    content = read_prompt_from_file(file_name)
+    key = (file_name, tuple(sorted(partial_variables.items())))
+    cached = _prompt_templates.get(key)
+    if cached is not None and cached[0] is content:
+        return cached[1]
+    template = PromptTemplate.from_template(template=content, partial_variables=partial_variables)
+    _prompt_templates[key] = (content, template)
+    return template
@@ -0,0 +1,317 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import numpy as np
+from src.constants import Constants
+from src.models import MatchDetails
+from .common_util import clean_team_name, is_match_in_progress, normalize_text
+
+@dataclass
+class ScoreboardChunk:
+    """
+    A class to represent the columns of the matches of a single date.
+
+    Attributes:
+    ----------
+    matches : List[MatchDetails]
+        The matches of the date, as stored.
+    columns : Dict[str, np.ndarray]
+        The columns keyed by name, with one row per match.
+    series_codes : Dict[str, int]
+        The codes of the normalized series names of the date.
+    format_codes : Dict[str, int]
+        The codes of the normalized formats of the date.
+    team_codes : Dict[str, int]
+        The codes of the cleaned team names and abbreviations of the date.
+    """
+    matches: List[MatchDetails]
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+    series_codes: Dict[str, int] = field(default_factory=dict)
+    format_codes: Dict[str, int] = field(default_factory=dict)
+    team_codes: Dict[str, int] = field(default_factory=dict)
+
+class ScoreboardStore:
+    """
+    A columnar in-memory store of the matches of several dates.
+
+    The matches of every stored date are laid out as NumPy columns, with series, formats
+    and teams dictionary-encoded as integer codes, so that filtering the matches of a range
+    of dates by series, team, format and progress is a handful of vectorized comparisons
+    per date instead of a scan over MatchDetails objects. The columns and the codes are
+    kept per date: storing the matches of a date only rebuilds the columns of that date,
+    and the codes of a dropped date are dropped along with it.
+
+    Methods:
+    -------
+    put(cur_date: str, matches: List[MatchDetails])
+        Stores the matches of a date, replacing its previous matches.
+
+    get(cur_date: str) -> Optional[List[MatchDetails]]
+        Returns the stored matches of a date.
+
+    query(start_date: str, end_date: str, series: Optional[str] = None, team: Optional[str] = None, format: Optional[str] = None, in_progress: Optional[bool] = None) -> List[MatchDetails]
+        Returns the stored matches of a range of dates matching all the given filters.
+
+    get_stats() -> dict
+        Returns the number of stored dates and matches.
+
+    __build_chunk(matches: List[MatchDetails]) -> ScoreboardChunk
+        Builds the columns of the matches of a date.
+
+    __query_chunk(chunk: ScoreboardChunk, series: Optional[str], team: Optional[str], format: Optional[str], in_progress: Optional[bool]) -> List[MatchDetails]
+        Returns the matches of a date matching all the given filters.
+
+    __encode(vocabulary: Dict[str, int], value: str) -> int
+        Returns the code of a value, adding it to the vocabulary if needed.
+
+    __get_team_code(chunk: ScoreboardChunk, team: str) -> int
+        Returns the code of a team name, abbreviation or alias in a date.
+    """
+
+    # Code of values which were never stored, so that they match no row
+    UNKNOWN_CODE = -1
+
+    def __init__(self, max_dates: int = Constants.SCOREBOARD_MAX_DATES):
+        """
+        Initializes an empty ScoreboardStore.
+
+        Parameters:
+        ----------
+        max_dates : int
+            The maximum number of dates to keep. The least recently stored date is dropped first.
+        """
+        self.__max_dates = max_dates
+        self.__lock = threading.Lock()
+        self.__chunks: OrderedDict = OrderedDict()
+
+    def put(self, cur_date: str, matches: List[MatchDetails]):
+        """
+        Stores the matches of a date, replacing its previous matches. Storing the same
+        list again has no effect.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date of the matches in YYYYMMDD format.
+        matches : List[MatchDetails]
+            The matches of the date.
+        """
+        with self.__lock:
+            chunk = self.__chunks.get(cur_date)
+            if chunk is not None and chunk.matches is matches:
+                return
+        chunk = self.__build_chunk(matches)
+        with self.__lock:
+            self.__chunks[cur_date] = chunk
+            self.__chunks.move_to_end(cur_date)
+            while len(self.__chunks) > self.__max_dates:
+                self.__chunks.popitem(last=False)
+
+    def get(self, cur_date: str) -> Optional[List[MatchDetails]]:
+        """
+        Returns the stored matches of a date.
+
+        Parameters:
+        ----------
+        cur_date : str
+            The date in YYYYMMDD format.
+
+        Returns:
+        -------
+        Optional[List[MatchDetails]]
+            The matches of the date, or None if the date is not stored.
+        """
+        with self.__lock:
+            chunk = self.__chunks.get(cur_date)
+            return chunk.matches if chunk is not None else None
+
+    def query(
+        self,
+        start_date: str,
+        end_date: str,
+        series: Optional[str] = None,
+        team: Optional[str] = None,
+        format: Optional[str] = None,
+        in_progress: Optional[bool] = None
+    ) -> List[MatchDetails]:
+        """
+        Returns the stored matches of a range of dates matching all the given filters.
+
+        Parameters:
+        ----------
+        start_date : str
+            The first date of the range in YYYYMMDD format.
+        end_date : str
+            The last date of the range in YYYYMMDD format (inclusive).
+        series : Optional[str]
+            The name of the series, compared on its alphanumeric words (e.g. 'india-vs-bangladesh'
+            matches 'India vs Bangladesh').
+        team : Optional[str]
+            The name, abbreviation or alias of a team playing the matches.
+        format : Optional[str]
+            The format of the matches. Formats starting with it match, e.g. 'T20' matches 'T20I'.
+        in_progress : Optional[bool]
+            Only matches in progress if True, only matches not in progress if False.
+
+        Returns:
+        -------
+        List[MatchDetails]
+            The matching matches, ordered by date and then as listed by the API.
+        """
+        with self.__lock:
+            # Chunks are never modified once stored, so they are queried without the lock
+            chunks = sorted(
+                (int(cur_date), chunk) for cur_date, chunk in self.__chunks.items()
+                if int(start_date) <= int(cur_date) <= int(end_date)
+            )
+        series = normalize_text(series) if series else None
+        format = normalize_text(format) if format else None
+        matches = []
+        for _, chunk in chunks:
+            matches.extend(self.__query_chunk(chunk, series, team, format, in_progress))
+        return matches
+
+    def get_stats(self) -> dict:
+        """
+        Returns the number of stored dates and matches.
+
+        Returns:
+        -------
+        dict
+            The stored dates and the total number of matches.
+        """
+        with self.__lock:
+            return {
+                "dates": sorted(self.__chunks),
+                "matches": sum(len(chunk.matches) for chunk in self.__chunks.values()),
+            }
+
+    def __build_chunk(self, matches: List[MatchDetails]) -> ScoreboardChunk:
+        """
+        Builds the columns of the matches of a date.
+
+        Parameters:
+        ----------
+        matches : List[MatchDetails]
+            The matches of the date.
+
+        Returns:
+        -------
+        ScoreboardChunk
+            The matches along with their columns and the codes of their values.
+        """
+        chunk = ScoreboardChunk(matches)
+        size = len(matches)
+        columns = {
+            "series": np.fromiter(
+                (self.__encode(chunk.series_codes, normalize_text(match.series_name)) for match in matches),
+                dtype=np.int32, count=size
+            ),
+            "format": np.fromiter(
+                (self.__encode(chunk.format_codes, normalize_text(match.format)) for match in matches),
+                dtype=np.int32, count=size
+            ),
+            "in_progress": np.fromiter((is_match_in_progress(match) for match in matches), dtype=bool, count=size),
+            "match": np.empty(size, dtype=object),
+        }
+        for column, get_value in (
+            ("team1", lambda match: match.team1.name),
+            ("team1_abr", lambda match: match.team1.abr),
+            ("team2", lambda match: match.team2.name),
+            ("team2_abr", lambda match: match.team2.abr),
+        ):
+            columns[column] = np.fromiter(
+                (self.__encode(chunk.team_codes, clean_team_name(get_value(match))) for match in matches),
+                dtype=np.int32, count=size
+            )
+        columns["match"][:] = matches
+        chunk.columns = columns
+        return chunk
+
+    def __query_chunk(
+        self,
+        chunk: ScoreboardChunk,
+        series: Optional[str],
+        team: Optional[str],
+        format: Optional[str],
+        in_progress: Optional[bool]
+    ) -> List[MatchDetails]:
+        """
+        Returns the matches of a date matching all the given filters.
+
+        Parameters:
+        ----------
+        chunk : ScoreboardChunk
+            The columns of the date.
+        series : Optional[str]
+            The normalized name of the series.
+        team : Optional[str]
+            The name, abbreviation or alias of a team playing the matches.
+        format : Optional[str]
+            The normalized prefix of the format of the matches.
+        in_progress : Optional[bool]
+            Only matches in progress if True, only matches not in progress if False.
+
+        Returns:
+        -------
+        List[MatchDetails]
+            The matching matches, as listed by the API.
+        """
+        columns = chunk.columns
+        mask = np.ones(len(chunk.matches), dtype=bool)
+        if series:
+            mask &= columns["series"] == chunk.series_codes.get(series, self.UNKNOWN_CODE)
+        if team:
+            code = self.__get_team_code(chunk, team)
+            mask &= (columns["team1"] == code) | (columns["team1_abr"] == code) \
+                | (columns["team2"] == code) | (columns["team2_abr"] == code)
+        if format:
+            codes = [code for value, code in chunk.format_codes.items() if value.startswith(format)]
+            mask &= np.isin(columns["format"], codes)
+        if in_progress is not None:
+            mask &= columns["in_progress"] == in_progress
+        return columns["match"][mask].tolist()
+
+    def __encode(self, vocabulary: Dict[str, int], value: str) -> int:
+        """
+        Returns the code of a value, adding it to the vocabulary if needed.
+
+        Parameters:
+        ----------
+        vocabulary : Dict[str, int]
+            The codes of the values of a column.
+        value : str
+            The value to encode.
+
+        Returns:
+        -------
+        int
+            The code of the value.
+        """
+        code = vocabulary.get(value)
+        if code is None:
+            code = vocabulary[value] = len(vocabulary)
+        return code
+
+    def __get_team_code(self, chunk: ScoreboardChunk, team: str) -> int:
+        """
+        Returns the code of a team name, abbreviation or alias in a date.
+
+        Parameters:
+        ----------
+        chunk : ScoreboardChunk
+            The columns of the date.
+        team : str
+            The name, abbreviation or alias of the team.
+
+        Returns:
+        -------
+        int
+            The code of the team, or UNKNOWN_CODE if no match of the date has the team.
+        """
+        key = clean_team_name(team)
+        code = chunk.team_codes.get(key)
+        if code is None and key in Constants.TEAM_ALIASES:
+            code = chunk.team_codes.get(Constants.TEAM_ALIASES[key])
+        return code if code is not None else self.UNKNOWN_CODE
@@ -0,0 +1,151 @@
+import re
+from typing import Dict, FrozenSet, List, Optional, Set
+from src.constants import Constants
+from src.models import MatchDetails
+from .common_util import clean_team_name
+from .fuzzy_team_resolver import FuzzyTeamResolver
+
+class TeamIndex:
+    """
+    An index from team names, abbreviations and aliases to the matches of a snapshot.
+
+    The index is built once per snapshot, so that finding the match between two teams
+    is a set intersection instead of a scan over all matches. Names which are not known
+    exactly are resolved with a fuzzy matcher, built on first use.
+
+    Methods:
+    -------
+    find_match(team1: str, team2: str) -> Optional[MatchDetails]
+        Finds the match between the specified teams.
+
+    find_match_positions(team: str) -> Set[int]
+        Returns the positions of the matches a team plays in, matching the name
+        exactly, by alias, or fuzzily.
+
+    __get_keys(name: str, abr: str) -> Set[str]
+        Returns the lookup keys of a team.
+
+    __get_qualifiers(key: str) -> FrozenSet[str]
+        Returns the gender and age-group qualifiers of a team name.
+    """
+
+    # Words distinguishing a women's, A or age-group side from the senior team, and the
+    # qualifier each stands for
+    QUALIFIER_WORDS = {"w": "women", "women": "women", "womens": "women", "a": "a"}
+    AGE_GROUP_PATTERN = re.compile(r"\b(?:u|under)[\s-]?(\d{2})\b")
+
+    def __init__(self, matches: List[MatchDetails]):
+        """
+        Builds the index of the matches.
+
+        Parameters:
+        ----------
+        matches : List[MatchDetails]
+            The matches of the snapshot.
+        """
+        self.__matches = matches
+        self.__fuzzy_resolver: Optional[FuzzyTeamResolver] = None
+        self.__positions: Dict[str, Set[int]] = {}
+        for position, match in enumerate(matches):
+            for team in (match.team1, match.team2):
+                for key in self.__get_keys(team.name, team.abr):
+                    self.__positions.setdefault(key, set()).add(position)
+
+    def find_match(self, team1: str, team2: str) -> Optional[MatchDetails]:
+        """
+        Finds the match between the specified teams.
+
+        Parameters:
+        ----------
+        team1 : str
+            The name, abbreviation or alias of the first team.
+        team2 : str
+            The name, abbreviation or alias of the second team.
+
+        Returns:
+        -------
+        Optional[MatchDetails]
+            The first match of the snapshot between both teams, or None if not found.
+        """
+        positions = self.find_match_positions(team1) & self.find_match_positions(team2)
+        return self.__matches[min(positions)] if positions else None
+
+    def find_match_positions(self, team: str) -> Set[int]:
+        """
+        Returns the positions of the matches a team plays in.
+
+        Parameters:
+        ----------
+        team : str
+            The name, abbreviation or alias of the team.
+
+        Returns:
+        -------
+        Set[int]
+            The positions of the matches in the snapshot.
+        """
+        key = clean_team_name(team)
+        positions = self.__positions.get(key)
+        if positions is None and key in Constants.TEAM_ALIASES:
+            positions = self.__positions.get(Constants.TEAM_ALIASES[key])
+        if positions is None and key:
+            if self.__fuzzy_resolver is None:
+                self.__fuzzy_resolver = FuzzyTeamResolver(self.__positions.keys())
+            resolved = self.__fuzzy_resolver.resolve(key)
+            # A close name of another side of the same country (e.g. 'india w' for 'india')
+            # is a different team, not a typo
+            if resolved is not None and resolved[1] >= Constants.FUZZY_TEAM_MATCH_THRESHOLD \
+                    and self.__get_qualifiers(resolved[0]) == self.__get_qualifiers(key):
+                positions = self.__positions.get(resolved[0])
+        return positions or set()
+
+    def __get_keys(self, name: str, abr: str) -> Set[str]:
+        """
+        Returns the lookup keys of a team.
+
+        Parameters:
+        ----------
+        name : str
+            The name of the team.
+        abr : str
+            The abbreviation of the team's name.
+
+        Returns:
+        -------
+        Set[str]
+            The cleaned name and abbreviation, and their common variants like 'team india'
+            or 'india w' for 'India Women'.
+        """
+        name = clean_team_name(name)
+        abr = clean_team_name(abr)
+        keys = {key for key in (name, abr) if key}
+        if name:
+            keys.add(f"team {name}")
+        if name.endswith(" women"):
+            base = name[:-len(" women")]
+            keys.update({f"{base} w", f"{base}-w", f"{base} womens"})
+        return keys
+
+    def __get_qualifiers(self, key: str) -> FrozenSet[str]:
+        """
+        Returns the gender and age-group qualifiers of a team name.
+
+        Parameters:
+        ----------
+        key : str
+            The cleaned team name.
+
+        Returns:
+        -------
+        FrozenSet[str]
+            The qualifiers of the name, e.g. {'women'} for 'india w' or {'u19'} for
+            'india under-19', and an empty set for a senior men's team.
+        """
+        key = TeamIndex.AGE_GROUP_PATTERN.sub(r"u\1", key)
+        qualifiers = set()
+        for word in re.findall(r"[a-z0-9]+", key):
+            if word in TeamIndex.QUALIFIER_WORDS:
+                qualifiers.add(TeamIndex.QUALIFIER_WORDS[word])
+            elif re.fullmatch(r"u\d{2}", word):
+                qualifiers.add(word)
+        return frozenset(qualifiers)